@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .db_pool import tracker
+        from .metrics import install_query_timer
+        from .signals import connect_signals
+        connect_signals()
+        tracker.connect()
+        connection_created.connect(install_query_timer, dispatch_uid='metrics-query-timer')
@@ -0,0 +1,127 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import SynchronousOnlyOperation, ValidationError
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSetMixin
+from .metrics import serialize, timed
+
+# Other methods served on a read route; they always go to the sync view
+WRITE_ACTIONS = {
+    'list': {'post': 'create'},
+    'retrieve': {'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+}
+
+
+class AsyncReadMixin:
+    """
+    Native async reads for ASGI deployments.
+
+    ``as_async_view()`` returns a coroutine view for the URLconf. Anonymous
+    GET/HEAD requests that negotiate JSON run the view's ``a``-prefixed
+    handler (``alist``/``aretrieve`` on viewsets, ``aget`` on APIViews) on
+    the event loop: queries go through the async ORM and the response is
+    rendered in place, so the request never occupies a worker thread.
+    Everything else on the same URL (writes, requests carrying credentials,
+    the browsable API) is handed to the regular sync view unchanged.
+
+    The async handlers run through the same mixins as the sync ones
+    (CachedResponseMixin, ConditionalGetMixin, FastListMixin), so both paths
+    share cache entries and ETags and return identical bodies.
+    """
+
+    @classmethod
+    def as_async_view(cls, action='get', **initkwargs):
+        if issubclass(cls, ViewSetMixin):
+            actions = {'get': action, 'head': action}
+            actions.update({
+                method: name for method, name in WRITE_ACTIONS.get(action, {}).items() if hasattr(cls, name)
+            })
+            sync_view = cls.as_view(actions, **initkwargs)
+        else:
+            actions = None
+            sync_view = cls.as_view(**initkwargs)
+        run_sync_view = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            if request.method in ('GET', 'HEAD') and 'HTTP_AUTHORIZATION' not in request.META:
+                self = cls(**initkwargs)
+                if actions is not None:
+                    self.action_map = actions
+                response = await self.adispatch(request, f'a{action}', *args, **kwargs)
+                if response is not None:
+                    return response
+            return await run_sync_view(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        return csrf_exempt(view)
+
+    async def adispatch(self, request, handler_name, *args, **kwargs):
+        """
+        APIView.dispatch for anonymous JSON reads; returns None when another
+        renderer was negotiated so the caller can fall back to the sync view.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            self.format_kwarg = self.get_format_suffix(**kwargs)
+            renderer, media_type = self.perform_content_negotiation(request)
+            if not isinstance(renderer, JSONRenderer):
+                return None
+            request.accepted_renderer, request.accepted_media_type = renderer, media_type
+            request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+            # No credentials were sent, so there is nothing to authenticate
+            request.user, request.auth = AnonymousUser(), None
+            self.check_permissions(request)
+            self.check_throttles(request)
+            response = await getattr(self, handler_name)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        response = self.finalize_response(request, response, *args, **kwargs)
+        # Django would call render() on an unrendered response from a thread
+        with timed('render'):
+            response.render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+
+    async def afilter_queryset(self, queryset):
+        try:
+            return self.filter_queryset(queryset)
+        except SynchronousOnlyOperation:
+            # django-filter validates model choice values (?category=) with a query
+            return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            # Same message as django.shortcuts.get_object_or_404
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize(self.get_serializer(page, many=True)))
+        return Response(serialize(self.get_serializer([obj async for obj in queryset], many=True)))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(serialize(self.get_serializer(await self.aget_object())))
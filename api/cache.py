@@ -0,0 +1,184 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.response import Response
+
+CACHE_PREFIX = 'api-cache'
+HITS_KEY = f'{CACHE_PREFIX}:stats:hits'
+MISSES_KEY = f'{CACHE_PREFIX}:stats:misses'
+
+
+def model_version_key(model):
+    return f'{CACHE_PREFIX}:version:{model._meta.label_lower}'
+
+
+def bump_model_version(model):
+    """Invalidate every cached response that depends on the given model"""
+    # A fresh timestamp instead of incr() so concurrent bumps never collide
+    # and a missing key simply starts a new generation.
+    cache.set(model_version_key(model), time.time_ns(), None)
+
+
+def get_model_versions(models):
+    keys = [model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [str(versions[key]) for key in keys]
+
+
+# Parameters that change the response even when blank: a bare ?expand=
+# leaves out every expandable field (see api.fieldsets.get_field_selection)
+PRESENCE_PARAMS = {'expand'}
+
+
+def normalize_query_params(query_params):
+    """Sorted representation of the query string without blank filters"""
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(value for value in query_params.getlist(key) if value != '' or key in PRESENCE_PARAMS)
+        for value in values:
+            items.append(f'{key}={value}')
+    return '&'.join(items)
+
+
+def build_cache_key(request, basename, models):
+    # Bodies hold absolute URLs (pagination links), so the origin is part of
+    # the key; the renderer format keeps JSON and browsable API responses apart
+    raw = (
+        f'{request.scheme}://{request.get_host()}{request.path}?{normalize_query_params(request.query_params)}'
+        f'#{request.accepted_renderer.format}'
+    )
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    versions = hashlib.md5(':'.join(get_model_versions(models)).encode('utf-8')).hexdigest()
+    return f'{CACHE_PREFIX}:response:{basename}:{versions}:{digest}'
+
+
+async def run_cached(func, *args, **kwargs):
+    """
+    Call a function that talks to the cache from async code.
+
+    LocMemCache never blocks, so it is called inline; other backends are
+    network round trips and run in a worker thread, all of func in one hop
+    rather than one per cache call.
+    """
+    if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return func(*args, **kwargs)
+    return await sync_to_async(func)(*args, **kwargs)
+
+
+def get_cached_entry(request, basename, models):
+    """(key, stored response entry or None) for a request, counting the hit or miss"""
+    key = build_cache_key(request, basename, models)
+    entry = cache.get(key)
+    _increment(HITS_KEY if entry is not None else MISSES_KEY)
+    return key, entry
+
+
+def _increment(key):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter was evicted between add() and incr()
+        cache.set(key, 1, None)
+
+
+def get_cache_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedResponseMixin:
+    """
+    Cache serialized GET responses for public viewsets.
+
+    Responses are keyed on the scheme, host and path of the request plus the
+    normalized query string (which includes the page number) and on the
+    current version of every model listed in ``cache_models``. Saving or deleting any of those models bumps
+    its version (see api/signals.py), so stale entries are never served again
+    and simply age out of the cache.
+    """
+    cache_models = []
+    cache_actions = ('list', 'retrieve')
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if self.action not in self.cache_actions or not self.cache_models:
+            return handler(request, *args, **kwargs)
+
+        key, entry = get_cached_entry(request, self.basename, self.cache_models)
+        if entry is not None:
+            return self.cached_hit_response(request, entry)
+
+        response = handler(request, *args, **kwargs)
+        self.store_response(key, response)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(request, super().alist, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(request, super().aretrieve, *args, **kwargs)
+
+    async def acached_response(self, request, handler, *args, **kwargs):
+        if self.action not in self.cache_actions or not self.cache_models:
+            return await handler(request, *args, **kwargs)
+
+        key, entry = await run_cached(get_cached_entry, request, self.basename, self.cache_models)
+        if entry is not None:
+            return self.cached_hit_response(request, entry)
+
+        response = await handler(request, *args, **kwargs)
+        await run_cached(self.store_response, key, response)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def cached_hit_response(self, request, entry):
+        # Imported here because api.conditional depends on this module
+        from .conditional import is_not_modified, not_modified_response, set_validators
+
+        # The stored validators are still current: the key changes with
+        # every model version, so revalidations need no query at all.
+        if is_not_modified(request, entry['etag'], entry['last_modified']):
+            response = not_modified_response(entry['etag'], entry['last_modified'])
+        else:
+            response = set_validators(Response(entry['data']), entry['etag'], entry['last_modified'])
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def store_response(self, key, response):
+        if response.status_code != 200:
+            return
+        timeout = self.cache_timeout
+        if timeout is None:
+            timeout = settings.API_CACHE_TIMEOUT
+        cache.set(key, {
+            'data': response.data,
+            'etag': getattr(response, 'etag', None),
+            'last_modified': getattr(response, 'last_modified', None),
+        }, timeout)
@@ -0,0 +1,125 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Brotli's default quality (11) is meant for static assets; 5 compresses
+# JSON better than gzip in about the same time
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/javascript', 'application/xml'}
+
+
+def parse_accept_encoding(header):
+    """Content coding -> q value"""
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def get_codings():
+    """Codings this process can produce, preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def choose_encoding(header):
+    """The coding to use for an Accept-Encoding header, or None for identity"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in get_codings():
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        # Ties go to the server's preference
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(content, coding):
+    if coding == 'br':
+        return brotli.compress(content, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    return compress_string(content)
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return (
+        media_type.startswith('text/') or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith('+json') or media_type.endswith('+xml')
+    )
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli or gzip compression of API responses.
+
+    Responses under ``/api/`` of at least COMPRESS_MIN_SIZE bytes with a
+    textual content type are compressed with the best coding the client
+    accepts: brotli when the optional Brotli package is installed, gzip
+    otherwise. Static files are left to WhiteNoise, which serves them
+    precompressed, and streaming responses (exports) pass through.
+
+    Put it right below ServerTimingMiddleware, so the size that reports is
+    the one sent on the wire.
+    """
+    sync_capable = True
+    async_capable = True
+    path_prefix = '/api/'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        min_size = settings.COMPRESS_MIN_SIZE
+        if (
+            min_size <= 0 or response.streaming or response.has_header('Content-Encoding')
+            or not request.path_info.startswith(self.path_prefix)
+            or len(response.content) < min_size
+            or not is_compressible(response.get('Content-Type', ''))
+        ):
+            return response
+        # From here on the body depends on the request's Accept-Encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if coding is None:
+            return response
+        compressed = compress(response.content, coding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # Same validator for both codings, so it can only be a weak one
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -0,0 +1,137 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+from .cache import get_model_versions, normalize_query_params, run_cached
+
+
+def make_etag(*parts):
+    raw = ':'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """RFC 7232 precedence: If-None-Match wins, If-Modified-Since is the fallback"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if etag is None:
+            return False
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in etags]
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if if_modified_since and last_modified is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified=None):
+    # Kept on the response so the response cache can store them alongside
+    response.etag = etag
+    response.last_modified = last_modified
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified_response(etag, last_modified=None):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators and 304 responses for list and detail.
+
+    Lists are validated by max(updated_at) and the row count of the filtered
+    queryset, details by the row's updated_at; both fold in the version stamps
+    of ``cache_models`` so related-row changes are noticed too. Views that
+    embed fields of related rows must list those models there. A matching
+    If-None-Match or If-Modified-Since costs one indexed query and skips
+    serialization entirely.
+
+    List responses only carry an ETag: max(updated_at) does not move when a
+    row is deleted, so it is not a safe Last-Modified for a collection.
+    """
+
+    def get_validator_versions(self):
+        models = getattr(self, 'cache_models', None)
+        return get_model_versions(models) if models else []
+
+    def get_list_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return self.make_list_validators(request, summary, self.get_validator_versions())
+
+    def get_detail_validators(self, request):
+        updated = list(self.get_detail_summary(self.filter_queryset(self.get_queryset())))
+        return self.make_detail_validators(request, updated, self.get_validator_versions())
+
+    async def aget_list_validators(self, request):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        summary = await queryset.order_by().aaggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        versions = await run_cached(self.get_validator_versions)
+        return self.make_list_validators(request, summary, versions)
+
+    async def aget_detail_validators(self, request):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        updated = [row async for row in self.get_detail_summary(queryset)]
+        versions = await run_cached(self.get_validator_versions)
+        return self.make_detail_validators(request, updated, versions)
+
+    def get_detail_summary(self, queryset):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).order_by().values_list('pk', 'updated_at')[:1]
+
+    def make_list_validators(self, request, summary, versions):
+        etag = make_etag(
+            'list', summary['last_modified'], summary['count'], *versions,
+            normalize_query_params(request.query_params), request.accepted_renderer.format,
+        )
+        return etag, None
+
+    def make_detail_validators(self, request, updated, versions):
+        if not updated:
+            # Let the regular path raise the 404
+            return None, None
+        pk, last_modified = updated[0]
+        if versions:
+            # Stamps are bump times (time.time_ns()), so a change to a related
+            # model moves Last-Modified as well as the ETag
+            bumped = datetime.fromtimestamp(max(int(version) for version in versions) / 1e9, tz=timezone.utc)
+            last_modified = max(last_modified, bumped)
+        # The query string can select fields (?fields=, ?omit=, ?expand=)
+        etag = make_etag(
+            'detail', pk, last_modified.isoformat(), *versions,
+            normalize_query_params(request.query_params), request.accepted_renderer.format,
+        )
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        return set_validators(super().list(request, *args, **kwargs), etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_detail_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+    async def alist(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_list_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        return set_validators(await super().alist(request, *args, **kwargs), etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_detail_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        return set_validators(await super().aretrieve(request, *args, **kwargs), etag, last_modified)
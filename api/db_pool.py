@@ -0,0 +1,116 @@
+import os
+import statistics
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+
+class ConnectionTracker:
+    """
+    Bookkeeping for the database connections held by this process.
+
+    connection_created records when each physical connection was first seen,
+    which gives connection ages in every DB_CONNECTIONS mode. With persistent
+    connections every thread owns one, so a connection counts as in use while
+    its thread is serving a request and as idle otherwise. Pooled mode reads
+    in-use, idle and wait figures from the pool itself.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wrappers = weakref.WeakSet()
+        # Raw DB-API connection -> monotonic time it was first handed out
+        self.first_seen = weakref.WeakKeyDictionary()
+        self.busy_threads = set()
+        self.opened = 0
+
+    def connect(self):
+        connection_created.connect(self.connection_created, dispatch_uid='db-pool-connection-created')
+        request_started.connect(self.request_started, dispatch_uid='db-pool-request-started')
+        request_finished.connect(self.request_finished, dispatch_uid='db-pool-request-finished')
+
+    def connection_created(self, sender, connection, **kwargs):
+        now = time.monotonic()
+        with self.lock:
+            self.wrappers.add(connection)
+            try:
+                # Pooled connections are handed out many times; count each once
+                opened_at = self.first_seen.setdefault(connection.connection, now)
+            except TypeError:
+                # e.g. sqlite3, whose connections can't be weakly referenced
+                # but are never pooled either: remember the time on the wrapper
+                opened_at = connection.tracked_opened_at = now
+            if opened_at == now:
+                self.opened += 1
+
+    def request_started(self, **kwargs):
+        with self.lock:
+            self.busy_threads.add(threading.get_ident())
+
+    def request_finished(self, **kwargs):
+        with self.lock:
+            self.busy_threads.discard(threading.get_ident())
+
+    def get_ages(self):
+        """Seconds since each live connection was opened"""
+        now = time.monotonic()
+        with self.lock:
+            ages = [now - seen for seen in self.first_seen.values()]
+            ages += [
+                now - wrapper.tracked_opened_at for wrapper in self.wrappers
+                if wrapper.connection is not None and hasattr(wrapper, 'tracked_opened_at')
+            ]
+        return ages
+
+    def get_thread_stats(self, alias):
+        """(in use, idle) among the per-thread connections that are open"""
+        with self.lock:
+            open_wrappers = [wrapper for wrapper in self.wrappers if wrapper.alias == alias and wrapper.connection]
+            in_use = sum(1 for wrapper in open_wrappers if wrapper._thread_ident in self.busy_threads)
+        return in_use, len(open_wrappers) - in_use
+
+
+tracker = ConnectionTracker()
+
+
+def get_pool_stats(alias=DEFAULT_DB_ALIAS):
+    """Connection figures for this worker process; each worker keeps its own"""
+    wrapper = connections[alias]
+    stats = {
+        'mode': settings.DB_CONNECTIONS,
+        'pid': os.getpid(),
+        'vendor': wrapper.vendor,
+        'max_age_s': settings.DB_CONN_MAX_AGE if settings.DB_CONNECTIONS != 'none' else 0,
+        'health_checks': wrapper.settings_dict['CONN_HEALTH_CHECKS'],
+        'opened': tracker.opened,
+    }
+    pool = getattr(wrapper, 'pool', None)
+    if pool is not None:
+        pool_stats = pool.get_stats()
+        stats.update({
+            'in_use': pool_stats['pool_size'] - pool_stats['pool_available'],
+            'idle': pool_stats['pool_available'],
+            'max_size': pool_stats['pool_max'],
+            'waiting': pool_stats.get('requests_waiting', 0),
+            'waits': pool_stats.get('requests_queued', 0),
+            'wait_ms': pool_stats.get('requests_wait_ms', 0),
+            'timeouts': pool_stats.get('requests_errors', 0),
+            'lost': pool_stats.get('connections_lost', 0),
+        })
+    else:
+        in_use, idle = tracker.get_thread_stats(alias)
+        # Every thread has a connection of its own, so nothing ever waits
+        stats.update({'in_use': in_use, 'idle': idle, 'waiting': 0, 'waits': 0, 'wait_ms': 0})
+
+    ages = tracker.get_ages()
+    stats['age_s'] = {
+        'min': round(min(ages), 1),
+        'mean': round(statistics.fmean(ages), 1),
+        'max': round(max(ages), 1),
+    } if ages else None
+    return stats
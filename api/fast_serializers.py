@@ -0,0 +1,216 @@
+import threading
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField, ManyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from .fieldsets import get_field_selection
+from .metrics import timed
+
+# How render() turns a fetched value into its representation
+VALUE, METHOD, DATETIME, RAW = range(4)
+
+# Fields whose to_representation returns database values of these types unchanged
+RAW_FIELDS = (
+    (serializers.CharField, str),
+    (serializers.IntegerField, int),
+    (serializers.BooleanField, bool),
+    (serializers.JSONField, (dict, list)),
+)
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer compiled from a ModelSerializer's field declarations.
+
+    Rows are fetched with ``.values()`` and rendered straight into dicts, in
+    the same field order and through the same ``to_representation`` calls as
+    the source serializer, but without per-row model instantiation, field
+    binding or attribute lookups. Supported fields:
+
+    * concrete model fields and forward foreign keys (rendered as their pk)
+    * dotted sources across foreign keys, e.g. ``category.name``
+    * SerializerMethodFields; the method receives a lightweight row object
+      whose attributes are the fetched columns: the same-named column, or
+      the one ``Meta.method_sources`` maps the field to
+    * sources listed in ``Meta.values_expressions``, a mapping of field name
+      to a query expression, for sources that are methods rather than columns
+
+    Anything else (nested or many-to-many fields) raises ImproperlyConfigured
+    when the serializer is compiled. ``fields`` limits rendering to a sparse
+    fieldset (see api/fieldsets.py). Use ``for_class`` to compile once per
+    serializer class and fieldset.
+    """
+    _compiled = {}
+    _compiled_lock = threading.Lock()
+    # Fieldsets come from query strings; don't let them grow the cache unbounded
+    max_compiled = 256
+
+    def __init__(self, serializer_class, extra_columns=(), fields=None):
+        self.serializer_class = serializer_class
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        expressions = getattr(serializer_class.Meta, 'values_expressions', {})
+        method_sources = getattr(serializer_class.Meta, 'method_sources', {})
+        self.annotations = {}
+        self.columns = {'id', *extra_columns}
+        # (output name, row key, kind, converter or method name, guard column, raw types)
+        self.plan = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                column = method_sources.get(name, name)
+                if self.is_column(model, column):
+                    self.columns.add(column)
+                self.plan.append((name, None, METHOD, field.method_name, None, None))
+                continue
+            if isinstance(field, (serializers.BaseSerializer, ManyRelatedField)) or (
+                isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField)
+            ):
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} cannot be rendered from .values()')
+
+            hops = field.source.split('.')
+            guard = None
+            if len(hops) > 1:
+                # DRF drops a read-only field whose relation is null; fetch the
+                # foreign key so render() can do the same
+                guard = hops[0]
+                self.columns.add(guard)
+            if name in expressions:
+                key = f'_values_{name}'
+                self.annotations[key] = expressions[name]
+            else:
+                key = '__'.join(hops)
+                self.columns.add(key)
+            kind, raw_types = self.get_kind(field)
+            self.plan.append((name, key, kind, self.get_converter(field), guard, raw_types))
+
+    @classmethod
+    def for_class(cls, serializer_class, extra_columns=(), fields=None):
+        key = (serializer_class, tuple(extra_columns), fields)
+        # Threaded workers share the cache; eviction and lookup must not interleave
+        with cls._compiled_lock:
+            compiled = cls._compiled.get(key)
+            if compiled is None:
+                if len(cls._compiled) >= cls.max_compiled:
+                    # Evict the oldest entry
+                    del cls._compiled[next(iter(cls._compiled))]
+                compiled = cls._compiled[key] = cls(serializer_class, extra_columns, fields)
+        return compiled
+
+    @staticmethod
+    def is_column(model, name):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return field.concrete and not field.many_to_many
+
+    @staticmethod
+    def get_kind(field):
+        if type(field) is serializers.DateTimeField:
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if (settings.USE_TZ and not hasattr(field, 'timezone')
+                    and output_format and output_format.lower() == ISO_8601):
+                return DATETIME, None
+        for field_class, raw_types in RAW_FIELDS:
+            if isinstance(field, field_class) and type(field).to_representation is field_class.to_representation:
+                if field_class is not serializers.JSONField or not field.binary:
+                    return RAW, raw_types
+        return VALUE, None
+
+    @staticmethod
+    def get_converter(field):
+        if isinstance(field, PrimaryKeyRelatedField):
+            # values() already yields the raw pk for foreign keys
+            return None
+        if isinstance(field, serializers.ModelField):
+            # ModelField reads the value off the instance itself
+            attname = field.model_field.attname
+            return lambda value: field.to_representation(SimpleNamespace(**{attname: value}))
+        return field.to_representation
+
+    def values_queryset(self, queryset):
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset.prefetch_related(None).values(*sorted(self.columns), *self.annotations)
+
+    def render(self, rows, context=None):
+        with timed('serialize'):
+            serializer = self.serializer_class(context=context or {})
+            # Bind per render so methods see this request's context
+            plan = [
+                (name, key, kind, getattr(serializer, converter) if kind == METHOD else converter, guard, raw_types)
+                for name, key, kind, converter, guard, raw_types in self.plan
+            ]
+            # DateTimeField looks the current timezone up for every value; do it once
+            current_timezone = timezone.get_current_timezone()
+            data = []
+            for row in rows:
+                obj = None
+                item = {}
+                for name, key, kind, converter, guard, raw_types in plan:
+                    if kind == METHOD:
+                        if obj is None:
+                            obj = SimpleNamespace(pk=row['id'], **row)
+                        item[name] = converter(obj)
+                    elif guard is None or row[guard] is not None:
+                        value = row[key]
+                        if value is None or converter is None:
+                            item[name] = value
+                        elif kind == RAW and isinstance(value, raw_types):
+                            item[name] = value
+                        elif kind == DATETIME and timezone.is_aware(value):
+                            value = value.astimezone(current_timezone).isoformat()
+                            item[name] = value[:-6] + 'Z' if value.endswith('+00:00') else value
+                        else:
+                            item[name] = converter(value)
+                data.append(item)
+            return data
+
+
+class FastListMixin:
+    """
+    Render list actions through a ValuesSerializer compiled from the list
+    serializer class. Enable per viewset with ``fast_list = True``.
+    """
+    fast_list = False
+
+    def get_values_serializer(self):
+        # Keyset pagination reads its seek column from the rows
+        keyset_column = getattr(self, 'keyset_ordering', '').lstrip('-')
+        serializer_class = self.get_serializer_class()
+        return ValuesSerializer.for_class(
+            serializer_class, [keyset_column] if keyset_column else [],
+            get_field_selection(serializer_class, self.request),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+
+        compiled = self.get_values_serializer()
+        queryset = compiled.values_queryset(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page, context))
+        return Response(compiled.render(queryset, context))
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return await super().alist(request, *args, **kwargs)
+
+        compiled = self.get_values_serializer()
+        queryset = compiled.values_queryset(await self.afilter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page, context))
+        return Response(compiled.render([row async for row in queryset], context))
@@ -0,0 +1,203 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+# Field name -> what it reads, per serializer class; see get_field_sources()
+_field_sources = {}
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_field_selection(serializer_class, request):
+    """
+    Names of the fields a read request asked for, or None for the default
+    representation.
+
+    ``?fields=a,b`` keeps only those fields and ``?omit=c`` drops fields.
+    Fields listed in ``Meta.expandable_fields`` (nested relations that cost
+    queries of their own) are part of the default representation, but once
+    a client sends ``fields`` or ``expand`` they are opt-in: ``?expand=tags``
+    adds them, ``?expand=`` alone leaves them all out. Unknown names are
+    ignored.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields = parse_field_list(params.get('fields', ''))
+    omit = parse_field_list(params.get('omit', ''))
+    if not fields and not omit and 'expand' not in params:
+        return None
+    expand = parse_field_list(params.get('expand', ''))
+    expandable = set(getattr(serializer_class.Meta, 'expandable_fields', ()))
+    names = get_field_sources(serializer_class)
+    if fields:
+        selected = [name for name in names if name in fields or (name in expand and name in expandable)]
+    elif 'expand' in params:
+        selected = [name for name in names if name not in expandable or name in expand]
+    else:
+        selected = names
+    return frozenset(name for name in selected if name not in omit)
+
+
+def get_field_sources(serializer_class):
+    """
+    What each field of the serializer reads, in field order:
+
+    * ``('column', name)`` for a column of the model, foreign keys included
+    * ``('related', fk, path)`` for a source across a foreign key: ``path``
+      is the column it ends in (``industry__name``), or ``fk`` itself when
+      it ends in a method such as ``author.get_full_name``
+    * ``('prefetch', relation)`` for many-to-many and reverse relations
+    * None when it can't be told, e.g. a SerializerMethodField without a
+      same-named column or an entry in ``Meta.method_sources``
+    """
+    if serializer_class not in _field_sources:
+        model = serializer_class.Meta.model
+        method_sources = getattr(serializer_class.Meta, 'method_sources', {})
+        sources = {}
+        for name, field in serializer_class().fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                sources[name] = resolve_source(model, [method_sources.get(name, name)])
+            else:
+                sources[name] = resolve_source(model, field.source.split('.'))
+        _field_sources[serializer_class] = sources
+    return _field_sources[serializer_class]
+
+
+def resolve_source(model, hops):
+    try:
+        field = model._meta.get_field(hops[0])
+    except FieldDoesNotExist:
+        return None
+    if field.many_to_many or field.one_to_many:
+        return ('prefetch', field.name)
+    if not field.concrete:
+        return None
+    if len(hops) == 1:
+        return ('column', field.name)
+    if not field.many_to_one:
+        return None
+    path = [field.name]
+    related = field.related_model
+    for hop in hops[1:]:
+        try:
+            hop_field = related._meta.get_field(hop)
+        except FieldDoesNotExist:
+            # A method or property of the related object: load all of it
+            return ('related', field.name, field.name)
+        if not hop_field.concrete or hop_field.many_to_many:
+            return ('related', field.name, field.name)
+        path.append(hop_field.name)
+        related = hop_field.related_model
+    return ('related', field.name, '__'.join(path))
+
+
+def flatten_select_related(select, prefix=''):
+    paths = []
+    for name, nested in select.items():
+        path = f'{prefix}{name}'
+        paths += flatten_select_related(nested, f'{path}__') if nested else [path]
+    return paths
+
+
+def shape_queryset(queryset, serializer_class, selection, required_columns=()):
+    """
+    Narrow a queryset to what rendering ``selection`` reads: only() the
+    columns, and keep just the select_related and prefetch_related lookups
+    those fields go through. Returns the queryset untouched when any
+    selected field reads something get_field_sources() can't tell.
+    """
+    sources = get_field_sources(serializer_class)
+    columns = set(required_columns)
+    joins = set()
+    # Foreign keys whose related object is used whole (a method reads it)
+    whole = set()
+    prefetches = set()
+    for name in selection:
+        source = sources[name]
+        if source is None:
+            return queryset
+        if source[0] == 'prefetch':
+            prefetches.add(source[1])
+        elif source[0] == 'related':
+            joins.add(source[1])
+            columns.add(source[2])
+            if source[2] == source[1]:
+                whole.add(source[1])
+        else:
+            columns.add(source[1])
+
+    select = queryset.query.select_related
+    if select is True:
+        # select_related() without arguments: every foreign key is joined
+        return queryset
+    if select:
+        kept = [path for path in flatten_select_related(select) if path.split('__')[0] in joins]
+        queryset = queryset.select_related(None)
+        if kept:
+            # select_related() without arguments would join everything
+            queryset = queryset.select_related(*kept)
+        joined = {path.split('__')[0] for path in kept}
+    else:
+        joined = set()
+    # Paths across a join that isn't made would be a query per row, and one
+    # into a relation used whole would defer the rest of it; load the key only
+    columns = {
+        column if column.split('__')[0] in joined - whole else column.split('__')[0] for column in columns
+    }
+
+    lookups = queryset._prefetch_related_lookups
+    kept = [lookup for lookup in lookups if getattr(lookup, 'prefetch_through', lookup).split('__')[0] in prefetches]
+    if len(kept) != len(lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+    return queryset.only('pk', *columns)
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer side of ``?fields=``, ``?omit=`` and ``?expand=`` (see
+    get_field_selection). Only the top-level serializer of a read request
+    is narrowed; nested serializers and writes always use every field.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is None:
+            selection = get_field_selection(type(self), self.context.get('request'))
+            if selection is not None:
+                fields = {name: field for name, field in fields.items() if name in selection}
+        return fields
+
+
+class SparseQuerysetMixin:
+    """
+    View side of sparse fieldsets: list and detail querysets fetch only the
+    columns and relations the selected fields render (see shape_queryset).
+    ``required_columns`` lists columns the view reads off the instances
+    itself.
+    """
+    sparse_actions = ('list', 'retrieve')
+    required_columns = []
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'action', None) not in self.sparse_actions:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        selection = get_field_selection(serializer_class, self.request)
+        if selection is None:
+            return queryset
+        return shape_queryset(queryset, serializer_class, selection, self.get_required_columns())
+
+    def get_required_columns(self):
+        columns = list(self.required_columns)
+        # Keyset pagination reads its seek column from the rows
+        keyset_column = getattr(self, 'keyset_ordering', '').lstrip('-')
+        if keyset_column:
+            columns.append(keyset_column)
+        return columns
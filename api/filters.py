@@ -0,0 +1,36 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+# Must match the text search configuration used by the triggers in
+# core/migrations/0005_search_vector.py
+SEARCH_CONFIG = 'english'
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Match ?search= against the stored, weighted search_vector on PostgreSQL
+    and order results by relevance. Other databases fall back to the regular
+    SearchFilter lookups over ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+        ordering = getattr(view, 'ordering', None) or []
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', *ordering)
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """Keep relevance order for full-text searches unless ?ordering= is given"""
+
+    def filter_queryset(self, request, queryset, view):
+        if 'search_rank' in queryset.query.annotations and not request.query_params.get(self.ordering_param):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
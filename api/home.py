@@ -0,0 +1,83 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from core.models import (
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial, Package, TeamMember, FAQ, SiteSettings
+)
+from .cache import CACHE_PREFIX, get_model_versions
+from .conditional import make_etag
+from .metrics import serialize
+from .serializers import (
+    ServiceSerializer, ProjectSerializer, TestimonialSerializer, PackageSerializer, TeamMemberSerializer,
+    FAQSerializer
+)
+from .site_settings import get_site_settings_payload
+
+User = get_user_model()
+
+# (key, queryset, serializer) per section, filtered and ordered like the
+# first page of the endpoint the landing page used to call for it
+HOME_SECTIONS = [
+    ('services', lambda: Service.objects.filter(is_active=True, is_featured=True).order_by('order', 'title'),
+     ServiceSerializer),
+    ('projects', lambda: Project.objects.filter(is_published=True, is_featured=True).select_related(
+        'industry', 'client').prefetch_related('tags', 'images').order_by('-created_at'), ProjectSerializer),
+    ('testimonials', lambda: Testimonial.objects.filter(is_published=True, is_featured=True).select_related(
+        'project').order_by('-created_at'), TestimonialSerializer),
+    ('packages', lambda: Package.objects.filter(is_active=True).order_by('order', 'price'), PackageSerializer),
+    ('team_members', lambda: TeamMember.objects.filter(is_active=True).order_by('order', 'name'),
+     TeamMemberSerializer),
+    ('faqs', lambda: FAQ.objects.filter(is_active=True).order_by('order', 'question'), FAQSerializer),
+]
+
+# Every model a section reads, the site settings included
+HOME_MODELS = [
+    SiteSettings, Service, Project, ProjectTag, ProjectImage, Industry, User, Testimonial, Package, TeamMember, FAQ,
+]
+
+
+def get_home_cache_key():
+    versions = ':'.join(get_model_versions(HOME_MODELS))
+    return f'{CACHE_PREFIX}:home:{hashlib.md5(versions.encode("utf-8")).hexdigest()}'
+
+
+def get_cached_home_payload():
+    """(cache key, stored (data, etag) or None)"""
+    key = get_home_cache_key()
+    return key, cache.get(key)
+
+
+def build_home_payload(key):
+    """
+    Compose every landing page section and store the result under ``key``.
+
+    The sections take eight queries whatever the row counts: one each plus
+    the project tags and images. The site settings row is only read when
+    this process hasn't cached it yet.
+    """
+    data = {'settings': get_site_settings_payload()[0]}
+    for name, queryset, serializer_class in HOME_SECTIONS:
+        rows = queryset()[:api_settings.PAGE_SIZE]
+        # No request in the context, so ?fields= can't narrow the shared blob
+        data[name] = serialize(serializer_class(rows, many=True))
+    # The key already embeds every model version the payload depends on
+    payload = (data, make_etag(key))
+    # Bounded lifetime covers queryset.update() paths that skip signals
+    cache.set(key, payload, settings.API_CACHE_TIMEOUT)
+    return payload
+
+
+def get_home_payload():
+    """
+    The landing page payload and its ETag, cached as one blob.
+
+    Changing any model in HOME_MODELS bumps its version (api/signals.py) and
+    with it the cache key, so the next read composes a fresh payload.
+    """
+    key, payload = get_cached_home_payload()
+    if payload is None:
+        payload = build_home_payload(key)
+    return payload
@@ -0,0 +1,101 @@
+import re
+from functools import lru_cache
+
+from cloudinary import CloudinaryResource
+from cloudinary.models import CLOUDINARY_FIELD_DB_RE
+from cloudinary.utils import cloudinary_url
+from django.conf import settings
+
+# Named renditions emitted for every image. Changing an entry here changes the
+# URLs for all images at once; nothing is stored per row.
+IMAGE_VARIANTS = {
+    'thumbnail': {'width': 400, 'height': 250, 'crop': 'fill', 'gravity': 'auto'},
+    'card': {'width': 800, 'height': 500, 'crop': 'fill', 'gravity': 'auto', 'quality': 'auto'},
+    'hero': {'width': 1920, 'height': 1080, 'crop': 'fill', 'gravity': 'auto', 'quality': 'auto'},
+}
+
+# Widths and modern formats for responsive <img srcset> attributes
+SRCSET_WIDTHS = (480, 960, 1440, 1920)
+SRCSET_FORMATS = ('webp', 'avif')
+
+URL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _plain_url(path, cloud_name):
+    return f"https://res.cloudinary.com/{cloud_name}/{path}"
+
+
+def get_cloudinary_url(path):
+    """Full URL for a stored Cloudinary value, memoized per path"""
+    if path and not str(path).startswith('http'):
+        return _plain_url(str(path), settings.CLOUDINARY_STORAGE.get('CLOUD_NAME', ''))
+    return path
+
+
+def as_resource(value):
+    """CloudinaryResource for a field value, including unsaved raw strings"""
+    if not value:
+        return None
+    if isinstance(value, CloudinaryResource):
+        return value
+    match = re.match(CLOUDINARY_FIELD_DB_RE, str(value))
+    return CloudinaryResource(
+        type=match.group('type') or 'upload',
+        resource_type=match.group('resource_type') or 'image',
+        version=match.group('version'),
+        public_id=match.group('public_id'),
+        format=match.group('format'),
+    )
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _transformed_url(public_id, version, image_format, upload_type, resource_type, transformation):
+    options = dict(format=image_format, version=version, type=upload_type, resource_type=resource_type)
+    options.update(transformation)
+    return cloudinary_url(public_id, **options)[0]
+
+
+def build_image_url(value, **transformation):
+    """
+    Same URL as ``CloudinaryResource.build_url(**transformation)``, but
+    computed once per public_id and transformation and then served from a
+    bounded LRU cache.
+    """
+    resource = as_resource(value)
+    if resource is None:
+        return None
+    return _transformed_url(
+        resource.public_id, resource.version, resource.format, resource.type,
+        resource.resource_type or 'image', tuple(sorted(transformation.items())),
+    )
+
+
+def variant_url(value, name):
+    return build_image_url(value, **IMAGE_VARIANTS[name])
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _variants(public_id, version, image_format, upload_type, resource_type):
+    resource = CloudinaryResource(
+        public_id=public_id, version=version, format=image_format, type=upload_type, resource_type=resource_type
+    )
+    variants = {name: build_image_url(resource, **options) for name, options in IMAGE_VARIANTS.items()}
+    variants['srcset'] = {
+        fmt: ', '.join(
+            f"{build_image_url(resource, width=width, crop='scale', fetch_format=fmt, quality='auto')} {width}w"
+            for width in SRCSET_WIDTHS
+        )
+        for fmt in SRCSET_FORMATS
+    }
+    return variants
+
+
+def image_variants(value):
+    """All named variants plus webp/avif srcsets for one image, built once"""
+    resource = as_resource(value)
+    if resource is None:
+        return None
+    return _variants(
+        resource.public_id, resource.version, resource.format, resource.type, resource.resource_type or 'image'
+    )
@@ -0,0 +1,176 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+from core.models import Lead, Service
+from .cache import bump_model_version
+from .serializers import LeadImportSerializer
+
+User = get_user_model()
+
+# Rows validated, resolved and inserted together in one transaction
+IMPORT_BATCH_SIZE = 1000
+
+
+class ImportFileError(ValueError):
+    """The file as a whole can't be read, as opposed to a bad row"""
+
+
+def read_rows(stream, file_format):
+    """Yield one dict per CSV or JSON Lines record from a text stream"""
+    if file_format == 'csv':
+        for row in csv.DictReader(stream):
+            yield {key.strip(): value for key, value in row.items() if key}
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Reported as a row error by the importer
+                    yield line
+
+
+def clean_row(row):
+    # Blank cells mean "not given", so model defaults apply
+    cleaned = {}
+    for key, value in row.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+        if value is not None:
+            cleaned[key] = value
+    return cleaned
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+class LeadImporter:
+    """
+    Validate and insert leads in batches.
+
+    Each batch is validated with one serializer instance, its
+    interested_service and assigned_to references are resolved with one
+    query each, and its valid rows are written with bulk_create inside one
+    transaction. Rows that fail are reported by their 1-based position in
+    the input and never block the rest of the batch.
+
+    interested_service may be a service id, slug or title; assigned_to may
+    be a user id, email or username.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.serializer = LeadImportSerializer()
+
+    def run(self, rows):
+        report = ImportReport()
+        batch = []
+        try:
+            for number, row in enumerate(rows, start=1):
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch, report)
+                    batch = []
+            if batch:
+                self.import_batch(batch, report)
+        finally:
+            if report.created and not self.dry_run:
+                # bulk_create sends no post_save, so invalidate cached stats here
+                bump_model_version(Lead)
+        return report
+
+    def import_batch(self, batch, report):
+        report.rows += len(batch)
+        validated = []
+        for number, row in batch:
+            if not isinstance(row, dict):
+                report.errors.append({'row': number, 'errors': {'non_field_errors': ['Expected a JSON object.']}})
+                continue
+            try:
+                validated.append((number, self.serializer.run_validation(clean_row(row))))
+            except serializers.ValidationError as exc:
+                report.errors.append({'row': number, 'errors': exc.detail})
+
+        services = self.resolve(
+            Service, [data.get('interested_service') for _, data in validated], ['slug', 'title']
+        )
+        users = self.resolve(User, [data.get('assigned_to') for _, data in validated], ['email', 'username'])
+
+        leads = []
+        for number, data in validated:
+            errors = {}
+            service_key = data.pop('interested_service', '')
+            user_key = data.pop('assigned_to', '')
+            if service_key and service_key not in services:
+                errors['interested_service'] = [f'No service matches "{service_key}".']
+            if user_key and user_key not in users:
+                errors['assigned_to'] = [f'No user matches "{user_key}".']
+            if errors:
+                report.errors.append({'row': number, 'errors': errors})
+                continue
+            leads.append(Lead(
+                interested_service_id=services.get(service_key), assigned_to_id=users.get(user_key), **data
+            ))
+
+        if leads and not self.dry_run:
+            with transaction.atomic():
+                Lead.objects.bulk_create(leads, batch_size=self.batch_size)
+        report.created += len(leads)
+
+    @staticmethod
+    def resolve(model, keys, text_fields):
+        """Map every reference in keys to a pk with a single query"""
+        keys = {key for key in keys if key}
+        if not keys:
+            return {}
+        # isdigit() alone accepts digits int() rejects, such as '²'
+        ids = {int(key) for key in keys if key.isascii() and key.isdigit()}
+        condition = Q(pk__in=ids)
+        for field in text_fields:
+            condition |= Q(**{f'{field}__in': keys})
+        resolved = {}
+        for pk, *texts in model.objects.filter(condition).values_list('pk', *text_fields):
+            for text in texts:
+                if text in keys:
+                    resolved.setdefault(text, pk)
+            if str(pk) in keys:
+                resolved[str(pk)] = pk
+        return resolved
+
+
+def import_leads_file(uploaded, file_format, **options):
+    """
+    Run LeadImporter over an uploaded or opened binary file.
+
+    Raises ImportFileError when the file isn't UTF-8 or isn't valid CSV.
+    Batches before the point of failure have already been saved.
+    """
+    stream = io.TextIOWrapper(uploaded, encoding='utf-8-sig', newline='')
+    try:
+        return LeadImporter(**options).run(read_rows(stream, file_format))
+    except UnicodeDecodeError:
+        raise ImportFileError('The file is not UTF-8 encoded text.') from None
+    except csv.Error as exc:
+        raise ImportFileError(f'The file is not valid CSV: {exc}.') from None
+    finally:
+        stream.detach()
@@ -0,0 +1,361 @@
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from core.models import (
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial, BlogCategory,
+    BlogTag, BlogPost, Package, Lead, TeamMember, Job, JobApplication, FAQ, Invoice
+)
+from api import urls as api_urls
+from api.view_counter import view_counter
+
+User = get_user_model()
+
+BENCH_PASSWORD = 'bench'
+# Routes guarded only by these are benchmarked anonymously, like the frontend calls them
+PUBLIC_PERMISSIONS = (permissions.AllowAny, permissions.IsAuthenticatedOrReadOnly)
+
+
+def no_payload():
+    return None, 'json'
+
+
+class QueryCounter:
+    """Cheap execute_wrapper that counts queries without capturing SQL"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database with synthetic data, drive every API route through the '
+        'test client and print p50/p95/p99 latency, queries and bytes per route as JSON. '
+        'Viewset create, update and delete routes are listed as skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=100,
+                            help='Rows per main model (services, projects, posts, leads, jobs, invoices)')
+        parser.add_argument('--applications', type=int, default=None,
+                            help='Job applications to seed (default: 5x --scale)')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per route')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per route')
+        parser.add_argument('--cold', action='store_true',
+                            help='Clear the cache before every request to measure uncached responses')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup can\'t be negative')
+        setup_test_environment()
+        # A throwaway database, created and migrated the same way the test runner does
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            admin = self.seed(options['scale'], options['applications'])
+            report = self.run(admin, options)
+        finally:
+            view_counter.stop()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def seed(self, scale, applications):
+        now = timezone.now()
+        admin = User.objects.create_user(
+            username='bench', email='bench@example.com', password=BENCH_PASSWORD, role='admin',
+            first_name='Bench', last_name='Admin'
+        )
+        body = '<p>' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 40 + '</p>'
+
+        industries = Industry.objects.bulk_create(
+            [Industry(name=f'Industry {n}', slug=f'industry-{n}') for n in range(10)]
+        )
+        project_tags = ProjectTag.objects.bulk_create(
+            [ProjectTag(name=f'Project tag {n}', slug=f'project-tag-{n}') for n in range(20)]
+        )
+        categories = BlogCategory.objects.bulk_create(
+            [BlogCategory(name=f'Category {n}', slug=f'category-{n}', description=body) for n in range(10)]
+        )
+        blog_tags = BlogTag.objects.bulk_create(
+            [BlogTag(name=f'Blog tag {n}', slug=f'blog-tag-{n}') for n in range(20)]
+        )
+
+        services = Service.objects.bulk_create([
+            Service(
+                title=f'Service {n}', slug=f'service-{n}', description=body,
+                short_description='Short description', order=n, is_featured=n % 5 == 0,
+                image=f'services/images/service-{n}'
+            ) for n in range(scale)
+        ])
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Project {n}', slug=f'project-{n}', description=body,
+                short_description='Short description', industry=industries[n % len(industries)],
+                client=admin, client_name='Acme', is_published=True, is_featured=n % 5 == 0,
+                featured_image=f'projects/featured/project-{n}'
+            ) for n in range(scale)
+        ])
+        Project.tags.through.objects.bulk_create([
+            Project.tags.through(project_id=project.pk, projecttag_id=project_tags[(i + k) % len(project_tags)].pk)
+            for i, project in enumerate(projects) for k in range(3)
+        ])
+        ProjectImage.objects.bulk_create([
+            ProjectImage(project=project, image=f'projects/gallery/project-{i}-{k}', order=k)
+            for i, project in enumerate(projects) for k in range(4)
+        ])
+        posts = [
+            BlogPost(
+                title=f'Post {n}', slug=f'post-{n}', content=body, excerpt='Excerpt',
+                author=admin, category=categories[n % len(categories)], is_published=True,
+                published_at=now - timedelta(hours=n), featured_image=f'blog/featured/post-{n}'
+            ) for n in range(scale)
+        ]
+        for post in posts:
+            post.set_text_fields()
+        posts = BlogPost.objects.bulk_create(posts)
+        BlogPost.tags.through.objects.bulk_create([
+            BlogPost.tags.through(blogpost_id=post.pk, blogtag_id=blog_tags[(i + k) % len(blog_tags)].pk)
+            for i, post in enumerate(posts) for k in range(3)
+        ])
+        Lead.objects.bulk_create([
+            Lead(
+                name=f'Lead {n}', email=f'lead{n}@example.com', message='Hello',
+                interested_service=services[n % len(services)], assigned_to=admin,
+                status=['new', 'contacted', 'qualified'][n % 3]
+            ) for n in range(scale)
+        ])
+        jobs = Job.objects.bulk_create([
+            Job(
+                title=f'Job {n}', slug=f'job-{n}', description=body, requirements='Python',
+                job_type='full_time', location='Remote', posted_by=admin
+            ) for n in range(scale)
+        ])
+        applications = scale * 5 if applications is None else applications
+        JobApplication.objects.bulk_create([
+            JobApplication(
+                job=jobs[n % len(jobs)], name=f'Applicant {n}', email=f'applicant{n}@example.com',
+                resume=f'resumes/applicant-{n}.pdf'
+            ) for n in range(applications)
+        ])
+        # bulk_create skips JobApplication.save, so rebuild the counters
+        call_command('repair_application_counts', verbosity=0, stdout=StringIO())
+        Invoice.objects.bulk_create([
+            Invoice(
+                invoice_number=f'INV-{n:06d}', client=admin, project=projects[n % len(projects)],
+                amount=Decimal('100.00'), tax_amount=Decimal('10.00'),
+                description=body, due_date=now.date() + timedelta(days=n % 60)
+            ) for n in range(scale)
+        ])
+        Testimonial.objects.bulk_create([
+            Testimonial(name=f'Client {n}', company='Acme', testimonial_text=body, project=projects[n % len(projects)])
+            for n in range(20)
+        ])
+        Package.objects.bulk_create([
+            Package(name=f'Package {n}', package_type='growth', description=body, price=Decimal(100 + n),
+                    features=['Feature A', 'Feature B'], order=n)
+            for n in range(6)
+        ])
+        TeamMember.objects.bulk_create([
+            TeamMember(name=f'Member {n}', role='Engineer', bio='Bio', order=n) for n in range(12)
+        ])
+        FAQ.objects.bulk_create([
+            FAQ(question=f'Question {n}?', answer='Answer', category='General', order=n) for n in range(30)
+        ])
+        return admin
+
+    def get_routes(self, admin):
+        """
+        (method, url, payload, needs_auth) for every route api/urls.py serves.
+
+        Routes come from the URL resolver. GET runs on each of them, with
+        detail routes pointed at the first row. A write runs only where
+        get_write_payloads() builds a request body for it. The remaining writes
+        (the viewsets' create, update and delete) are returned separately as
+        skipped.
+        """
+        payloads = self.get_write_payloads(admin)
+        routes, skipped, seen = [], [], set()
+        for pattern in self.iter_patterns(get_resolver(api_urls)):
+            groups = set(pattern.pattern.regex.groupindex)
+            if pattern.name is None or 'format' in groups:
+                # Format suffix variants repeat the plain route
+                continue
+            view = pattern.callback
+            cls = view.cls
+            needs_auth = not any(permission in PUBLIC_PERMISSIONS for permission in cls.permission_classes)
+            actions = getattr(view, 'actions', None)
+            if actions:
+                methods = [method for method in actions if method != 'head']
+            else:
+                methods = [method for method in ('get', 'post', 'put', 'patch', 'delete') if hasattr(cls, method)]
+            for kwargs in self.get_url_kwargs(cls, groups):
+                if kwargs is None:
+                    # No row to point a detail route at
+                    continue
+                url = reverse(pattern.name, kwargs=kwargs)
+                for method in methods:
+                    route = f'{method.upper()} {url}'
+                    if route in seen:
+                        continue
+                    seen.add(route)
+                    if method == 'get':
+                        routes.append(('GET', url, None, needs_auth))
+                    elif pattern.name in payloads and method == 'post':
+                        routes.append(('POST', url, payloads[pattern.name], needs_auth))
+                    else:
+                        skipped.append(route)
+        return routes, skipped
+
+    def iter_patterns(self, resolver):
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLResolver):
+                yield from self.iter_patterns(pattern)
+            else:
+                yield pattern
+
+    def get_url_kwargs(self, cls, groups):
+        """URL kwargs to request a route with, one dict per variant"""
+        kwargs = {}
+        lookup = getattr(cls, 'lookup_url_kwarg', None) or getattr(cls, 'lookup_field', None)
+        if lookup in groups:
+            instance = cls.queryset.order_by('pk').first()
+            if instance is None:
+                return [None]
+            kwargs[lookup] = getattr(instance, cls.lookup_field)
+        if 'export_format' in groups:
+            return [{**kwargs, 'export_format': export_format} for export_format in ('csv', 'jsonl')]
+        return [kwargs]
+
+    def get_write_payloads(self, admin):
+        """URL name -> callable returning (data, format) for one POST"""
+        refresh = str(RefreshToken.for_user(admin))
+        invoice_ids = list(Invoice.objects.order_by('pk').values_list('pk', flat=True)[:20])
+        job = Job.objects.order_by('pk').first()
+        counter = itertools.count()
+
+        def lead_rows():
+            batch = next(counter)
+            return [
+                {'name': f'Imported {batch}-{n}', 'email': f'import{batch}-{n}@example.com', 'message': 'Hi',
+                 'source': 'referral'}
+                for n in range(20)
+            ], 'json'
+
+        def application():
+            resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 bench resume', content_type='application/pdf')
+            return {'job': job.pk, 'name': 'Bench', 'email': 'bench@example.com', 'resume': resume}, 'multipart'
+
+        return {
+            'token_obtain_pair': lambda: ({'email': admin.email, 'password': BENCH_PASSWORD}, 'json'),
+            'token_refresh': lambda: ({'refresh': refresh}, 'json'),
+            'contact_form': lambda: ({'name': 'Bench', 'email': 'bench@example.com', 'message': 'Hi'}, 'json'),
+            'job_application_create': application,
+            'lead-import-leads': lead_rows,
+            'invoice-bulk-status': lambda: ({'ids': invoice_ids, 'status': 'sent'}, 'json'),
+        }
+
+    def run(self, admin, options):
+        anonymous = APIClient()
+        authenticated = APIClient()
+        authenticated.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+        routes, skipped = self.get_routes(admin)
+        results = {}
+        spool = tempfile.mkdtemp(prefix='bench-api-')
+        # Uploaded resumes go to local disk, synchronously, instead of Cloudinary
+        with override_settings(
+            RESUME_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=spool,
+            RESUME_SPOOL_DIR=os.path.join(spool, 'spool'), RESUME_UPLOAD_WORKERS=0,
+        ):
+            try:
+                for method, url, payload, needs_auth in routes:
+                    client = authenticated if needs_auth else anonymous
+                    results[f'{method} {url}'] = self.bench_route(client, method, url, payload, options)
+            finally:
+                shutil.rmtree(spool, ignore_errors=True)
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'scale': options['scale'],
+                'iterations': options['iterations'],
+                'cold_cache': options['cold'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'skipped': skipped,
+            },
+            'routes': results,
+        }
+
+    def bench_route(self, client, method, url, payload, options):
+        request = getattr(client, method.lower())
+        payload = payload or no_payload
+        for _ in range(options['warmup']):
+            data, format = payload()
+            request(url, data, format=format)
+        timings, queries, sizes, statuses = [], [], [], set()
+        for _ in range(options['iterations']):
+            if options['cold']:
+                cache.clear()
+            # Build the body outside the timed block
+            data, format = payload()
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = request(url, data, format=format)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(counter.count)
+            sizes.append(len(response.getvalue() if response.streaming else response.content))
+            statuses.add(response.status_code)
+        return self.summarize(timings, queries, sizes, statuses)
+
+    def summarize(self, timings, queries, sizes, statuses):
+        if len(timings) > 1:
+            cuts = statistics.quantiles(timings, n=100, method='inclusive')
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = timings[0]
+        return {
+            'status': sorted(statuses),
+            'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3),
+            'p99_ms': round(p99, 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': round(statistics.fmean(queries), 2),
+            'bytes': round(statistics.fmean(sizes)),
+        }
@@ -0,0 +1,92 @@
+import json
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+from core.models import BlogPost, Project
+from api import compression, renderers
+from api.home import build_home_payload, get_home_cache_key
+from api.serializers import BlogPostListSerializer, BlogPostSerializer, ProjectSerializer
+from api.view_counter import view_counter
+from .bench_api import Command as BenchApiCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the heaviest read payloads with DRF's JSONRenderer and FastJSONRenderer, "
+        'compress them with each coding CompressionMiddleware can use, and print encode '
+        'time and bytes on the wire as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            BenchApiCommand().seed(max(options['page_size'], 100), applications=0)
+            report = self.run(self.get_payloads(options['page_size']), options['iterations'])
+        finally:
+            view_counter.stop()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def get_payloads(self, page_size):
+        """One page of each, shaped like the endpoint's response body"""
+        projects = Project.objects.filter(is_published=True).select_related('industry', 'client').prefetch_related(
+            'tags', 'images').order_by('-created_at')
+        posts = BlogPost.objects.filter(is_published=True).select_related('author', 'category')
+
+        def page(rows):
+            return {'count': len(rows), 'next': None, 'previous': None, 'results': rows}
+
+        return {
+            'projects': page(ProjectSerializer(projects[:page_size], many=True).data),
+            'blog-posts': page(BlogPostListSerializer(
+                posts.defer('content', 'plain_text').order_by('-published_at')[:page_size], many=True).data),
+            'blog-post': BlogPostSerializer(posts.prefetch_related('tags').first()).data,
+            'home': build_home_payload(get_home_cache_key())[0],
+        }
+
+    def run(self, payloads, iterations):
+        drf, fast = JSONRenderer(), renderers.FastJSONRenderer()
+        results = {}
+        for name, data in payloads.items():
+            content = drf.render(data)
+            drf_ms = self.time(lambda: drf.render(data), iterations)
+            fast_ms = self.time(lambda: fast.render(data), iterations)
+            result = {
+                'bytes': len(content),
+                'drf_ms': round(drf_ms, 3),
+                'fast_ms': round(fast_ms, 3),
+                'speedup': round(drf_ms / fast_ms, 2),
+            }
+            for coding in compression.get_codings():
+                result[f'{coding}_bytes'] = len(compression.compress(content, coding))
+                result[f'{coding}_ms'] = round(self.time(lambda: compression.compress(content, coding), iterations), 3)
+                result[f'{coding}_ratio'] = round(len(content) / result[f'{coding}_bytes'], 2)
+            results[name] = result
+        return {
+            'iterations': iterations,
+            'orjson': renderers.orjson is not None,
+            'brotli': compression.brotli is not None,
+            'brotli_quality': compression.BROTLI_QUALITY,
+            'results': results,
+        }
+
+    def time(self, func, iterations):
+        func()
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
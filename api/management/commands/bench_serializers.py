@@ -0,0 +1,91 @@
+import json
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from core.models import Service, BlogPost, Package, Job, FAQ
+from api.fast_serializers import ValuesSerializer
+from api.serializers import (
+    ServiceSerializer, BlogPostListSerializer, PackageSerializer, JobListSerializer, FAQSerializer
+)
+from api.view_counter import view_counter
+from .bench_api import Command as BenchApiCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ModelSerializer(many=True) against the .values() fast path for one '
+        'page of each list serializer and print rows/s and the speedup as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=30)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            scale = max(options['page_size'], 100)
+            BenchApiCommand().seed(scale, applications=0)
+            # Packages and FAQs are seeded sparsely for the route benchmark
+            Package.objects.bulk_create([
+                Package(name=f'Bench package {n}', package_type='growth', description='<p>P</p>',
+                        price=100 + n, features=['Feature A'], order=n)
+                for n in range(scale)
+            ])
+            FAQ.objects.bulk_create([
+                FAQ(question=f'Bench question {n}?', answer='Answer', order=n) for n in range(scale)
+            ])
+            report = self.run(options['page_size'], options['iterations'])
+        finally:
+            view_counter.stop()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run(self, page_size, iterations):
+        cases = [
+            ('services', ServiceSerializer, Service.objects.filter(is_active=True).order_by('order', 'title')),
+            ('blog-posts', BlogPostListSerializer,
+             BlogPost.objects.filter(is_published=True).select_related('author', 'category')
+             .defer('content', 'plain_text').order_by('-published_at')),
+            ('packages', PackageSerializer, Package.objects.filter(is_active=True).order_by('order', 'price')),
+            ('jobs', JobListSerializer, Job.objects.filter(status='open').order_by('-created_at')),
+            ('faqs', FAQSerializer, FAQ.objects.filter(is_active=True).order_by('order', 'question')),
+        ]
+        results = {}
+        for name, serializer_class, queryset in cases:
+            compiled = ValuesSerializer.for_class(serializer_class)
+            values_queryset = compiled.values_queryset(queryset)
+            instances = list(queryset[:page_size])
+            rows = list(values_queryset[:page_size])
+            # Fetch + render, as the list endpoint does it
+            regular_ms = self.time(lambda: serializer_class(list(queryset[:page_size]), many=True).data, iterations)
+            fast_ms = self.time(lambda: compiled.render(values_queryset[:page_size]), iterations)
+            # Rendering already fetched rows
+            serialize_ms = self.time(lambda: serializer_class(instances, many=True).data, iterations)
+            render_ms = self.time(lambda: compiled.render(rows), iterations)
+            results[name] = {
+                'rows': len(rows),
+                'serializer_ms': round(regular_ms, 3),
+                'values_ms': round(fast_ms, 3),
+                'serializer_rows_per_s': round(len(rows) / regular_ms * 1000),
+                'values_rows_per_s': round(len(rows) / fast_ms * 1000),
+                'speedup': round(regular_ms / fast_ms, 2),
+                'render_only_speedup': round(serialize_ms / render_ms, 2),
+            }
+        return {'page_size': page_size, 'iterations': iterations, 'database': connection.vendor, 'results': results}
+
+    def time(self, func, iterations):
+        func()
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
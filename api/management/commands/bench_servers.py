@@ -0,0 +1,248 @@
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from core.models import BlogPost, Project, Service
+from api.view_counter import view_counter
+from .bench_api import Command as BenchApiCommand
+
+# name -> (server module, extra arguments, ASYNC_READS)
+SERVERS = {
+    'sync': ('gunicorn', ['--worker-class', 'sync'], False),
+    'gthread': ('gunicorn', ['--worker-class', 'gthread'], False),
+    'asgi-sync': ('uvicorn', [], False),
+    'asgi': ('uvicorn', [], True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database, serve it with gunicorn (sync and gthread workers) and uvicorn '
+        '(with and without ASYNC_READS), drive the same public read workload against each and '
+        'print throughput and p50/p95/p99 latency per server as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+        parser.add_argument('--scale', type=int, default=100, help='Rows per main model, as in bench_api')
+        parser.add_argument('--workers', type=int, default=2, help='Server processes per configuration')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per gthread worker')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds of timed load per server')
+        parser.add_argument('--warmup', type=float, default=2, help='Seconds of untimed load per server')
+        parser.add_argument('--uncached', action='store_true',
+                            help='Disable the response cache (API_CACHE_TIMEOUT=0) so every read hits the database')
+        parser.add_argument('--port', type=int, default=8765, help='First port; each server gets the next one')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'bench_servers supports SQLite and PostgreSQL, not {connection.vendor}')
+        workdir = tempfile.mkdtemp(prefix='bench-servers-')
+        setup_test_environment()
+        # Servers run in other processes, so an in-memory SQLite test database won't do
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(workdir, 'bench.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            BenchApiCommand().seed(options['scale'], None)
+            urls = self.get_urls()
+            database_url = self.get_database_url()
+            servers = {}
+            for index, name in enumerate(options['servers']):
+                port = options['port'] + index
+                servers[name] = self.bench_server(name, port, urls, database_url, workdir, options)
+        finally:
+            view_counter.stop()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'scale': options['scale'],
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'concurrency': options['concurrency'],
+                'duration_s': options['duration'],
+                'cached': not options['uncached'],
+                'database': connection.vendor,
+                'cpus': os.cpu_count(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'urls': urls,
+            },
+            'servers': servers,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def get_urls(self):
+        """The anonymous public reads the frontend issues, list and detail"""
+        return [
+            '/api/services/',
+            f'/api/services/{Service.objects.values_list("slug", flat=True).first()}/',
+            '/api/projects/',
+            f'/api/projects/{Project.objects.values_list("slug", flat=True).first()}/',
+            '/api/blog-posts/',
+            f'/api/blog-posts/{BlogPost.objects.values_list("slug", flat=True).first()}/',
+            '/api/testimonials/',
+            '/api/packages/',
+            '/api/settings/',
+        ]
+
+    def get_database_url(self):
+        db = connection.settings_dict
+        if connection.vendor == 'sqlite':
+            return f"sqlite:///{db['NAME']}"
+        credentials = quote(db['USER'] or '', safe='')
+        if db['PASSWORD']:
+            credentials += ':' + quote(db['PASSWORD'], safe='')
+        host = db['HOST'] or 'localhost'
+        port = f":{db['PORT']}" if db['PORT'] else ''
+        return f"postgres://{credentials}@{host}{port}/{quote(db['NAME'], safe='')}"
+
+    def get_command(self, name, port, options):
+        module, extra, _ = SERVERS[name]
+        if module == 'gunicorn':
+            command = [
+                sys.executable, '-m', 'gunicorn', 'saim_enterprises.wsgi', '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['workers']), '--log-level', 'warning', *extra,
+            ]
+            if name == 'gthread':
+                command += ['--threads', str(options['threads'])]
+            return command
+        return [
+            sys.executable, '-m', 'uvicorn', 'saim_enterprises.asgi:application', '--host', '127.0.0.1',
+            '--port', str(port), '--workers', str(options['workers']), '--log-level', 'warning',
+            '--no-access-log', *extra,
+        ]
+
+    def bench_server(self, name, port, urls, database_url, workdir, options):
+        module, _, async_reads = SERVERS[name]
+        if importlib.util.find_spec(module) is None:
+            return {'skipped': f'{module} is not installed'}
+
+        env = dict(
+            os.environ, DATABASE_URL=database_url, DEBUG='False', ALLOWED_HOSTS='127.0.0.1',
+            ASYNC_READS=str(async_reads),
+        )
+        if options['uncached']:
+            env['API_CACHE_TIMEOUT'] = '0'
+        if module == 'uvicorn' and env.get('DB_CONNECTIONS', 'persistent') == 'persistent':
+            # Persistent connections are per thread, and ASGI uses a new thread per request
+            env['DB_CONNECTIONS'] = 'none'
+        log_path = os.path.join(workdir, f'{name}.log')
+        with open(log_path, 'w') as log:
+            process = subprocess.Popen(
+                self.get_command(name, port, options), cwd=settings.BASE_DIR, env=env,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+        try:
+            self.wait_until_ready(process, port, log_path)
+            self.stderr.write(f'Benchmarking {name} on port {port}')
+            self.drive(port, urls, options['concurrency'], options['warmup'])
+            samples = self.drive(port, urls, options['concurrency'], options['duration'])
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return self.summarize(samples, options['duration'])
+
+    def wait_until_ready(self, process, port, log_path, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                break
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                conn.request('GET', '/api/settings/', headers={'Accept': 'application/json'})
+                status = conn.getresponse().status
+                conn.close()
+                if status == 200:
+                    return
+            except (OSError, http.client.HTTPException):
+                pass
+            time.sleep(0.2)
+        with open(log_path) as fh:
+            tail = fh.read()[-2000:]
+        raise CommandError(f'Server on port {port} did not become ready:\n{tail}')
+
+    def drive(self, port, urls, concurrency, duration):
+        """Closed-loop load: each connection sends its next request as soon as the last one returns"""
+        deadline = time.perf_counter() + duration
+
+        def client(offset):
+            # HTTPConnection reconnects by itself when the server closes the socket
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            samples = []
+            n = offset
+            while time.perf_counter() < deadline:
+                url = urls[n % len(urls)]
+                n += 1
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', url, headers={'Accept': 'application/json'})
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException):
+                    status = 0
+                    conn.close()
+                samples.append((url, (time.perf_counter() - start) * 1000, status))
+            conn.close()
+            return samples
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return [sample for samples in pool.map(client, range(concurrency)) for sample in samples]
+
+    def summarize(self, samples, duration):
+        if not samples:
+            return {'requests': 0}
+        routes = {}
+        for url, elapsed, _ in samples:
+            routes.setdefault(url, []).append(elapsed)
+        timings = [elapsed for _, elapsed, _ in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _, _, status in samples if status != 200),
+            'rps': round(len(samples) / duration, 1),
+            **self.percentiles(timings),
+            'routes': {url: self.percentiles(values) for url, values in routes.items()},
+        }
+
+    @staticmethod
+    def percentiles(timings):
+        if len(timings) > 1:
+            cuts = statistics.quantiles(timings, n=100, method='inclusive')
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = timings[0]
+        return {'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3)}
@@ -0,0 +1,71 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+from api.urls import router
+
+# Plan lines that read a whole table instead of an index
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)\b(?! USING (?:COVERING )?INDEX)'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN each API viewset's default list query and flag sequential scans. "
+        "Run it against PostgreSQL; SQLite plans on near-empty tables are only a hint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--allow-seqscan', action='store_true',
+            help='Let PostgreSQL pick sequential scans (by default they are disabled so the '
+                 'planner reveals whether an index path exists at all, even on tiny tables)',
+        )
+        parser.add_argument(
+            '--fail-on-seqscan', action='store_true',
+            help='Exit with an error when any viewset query still needs a sequential scan',
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'EXPLAIN parsing is not supported for {connection.vendor}')
+
+        flagged = []
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql' and not options['allow_seqscan']:
+                cursor.execute('SET enable_seqscan = off')
+            try:
+                for prefix, viewset, basename in router.registry:
+                    queryset = self.get_queryset(viewset, prefix)
+                    if not queryset.query.where and not queryset.ordered:
+                        # Listing a whole unordered table is a scan by definition
+                        self.stdout.write(f'{prefix}: skipped (no filter or ordering)')
+                        continue
+                    plan = queryset.explain()
+                    tables = sorted(set(pattern.findall(plan)))
+                    if tables:
+                        flagged.append(prefix)
+                        self.stdout.write(self.style.WARNING(f'{prefix}: sequential scan on {", ".join(tables)}'))
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f'{prefix}: ok'))
+                    if options['verbosity'] > 1:
+                        self.stdout.write(plan + '\n')
+            finally:
+                if connection.vendor == 'postgresql' and not options['allow_seqscan']:
+                    cursor.execute('RESET enable_seqscan')
+
+        if flagged and options['fail_on_seqscan']:
+            raise CommandError(f'Sequential scans in: {", ".join(flagged)}')
+
+    def get_queryset(self, viewset, prefix):
+        """The first page of the viewset's list query with its default filters and ordering"""
+        view = viewset(action='list', format_kwarg=None, kwargs={})
+        view.request = Request(APIRequestFactory().get(f'/api/{prefix}/'))
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:api_settings.PAGE_SIZE]
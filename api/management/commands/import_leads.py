@@ -0,0 +1,43 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from api.imports import IMPORT_BATCH_SIZE, ImportFileError, import_leads_file
+
+
+class Command(BaseCommand):
+    help = 'Bulk import leads from a CSV or JSON Lines file, reporting failed rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or .jsonl with one object per line')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, insert nothing')
+        parser.add_argument('--errors', help='Write the per-row error report to this JSON file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as fh:
+                report = import_leads_file(
+                    fh, file_format, batch_size=options['batch_size'], dry_run=options['dry_run']
+                )
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - start
+
+        for error in report.errors[:20]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        if len(report.errors) > 20:
+            self.stderr.write(f'... {len(report.errors) - 20} more')
+        if options['errors']:
+            with open(options['errors'], 'w') as fh:
+                json.dump(report.errors, fh, indent=2)
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {report.created} of {report.rows} row(s), {len(report.errors)} failed '
+            f'in {elapsed:.2f}s ({report.rows / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
@@ -0,0 +1,268 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.response import Response
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Timing of the request being served in this context; asgiref copies it into
+# the threads that sync_to_async runs ORM calls and sync views in
+current_timing = ContextVar('current_timing', default=None)
+
+
+class RequestTiming:
+    """Where one request spent its time; db, serialize and render don't overlap"""
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.active = set()
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to the current request's ``phase``"""
+    timing = current_timing.get()
+    if timing is None or phase in timing.active:
+        # Not in a request, or nested in an outer block of the same phase
+        yield
+        return
+    timing.active.add(phase)
+    start, db = perf_counter(), timing.db
+    try:
+        yield
+    finally:
+        timing.active.discard(phase)
+        # Queries run lazily inside the block are already counted as db time
+        elapsed = perf_counter() - start - (timing.db - db)
+        setattr(timing, phase, getattr(timing, phase) + elapsed)
+
+
+def time_query(execute, sql, params, many, context):
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db += perf_counter() - start
+        timing.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver: time every query the connection runs"""
+    if time_query not in connection.execute_wrappers:
+        # First, so connection.execute_wrapper() blocks still pop their own
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def serialize(serializer):
+    """A serializer's data, timed as the current request's serialize phase"""
+    with timed('serialize'):
+        return serializer.data
+
+
+class SerializeTimingMixin:
+    """
+    DRF's list and retrieve with the serializer's data read as the serialize
+    phase. Put it right before the viewset base class so the other mixins
+    wrap it.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize(self.get_serializer(page, many=True)))
+        return Response(serialize(self.get_serializer(queryset, many=True)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(serialize(self.get_serializer(self.get_object())))
+
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def inc(self, *labels):
+        with self.lock:
+            self.series[labels] = self.series.get(labels, 0) + 1
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self.lock:
+            series = sorted(self.series.items())
+        for values, count in series:
+            lines.append(f'{self.name}{format_labels(self.labels, values)} {count}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # Label values -> [per-bucket counts..., +Inf count, sum]
+        self.series = {}
+
+    def observe(self, value, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            series = sorted((values, list(counts)) for values, counts in self.series.items())
+        for values, counts in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{format_labels(self.labels, values, le=bound)} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.labels, values)} {counts[-1]}')
+            lines.append(f'{self.name}_count{format_labels(self.labels, values)} {cumulative}')
+        return lines
+
+
+class RequestMetrics:
+    """In-process aggregates of every request this worker served"""
+
+    def __init__(self):
+        labels = ('view', 'method')
+        self.requests = Counter('http_requests_total', 'Requests served.', ('view', 'method', 'status'))
+        self.duration = Histogram(
+            'http_request_duration_seconds', 'Time spent handling a request.', labels, DURATION_BUCKETS
+        )
+        self.db = Histogram('http_request_db_seconds', 'Time spent in database queries.', labels, DURATION_BUCKETS)
+        self.queries = Histogram('http_request_db_queries', 'Database queries run.', labels, QUERY_BUCKETS)
+        self.serialize = Histogram(
+            'http_request_serialize_seconds', 'Time spent in serializers, queries excluded.', labels, DURATION_BUCKETS
+        )
+        self.render = Histogram(
+            'http_request_render_seconds', 'Time spent rendering the response body.', labels, DURATION_BUCKETS
+        )
+        self.size = Histogram('http_response_size_bytes', 'Response body size.', labels, SIZE_BUCKETS)
+
+    def observe(self, view, method, status, timing, total, size):
+        self.requests.inc(view, method, str(status))
+        self.duration.observe(total, view, method)
+        self.db.observe(timing.db, view, method)
+        self.queries.observe(timing.queries, view, method)
+        self.serialize.observe(timing.serialize, view, method)
+        self.render.observe(timing.render, view, method)
+        if size is not None:
+            self.size.observe(size, view, method)
+
+    def expose(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in (self.requests, self.duration, self.db, self.queries, self.serialize, self.render, self.size):
+            lines += metric.expose()
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+
+class ServerTimingMiddleware:
+    """
+    Per-request timings: the Server-Timing header plus request_metrics.
+
+    Put it first in MIDDLEWARE so the total covers the whole stack. Query
+    time comes from the execute wrapper install_query_timer puts on every
+    connection, serializer time from the views' serialize() calls
+    (SerializeTimingMixin, FastListMixin), and render time from a
+    post-render callback (DRF responses render after the view returns).
+    Whatever is left over (middleware, auth, view code) is reported as
+    ``app``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    def process_template_response(self, request, response):
+        timing = current_timing.get()
+        if timing is not None:
+            # Called last of all middleware, right before Django renders
+            start, db = perf_counter(), timing.db
+
+            def rendered(response):
+                timing.render += perf_counter() - start - (timing.db - db)
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timing):
+        total = perf_counter() - timing.start
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match is not None else '<unmatched>'
+        size = None if response.streaming else len(response.content)
+        request_metrics.observe(view, request.method, response.status_code, timing, total, size)
+
+        if settings.SERVER_TIMING:
+            app = max(total - timing.db - timing.serialize - timing.render, 0.0)
+            entries = [
+                f'total;dur={total * 1000:.2f};desc="{view}"',
+                f'db;dur={timing.db * 1000:.2f};desc="{timing.queries} queries"',
+                f'serialize;dur={timing.serialize * 1000:.2f}',
+                f'render;dur={timing.render * 1000:.2f}',
+                f'app;dur={app * 1000:.2f}',
+            ]
+            if size is not None:
+                entries.append(f'size;desc="{size} bytes"')
+            response['Server-Timing'] = ', '.join(entries)
+        return response
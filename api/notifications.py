@@ -0,0 +1,49 @@
+from django.conf import settings
+from core.models import SiteSettings
+from core.outbox import enqueue
+
+
+def get_notification_recipients():
+    if settings.NOTIFICATION_EMAILS:
+        return settings.NOTIFICATION_EMAILS
+    company_email = SiteSettings.objects.values_list('company_email', flat=True).first()
+    return [company_email] if company_email else []
+
+
+def queue_lead_notification(lead):
+    """Queue the staff email for a new contact form lead"""
+    recipients = get_notification_recipients()
+    if not recipients:
+        return None
+    lines = [
+        f'Name: {lead.name}',
+        f'Email: {lead.email}',
+        f'Phone: {lead.phone or "-"}',
+        f'Company: {lead.company or "-"}',
+        f'Interested in: {lead.interested_service.title if lead.interested_service else "-"}',
+        '',
+        lead.message,
+    ]
+    return enqueue(
+        'lead_received', f'New inquiry from {lead.name}', '\n'.join(lines), recipients, reply_to=lead.email
+    )
+
+
+def queue_application_notification(application):
+    """Queue the staff email for a new job application"""
+    recipients = get_notification_recipients()
+    if not recipients:
+        return None
+    lines = [
+        f'Job: {application.job.title}',
+        f'Name: {application.name}',
+        f'Email: {application.email}',
+        f'Phone: {application.phone or "-"}',
+        f'Portfolio: {application.portfolio_url or "-"}',
+        '',
+        application.cover_letter,
+    ]
+    return enqueue(
+        'application_received', f'New application for {application.job.title} from {application.name}',
+        '\n'.join(lines), recipients, reply_to=application.email
+    )
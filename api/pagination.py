@@ -0,0 +1,210 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """DRF page-number pagination plus an async twin for async read views"""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached property; fill it without a blocking COUNT
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return rows
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over one ordering column plus an id tiebreaker.
+
+    Each page is fetched with a WHERE on the last row's (value, id) instead of
+    an OFFSET, and no COUNT(*) is issued, so deep pages cost the same as the
+    first one and rows inserted while paging never shift or duplicate results.
+
+    ``?ordering=`` may flip the direction of the ordering column; any other
+    ordering, relevance order of a full-text search included, can't be
+    seeked on and is rejected rather than silently replaced.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering_query_param = api_settings.ORDERING_PARAM
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering='-created_at'):
+        self.field = ordering.lstrip('-')
+        self.descending = ordering.startswith('-')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page([row async for row in queryset[:self.page_size + 1]])
+
+    def get_page_queryset(self, queryset, request):
+        """Order and seek the queryset to the requested cursor"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.has_cursor = self.cursor_query_param in request.query_params
+        self.check_ordering(queryset, request)
+        position, reverse = self.decode_cursor(request)
+        self.reverse = reverse
+
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}id')
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'id__{lookup}': pk})
+            )
+        return queryset
+
+    def check_ordering(self, queryset, request):
+        requested = request.query_params.get(self.ordering_query_param, '').strip()
+        if requested:
+            if requested.lstrip('-') != self.field:
+                raise ValidationError({self.ordering_query_param: [
+                    f'Cursor pagination can only order by {self.field} or -{self.field}.'
+                ]})
+            self.descending = requested.startswith('-')
+        elif 'search_rank' in queryset.query.annotations:
+            raise ValidationError({self.ordering_query_param: [
+                f'Cursor pagination can\'t order search results by relevance; pass ordering=-{self.field} '
+                'or use page numbers.'
+            ]})
+
+    def finish_page(self, rows):
+        """Trim the look-ahead row and record the positions for the links"""
+        reverse = self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.get_position(rows[-1])
+            if (has_more and reverse) or (self.has_cursor and not reverse):
+                self.previous_position = self.get_position(rows[0])
+        return rows
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            return instance[self.field], instance['id']
+        return getattr(instance, self.field), instance.pk
+
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps({'v': value, 'id': pk, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            value = datetime.fromisoformat(payload['v'])
+            return (value, int(payload['id'])), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination on request.
+
+    Clients opt in with ``?pagination=cursor`` and then follow the returned
+    ``next``/``previous`` links. The view's ``keyset_ordering`` picks the
+    column to seek on.
+    """
+    mode_query_param = 'pagination'
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def select_paginator(self, request, view):
+        if self.use_keyset(request):
+            ordering = getattr(view, 'keyset_ordering', '-created_at')
+            self.paginator = KeysetPagination(ordering)
+        else:
+            self.paginator = PageNumberPagination()
+        return self.paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.select_paginator(request, view).paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await self.select_paginator(request, view).apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+    def get_results(self, data):
+        return data['results']
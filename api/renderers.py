@@ -0,0 +1,42 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so they keep its format (milliseconds,
+    # trailing Z); integer dict keys become strings as with the json module
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    The output is compact UTF-8 JSON that decodes to the same values DRF's
+    would, but not always to the same bytes: orjson writes some floats
+    differently (``1e16`` for ``1e+16``, ``1e-7`` for ``1e-07``), so ETags
+    hashed from the body change when the renderer is switched. Anything orjson
+    doesn't know natively (Decimal, lazy translations, datetimes) is handed
+    to DRF's encoder, and indented output (the browsable API,
+    ``Accept: application/json; indent=4``), ``UNICODE_JSON = False`` and
+    values orjson refuses (integers wider than 64 bits) are rendered by the
+    stock renderer. Without orjson this is DRF's JSONRenderer.
+
+    Unlike the json module, orjson writes NaN and infinities as null rather
+    than raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like DRF does, so the output stays valid JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
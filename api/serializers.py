@@ -1,22 +1,20 @@
 from rest_framework import serializers
-from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, Trim
 from core.models import (
     Service, Industry, Project, ProjectImage, ProjectTag,
     Testimonial, BlogCategory, BlogTag, BlogPost, Package, Lead, TeamMember,
     Job, JobApplication, FAQ, Invoice, SiteSettings
 )
+from core.resume_uploads import spool_resume
 
-User = get_user_model()
+from .fieldsets import SparseFieldsetsMixin
+from .images import get_cloudinary_url, image_variants, variant_url
 
-# Helper function to build full Cloudinary URL
-def get_cloudinary_url(path):
-    if path and not str(path).startswith('http'):
-        cloud_name = settings.CLOUDINARY_STORAGE.get('CLOUD_NAME', '')
-        return f"https://res.cloudinary.com/{cloud_name}/{path}"
-    return path
+User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
 
     class Meta:
@@ -27,14 +25,17 @@ class UserSerializer(serializers.ModelSerializer):
     def get_avatar(self, obj):
         return get_cloudinary_url(obj.avatar)
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     icon = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Service
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # Columns read by SerializerMethodFields not named after them
+        method_sources = {'image_variants': 'image'}
 
     def get_icon(self, obj):
         return get_cloudinary_url(obj.icon)
@@ -42,29 +43,33 @@ class ServiceSerializer(serializers.ModelSerializer):
     def get_image(self, obj):
         return get_cloudinary_url(obj.image)
 
-class IndustrySerializer(serializers.ModelSerializer):
-    image = serializers.SerializerMethodField()
+    def get_image_variants(self, obj):
+        return image_variants(obj.image)
+
+class IndustrySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Industry
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_image(self, obj):
-        return get_cloudinary_url(obj.image)
-
-class ProjectImageSerializer(serializers.ModelSerializer):
+class ProjectImageSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = ProjectImage
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        method_sources = {'image_variants': 'image'}
 
     def get_image(self, obj):
         return get_cloudinary_url(obj.image)
 
-class ProjectTagSerializer(serializers.ModelSerializer):
+    def get_image_variants(self, obj):
+        return image_variants(obj.image)
+
+class ProjectTagSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = ProjectTag
@@ -72,18 +77,24 @@ class ProjectTagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     industry_name = serializers.CharField(source='industry.name', read_only=True)
     client_email = serializers.CharField(source='client.email', read_only=True)
     tags = ProjectTagSerializer(many=True, read_only=True)
     images = ProjectImageSerializer(many=True, read_only=True)
+    featured_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['tags', 'images']
+        method_sources = {'featured_image_variants': 'featured_image'}
 
-class TestimonialSerializer(serializers.ModelSerializer):
+    def get_featured_image_variants(self, obj):
+        return image_variants(obj.featured_image)
+
+class TestimonialSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     project_title = serializers.CharField(source='project.title', read_only=True)
     image = serializers.SerializerMethodField()
 
@@ -91,69 +102,80 @@ class TestimonialSerializer(serializers.ModelSerializer):
         model = Testimonial
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        method_sources = {'image': 'photo'}
 
     def get_image(self, obj):
-        return get_cloudinary_url(obj.image)
+        return get_cloudinary_url(obj.photo)
 
-class BlogCategorySerializer(serializers.ModelSerializer):
-    icon = serializers.SerializerMethodField()
+class BlogCategorySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = BlogCategory
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_icon(self, obj):
-        return get_cloudinary_url(obj.icon)
-
-class BlogTagSerializer(serializers.ModelSerializer):
-    icon = serializers.SerializerMethodField()
+class BlogTagSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = BlogTag
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_icon(self, obj):
-        return get_cloudinary_url(obj.icon)
-
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     tags_list = BlogTagSerializer(source='tags', many=True, read_only=True)
     featured_image = serializers.SerializerMethodField()
+    featured_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogPost
-        fields = '__all__'
+        # plain_text repeats content without the markup
+        exclude = ['search_vector', 'plain_text']
         read_only_fields = ['id', 'created_at', 'updated_at', 'views_count']
+        expandable_fields = ['tags_list']
+        method_sources = {'featured_image_variants': 'featured_image'}
 
     def get_featured_image(self, obj):
         return get_cloudinary_url(obj.featured_image)
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+    def get_featured_image_variants(self, obj):
+        return image_variants(obj.featured_image)
+
+class BlogPostListSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     featured_image = serializers.SerializerMethodField()
     featured_image_thumbnail = serializers.SerializerMethodField()
+    featured_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'excerpt', 'featured_image', 
-            'featured_image_thumbnail', 'author_name', 'category_name', 
-            'published_at', 'views_count'
+            'featured_image_thumbnail', 'featured_image_variants', 'author_name',
+            'category_name', 'published_at', 'views_count', 'word_count', 'reading_time'
         ]
+        method_sources = {
+            'featured_image_thumbnail': 'featured_image', 'featured_image_variants': 'featured_image',
+        }
+        # Used by the .values() list path in place of author.get_full_name()
+        values_expressions = {
+            'author_name': Trim(Concat(
+                'author__first_name', Value(' '), 'author__last_name', output_field=CharField()
+            )),
+        }
 
     def get_featured_image(self, obj):
         return get_cloudinary_url(obj.featured_image)
 
     def get_featured_image_thumbnail(self, obj):
-        if obj.featured_image:
-            return obj.featured_image.build_url(width=400, height=250, crop='fill', gravity='auto')
-        return None
+        return variant_url(obj.featured_image, 'thumbnail')
+
+    def get_featured_image_variants(self, obj):
+        return image_variants(obj.featured_image)
 
-class PackageSerializer(serializers.ModelSerializer):
+class PackageSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Package
@@ -163,7 +185,7 @@ class PackageSerializer(serializers.ModelSerializer):
     def get_image(self, obj):
         return get_cloudinary_url(obj.image)
 
-class LeadSerializer(serializers.ModelSerializer):
+class LeadSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     interested_service_name = serializers.CharField(source='interested_service.title', read_only=True)
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
 
@@ -177,58 +199,79 @@ class LeadCreateSerializer(serializers.ModelSerializer):
         model = Lead
         fields = ['name', 'email', 'phone', 'company', 'message', 'interested_service', 'budget_range']
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class LeadImportSerializer(serializers.ModelSerializer):
+    """One imported row; relations arrive as text and are resolved per batch by LeadImporter"""
+    interested_service = serializers.CharField(required=False, allow_blank=True)
+    assigned_to = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta:
+        model = Lead
+        fields = [
+            'name', 'email', 'phone', 'company', 'message', 'status', 'source', 'budget_range',
+            'interested_service', 'assigned_to', 'notes', 'follow_up_date',
+        ]
+
+class TeamMemberSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamMember
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        method_sources = {'image': 'photo'}
 
     def get_image(self, obj):
-        return get_cloudinary_url(obj.image)
+        return get_cloudinary_url(obj.photo)
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     posted_by_name = serializers.CharField(source='posted_by.get_full_name', read_only=True)
-    applications_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Job
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
-    def get_applications_count(self, obj):
-        return obj.applications.count()
+        exclude = ['search_vector']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'applications_count']
 
-class JobListSerializer(serializers.ModelSerializer):
+class JobListSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = ['id', 'title', 'slug', 'job_type', 'location', 'salary_range', 'status', 'created_at']
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
     resume = serializers.SerializerMethodField()
 
     class Meta:
         model = JobApplication
-        fields = '__all__'
+        exclude = ['resume_spool']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def get_resume(self, obj):
+        # Empty until the spooled upload finishes; resume_status says where it is
+        if not obj.resume:
+            return None
         return get_cloudinary_url(obj.resume)
 
 class JobApplicationCreateSerializer(serializers.ModelSerializer):
+    # Required here even though the model column stays empty until the upload finishes
+    resume = serializers.FileField()
+
     class Meta:
         model = JobApplication
         fields = ['job', 'name', 'email', 'phone', 'resume', 'cover_letter', 'portfolio_url']
 
-class FAQSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # Spool to local disk; ResumeUploader pushes it to storage after commit
+        validated_data['resume_spool'] = spool_resume(validated_data.pop('resume'))
+        validated_data['resume_status'] = 'pending'
+        return super().create(validated_data)
+
+class FAQSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = FAQ
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.get_full_name', read_only=True)
     client_email = serializers.CharField(source='client.email', read_only=True)
     project_title = serializers.CharField(source='project.title', read_only=True)
@@ -238,17 +281,13 @@ class InvoiceSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+class InvoiceBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+    status = serializers.ChoiceField(choices=Invoice.INVOICE_STATUS)
+
 class SiteSettingsSerializer(serializers.ModelSerializer):
-    logo = serializers.SerializerMethodField()
-    favicon = serializers.SerializerMethodField()
 
     class Meta:
         model = SiteSettings
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
-
-    def get_logo(self, obj):
-        return get_cloudinary_url(obj.logo)
-
-    def get_favicon(self, obj):
-        return get_cloudinary_url(obj.favicon)
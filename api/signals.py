@@ -0,0 +1,67 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from core.models import (
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial,
+    BlogCategory, BlogTag, BlogPost, Package, Lead, TeamMember, Job, JobApplication, FAQ,
+    SiteSettings
+)
+from .cache import bump_model_version
+
+User = get_user_model()
+
+# Models whose changes invalidate cached API responses and dashboard stats
+CACHED_MODELS = [
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial,
+    BlogCategory, BlogTag, BlogPost, Package, Lead, TeamMember, Job,
+    JobApplication, FAQ, SiteSettings, User,
+]
+
+# Saves that only touch these fields never change a cached payload
+IGNORED_UPDATE_FIELDS = {
+    BlogPost: {'views_count'},
+    User: {'last_login'},
+}
+
+
+def bump_on_commit(model, using=None):
+    """
+    Bump now and again once the writer's transaction commits.
+
+    A reader running between the first bump and the commit still sees the
+    old rows and may cache them under the new version; the second bump
+    moves past that entry. Outside a transaction the write is already
+    committed and one bump does.
+    """
+    bump_model_version(model)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(partial(bump_model_version, model), using=using)
+
+
+def invalidate_on_save(sender, instance, update_fields=None, using=None, **kwargs):
+    ignored = IGNORED_UPDATE_FIELDS.get(sender)
+    if ignored and update_fields and set(update_fields) <= ignored:
+        return
+    bump_on_commit(sender, using)
+
+
+def invalidate_on_delete(sender, instance, using=None, **kwargs):
+    bump_on_commit(sender, using)
+
+
+def invalidate_on_m2m_change(sender, instance, action, model, using=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # The relation may be changed from either side, so bump both ends
+    bump_on_commit(type(instance), using)
+    bump_on_commit(model, using)
+
+
+def connect_signals():
+    for model in CACHED_MODELS:
+        post_save.connect(invalidate_on_save, sender=model, dispatch_uid=f'api_cache_save_{model._meta.label_lower}')
+        post_delete.connect(invalidate_on_delete, sender=model, dispatch_uid=f'api_cache_delete_{model._meta.label_lower}')
+    for through in (Project.tags.through, BlogPost.tags.through):
+        m2m_changed.connect(invalidate_on_m2m_change, sender=through, dispatch_uid=f'api_cache_m2m_{through._meta.label_lower}')
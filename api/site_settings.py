@@ -0,0 +1,60 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings as django_settings
+from django.core.serializers.json import DjangoJSONEncoder
+from core.models import SiteSettings
+from .cache import get_model_versions, run_cached
+from .metrics import serialize
+from .serializers import SiteSettingsSerializer
+
+# (version, data, etag, built at) of the last SiteSettings payload this process built
+_local_payload = (None, None, None, 0.0)
+
+
+def is_current(version):
+    cached_version, _, _, built_at = _local_payload
+    # The age limit covers per-process caches (LocMemCache), where another
+    # worker's bump never reaches this one
+    return cached_version == version and time.monotonic() - built_at < django_settings.SITE_SETTINGS_MAX_AGE
+
+
+def get_site_settings_payload():
+    """
+    Serialized SiteSettings and its ETag, cached in process memory.
+
+    Each call only reads the shared version stamp that api/signals.py bumps on
+    save, so a steady-state request never touches the database. Workers notice
+    a new version on their next request and rebuild their copy once. Without
+    a shared cache (REDIS_URL) the stamp is per worker, so a copy is also
+    rebuilt once it is SITE_SETTINGS_MAX_AGE seconds old.
+    """
+    version = get_model_versions([SiteSettings])[0]
+    if not is_current(version):
+        settings, created = SiteSettings.objects.get_or_create(pk=1)
+        if created:
+            # Our own insert bumped the stamp; the row we hold is current
+            version = get_model_versions([SiteSettings])[0]
+        return build_payload(version, settings)
+    return _local_payload[1:3]
+
+
+async def aget_site_settings_payload():
+    """get_site_settings_payload for async views, reading the row with the async ORM"""
+    version = (await run_cached(get_model_versions, [SiteSettings]))[0]
+    if not is_current(version):
+        settings, created = await SiteSettings.objects.aget_or_create(pk=1)
+        if created:
+            version = (await run_cached(get_model_versions, [SiteSettings]))[0]
+        return build_payload(version, settings)
+    return _local_payload[1:3]
+
+
+def build_payload(version, settings):
+    global _local_payload
+    data = serialize(SiteSettingsSerializer(settings))
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+    _local_payload = (version, data, etag, time.monotonic())
+    return data, etag
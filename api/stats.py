@@ -0,0 +1,47 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from core.models import Project, Lead, BlogPost, Testimonial, Service, TeamMember, Job, JobApplication
+from .cache import CACHE_PREFIX, get_model_versions
+
+# (model, total key, filtered key, filter) - one conditional aggregate per model
+DASHBOARD_COUNTS = [
+    (Project, 'total_projects', 'active_projects', Q(is_published=True)),
+    (Lead, 'total_leads', 'new_leads', Q(status='new')),
+    (BlogPost, 'total_blog_posts', 'published_blog_posts', Q(is_published=True)),
+    (Testimonial, 'total_testimonials', 'featured_testimonials', Q(is_featured=True)),
+    (Service, 'total_services', 'active_services', Q(is_active=True)),
+    (TeamMember, 'total_team_members', 'active_team_members', Q(is_active=True)),
+    (Job, 'total_jobs', 'open_jobs', Q(status='open')),
+    (JobApplication, 'total_applications', 'pending_applications', Q(status='submitted')),
+]
+
+DASHBOARD_MODELS = [model for model, _, _, _ in DASHBOARD_COUNTS]
+
+
+def compute_dashboard_stats():
+    stats = {}
+    for model, total_key, filtered_key, condition in DASHBOARD_COUNTS:
+        stats.update(model.objects.order_by().aggregate(
+            **{total_key: Count('pk'), filtered_key: Count('pk', filter=condition)}
+        ))
+    return stats
+
+
+def get_dashboard_stats(fresh=False):
+    """
+    Dashboard counts, cached until one of the counted models changes.
+
+    The cache key embeds the model versions bumped by api/signals.py, so any
+    save or delete on a counted model produces a new snapshot on next read.
+    """
+    versions = ':'.join(get_model_versions(DASHBOARD_MODELS))
+    key = f'{CACHE_PREFIX}:dashboard-stats:{hashlib.md5(versions.encode("utf-8")).hexdigest()}'
+    stats = None if fresh else cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        # Bounded lifetime covers queryset.update() paths that skip signals
+        cache.set(key, stats, settings.API_CACHE_TIMEOUT)
+    return stats
@@ -1,3 +1,1613 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from cloudinary import CloudinaryResource
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import QuerySet, Value
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from core.models import (
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial, BlogCategory,
+    BlogTag, BlogPost, Package, Lead, TeamMember, Job, JobApplication, FAQ, Invoice,
+    SiteSettings, OutboxMessage
+)
+from . import compression, images, renderers
+from .cache import get_cache_stats, get_model_versions
+from .db_pool import ConnectionTracker
+from .images import image_variants, variant_url
+from .management.commands.bench_api import Command as BenchApiCommand
+from .metrics import Histogram, RequestTiming, current_timing
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .urls import async_read_urls
+from . import view_counter as view_counter_module
+from .view_counter import ViewCounter
+
+User = get_user_model()
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.service = Service.objects.create(
+            title='Web Development', description='<p>Sites</p>', short_description='Sites'
+        )
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get('/api/services/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/services/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(get_cache_stats()['hits'], 1)
+        self.assertEqual(get_cache_stats()['misses'], 1)
+
+    def test_query_params_are_normalized(self):
+        self.client.get('/api/services/?page=1&is_featured=false')
+        response = self.client.get('/api/services/?is_featured=false&page=1&search=')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    @override_settings(ALLOWED_HOSTS=['api.example.com', 'internal'])
+    def test_keyed_per_origin(self):
+        Service.objects.bulk_create([
+            Service(title=f'Service {n}', slug=f'service-{n}', description='<p>S</p>', short_description='S')
+            for n in range(api_settings.PAGE_SIZE)
+        ])
+        self.client.get('/api/services/', HTTP_HOST='internal')
+        response = self.client.get('/api/services/', HTTP_HOST='api.example.com', secure=True)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.json()['next'].startswith('https://api.example.com/'))
+        response = self.client.get('/api/services/', HTTP_HOST='api.example.com')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.json()['next'].startswith('http://api.example.com/'))
+
+    def test_save_invalidates_dependent_endpoint(self):
+        self.client.get('/api/services/')
+        FAQ.objects.create(question='Why?', answer='Because.')
+        self.assertEqual(self.client.get('/api/services/')['X-Cache'], 'HIT')
+
+        self.service.title = 'Web Design'
+        self.service.save()
+        response = self.client.get('/api/services/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['title'], 'Web Design')
+
+    def test_delete_invalidates(self):
+        self.client.get('/api/services/')
+        self.service.delete()
+        response = self.client.get('/api/services/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_m2m_change_invalidates(self):
+        project = Project.objects.create(
+            title='Shop', description='<p>Shop</p>', short_description='Shop',
+            client_name='Acme', is_published=True
+        )
+        self.client.get('/api/projects/')
+        project.tags.add(ProjectTag.objects.create(name='Django'))
+        response = self.client.get('/api/projects/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['tags'][0]['name'], 'Django')
+
+    def test_version_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.title = 'Web Design'
+            self.service.save()
+            # A reader that saw this version may have cached the uncommitted rows
+            during = get_model_versions([Service])
+        self.assertNotEqual(get_model_versions([Service]), during)
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Drop views other tests left pending in this process
+        view_counter_module.get_view_store().take()
+        author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.post = BlogPost.objects.create(
+            title='Hello', content='<p>Hi</p>', author=author, is_published=True, views_count=5
+        )
+        self.other = BlogPost.objects.create(
+            title='Other', content='<p>Hi</p>', author=author, is_published=True
+        )
+        self.counter = ViewCounter(interval=60, autostart=False)
+
+    def test_views_are_buffered_until_flush(self):
+        self.assertEqual(self.counter.record(self.post.pk, 5), 6)
+        self.assertEqual(self.counter.record(self.post.pk, 5), 7)
+        self.counter.record(self.other.pk, 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 3)
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.post.views_count, 7)
+        self.assertEqual(self.other.views_count, 1)
+
+    def test_served_count_is_monotonic_across_flush(self):
+        self.counter.record(self.post.pk, 5)
+        self.counter.record(self.post.pk, 5)
+        # A stale row read before the flush landed must not lower the count
+        self.counter.flush()
+        self.assertEqual(self.counter.record(self.post.pk, 5), 8)
+
+    def test_stop_flushes_pending_views(self):
+        self.counter.record(self.post.pk, 5)
+        self.counter.stop()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 6)
+
+    def test_pending_views_are_shared_between_workers(self):
+        other_worker = ViewCounter(interval=60, autostart=False)
+        self.assertEqual(self.counter.record(self.post.pk, 5), 6)
+        self.assertEqual(other_worker.record(self.post.pk, 5), 7)
+        # A flush from either worker writes both views, and only once
+        self.assertEqual(other_worker.flush(), 2)
+        self.assertEqual(self.counter.flush(), 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 7)
+
+    def test_overlapping_flushes_write_views_once(self):
+        other_worker = ViewCounter(interval=60, autostart=False)
+        self.counter.record(self.post.pk, 5)
+        self.counter.record(self.post.pk, 5)
+        update = BlogPost.objects.filter(pk=self.post.pk).update
+        flushed = []
+
+        def flush_meanwhile(**kwargs):
+            flushed.append(other_worker.flush())
+            return update(**kwargs)
+
+        with mock.patch.object(QuerySet, 'update', side_effect=flush_meanwhile):
+            self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(flushed, [0])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 7)
+
+    def test_pending_views_survive_cache_eviction(self):
+        self.counter.record(self.post.pk, 5)
+        cache.clear()
+        self.assertEqual(self.counter.flush(), 1)
+
+    def test_served_counts_are_bounded(self):
+        with mock.patch.object(view_counter_module, 'SERVED_LIMIT', 1):
+            self.counter.record(self.post.pk, 5)
+            self.counter.record(self.other.pk, 0)
+        self.assertEqual(list(self.counter.served), [self.other.pk])
+
+    def test_no_flush_thread_under_tests(self):
+        counter = ViewCounter(interval=60)
+        counter.record(self.post.pk, 5)
+        self.assertIsNone(counter.thread)
+
+
+class QueryCountTests(TestCase):
+    """
+    List endpoints must not issue more queries as the page fills up, and
+    detail endpoints must not issue more queries as related rows grow.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin',
+            first_name='Ada', last_name='Admin'
+        )
+        self.client.force_authenticate(self.admin)
+        self.industry = Industry.objects.create(name='Retail')
+        self.category = BlogCategory.objects.create(name='News', description='<p>News</p>')
+        self.service = Service.objects.create(
+            title='Service 0', description='<p>S</p>', short_description='S'
+        )
+        self.job = Job.objects.create(
+            title='Job 0', description='<p>J</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=self.admin
+        )
+        self.counter = 0
+        patcher = mock.patch.object(PageNumberPagination, 'page_size', 100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def next_id(self):
+        self.counter += 1
+        return self.counter
+
+    def make_service(self):
+        n = self.next_id()
+        return Service.objects.create(title=f'Service {n}', description='<p>S</p>', short_description='S')
+
+    def make_industry(self):
+        return Industry.objects.create(name=f'Industry {self.next_id()}')
+
+    def make_project(self):
+        n = self.next_id()
+        project = Project.objects.create(
+            title=f'Project {n}', description='<p>P</p>', short_description='P',
+            client_name='Acme', client=self.admin, industry=self.industry, is_published=True
+        )
+        project.tags.add(ProjectTag.objects.create(name=f'Tag {n}'))
+        ProjectImage.objects.create(project=project, image='projects/gallery/sample')
+        return project
+
+    def make_project_tag(self):
+        return ProjectTag.objects.create(name=f'Project tag {self.next_id()}')
+
+    def make_testimonial(self):
+        return Testimonial.objects.create(
+            name=f'Client {self.next_id()}', testimonial_text='<p>Great</p>',
+            project=Project.objects.create(
+                title=f'Project {self.next_id()}', description='<p>P</p>', short_description='P',
+                client_name='Acme'
+            )
+        )
+
+    def make_blog_category(self):
+        return BlogCategory.objects.create(name=f'Category {self.next_id()}', description='<p>C</p>')
+
+    def make_blog_tag(self):
+        return BlogTag.objects.create(name=f'Blog tag {self.next_id()}')
+
+    def make_blog_post(self):
+        n = self.next_id()
+        post = BlogPost.objects.create(
+            title=f'Post {n}', content='<p>Body</p>', author=self.admin,
+            category=self.category, is_published=True
+        )
+        post.tags.add(BlogTag.objects.create(name=f'Post tag {n}'))
+        return post
+
+    def make_package(self):
+        return Package.objects.create(
+            name=f'Package {self.next_id()}', package_type='starter', description='<p>P</p>', price=10
+        )
+
+    def make_lead(self):
+        return Lead.objects.create(
+            name=f'Lead {self.next_id()}', email='lead@example.com', message='Hi',
+            interested_service=self.service, assigned_to=self.admin
+        )
+
+    def make_team_member(self):
+        return TeamMember.objects.create(name=f'Member {self.next_id()}', role='Dev', bio='Bio')
+
+    def make_job(self):
+        return Job.objects.create(
+            title=f'Job {self.next_id()}', description='<p>J</p>', requirements='Python',
+            job_type='full_time', location='Remote', posted_by=self.admin
+        )
+
+    def make_job_application(self):
+        return JobApplication.objects.create(
+            job=self.job, name=f'Applicant {self.next_id()}', email='a@example.com',
+            resume='resumes/cv.pdf'
+        )
+
+    def make_faq(self):
+        return FAQ.objects.create(question=f'Question {self.next_id()}?', answer='Yes')
+
+    def make_invoice(self):
+        return Invoice.objects.create(
+            invoice_number=f'INV-{self.next_id()}', client=self.admin, project=self.make_project(),
+            amount=100, description='<p>Work</p>', due_date=date(2026, 1, 1)
+        )
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def assert_constant_list_queries(self, url, factory):
+        factory()
+        single = self.count_queries(url)
+        for _ in range(99):
+            factory()
+        self.assertGreaterEqual(len(self.client.get(url).json()['results']), 100)
+        self.assertEqual(self.count_queries(url), single, url)
+
+    def get_list_endpoints(self):
+        return [
+            ('/api/services/', self.make_service),
+            ('/api/industries/', self.make_industry),
+            ('/api/projects/', self.make_project),
+            ('/api/project-tags/', self.make_project_tag),
+            ('/api/testimonials/', self.make_testimonial),
+            ('/api/blog-categories/', self.make_blog_category),
+            ('/api/blog-tags/', self.make_blog_tag),
+            ('/api/blog-posts/', self.make_blog_post),
+            ('/api/packages/', self.make_package),
+            ('/api/leads/', self.make_lead),
+            ('/api/team-members/', self.make_team_member),
+            ('/api/jobs/', self.make_job),
+            ('/api/job-applications/', self.make_job_application),
+            ('/api/faqs/', self.make_faq),
+            ('/api/invoices/', self.make_invoice),
+        ]
+
+    def test_list_endpoints(self):
+        for url, factory in self.get_list_endpoints():
+            with self.subTest(url=url):
+                self.assert_constant_list_queries(url, factory)
+
+    def test_sparse_list_endpoints(self):
+        for url, factory in self.get_list_endpoints():
+            factory()
+            names = list(self.client.get(url).json()['results'][0])
+            queries = [f'omit={name}' for name in names]
+            queries += [f'fields={",".join(names[::2])}', f'fields={",".join(names[1::2])}']
+            counts = {query: self.count_queries(f'{url}?{query}') for query in queries}
+            for _ in range(5):
+                factory()
+            for query, single in counts.items():
+                with self.subTest(url=url, query=query):
+                    self.assertEqual(self.count_queries(f'{url}?{query}'), single)
+
+    @override_settings(BLOG_VIEWS_FLUSH_INTERVAL=0)
+    def test_detail_endpoints(self):
+        project = self.make_project()
+        post = self.make_blog_post()
+        lead = self.make_lead()
+        application = self.make_job_application()
+        invoice = self.make_invoice()
+        details = [
+            (f'/api/projects/{project.slug}/', lambda: (
+                project.tags.add(self.make_project_tag()),
+                ProjectImage.objects.create(project=project, image='projects/gallery/sample'),
+            )),
+            (f'/api/blog-posts/{post.slug}/', lambda: post.tags.add(self.make_blog_tag())),
+            (f'/api/jobs/{self.job.slug}/', self.make_job_application),
+            (f'/api/services/{self.service.slug}/', self.make_lead),
+            (f'/api/leads/{lead.pk}/', self.make_lead),
+            (f'/api/job-applications/{application.pk}/', self.make_job_application),
+            (f'/api/invoices/{invoice.pk}/', self.make_invoice),
+        ]
+        for url, grow in details:
+            with self.subTest(url=url):
+                before = self.count_queries(url)
+                for _ in range(20):
+                    grow()
+                self.assertEqual(self.count_queries(url), before, url)
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        author = User.objects.create_user(username='writer', email='writer@example.com', password='x')
+        BlogPost.objects.create(
+            title='Scaling Django', content='<p>Caching and indexes</p>', author=author, is_published=True
+        )
+        BlogPost.objects.create(
+            title='Design notes', content='<p>Why we moved to Django</p>', author=author, is_published=True
+        )
+        BlogPost.objects.create(
+            title='Hiring update', content='<p>We are growing</p>', author=author, is_published=True
+        )
+
+    def test_search_matches_title_and_content(self):
+        response = self.client.get('/api/blog-posts/?search=django')
+        titles = [post['title'] for post in response.json()['results']]
+        self.assertEqual(sorted(titles), ['Design notes', 'Scaling Django'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Ranking needs PostgreSQL full-text search')
+    def test_title_matches_rank_first(self):
+        response = self.client.get('/api/blog-posts/?search=django')
+        titles = [post['title'] for post in response.json()['results']]
+        self.assertEqual(titles, ['Scaling Django', 'Design notes'])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        # Identical timestamps force the id tiebreaker to do the work
+        Lead.objects.bulk_create([
+            Lead(name=f'Lead {n}', email='lead@example.com', message='Hi') for n in range(45)
+        ])
+        Lead.objects.update(created_at=Lead.objects.first().created_at)
+
+    def collect(self, url):
+        names, pages = [], 0
+        while url:
+            body = self.client.get(url).json()
+            self.assertNotIn('count', body)
+            names.extend(lead['name'] for lead in body['results'])
+            url = body['next']
+            pages += 1
+        return names, pages
+
+    def test_walks_every_row_once(self):
+        names, pages = self.collect('/api/leads/?pagination=cursor')
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, [f'Lead {n}' for n in reversed(range(45))])
+
+    def test_inserts_do_not_shift_pages(self):
+        first = self.client.get('/api/leads/?pagination=cursor').json()
+        Lead.objects.create(name='Newest', email='new@example.com', message='Hi')
+        second = self.client.get(first['next']).json()
+        self.assertEqual(second['results'][0]['name'], 'Lead 24')
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get('/api/leads/?pagination=cursor').json()
+        second = self.client.get(first['next']).json()
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_page_number_mode_is_default(self):
+        body = self.client.get('/api/leads/?page=2').json()
+        self.assertEqual(body['count'], 45)
+        self.assertEqual(len(body['results']), 20)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/leads/?cursor=bogus').status_code, 404)
+
+    def test_ordering_flips_direction(self):
+        names, pages = self.collect('/api/leads/?pagination=cursor&ordering=created_at')
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, [f'Lead {n}' for n in range(45)])
+
+    def test_other_orderings_rejected(self):
+        response = self.client.get('/api/leads/?pagination=cursor&ordering=status')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+
+    def test_relevance_order_rejected(self):
+        request = Request(APIRequestFactory().get('/api/leads/', {'pagination': 'cursor', 'search': 'lead'}))
+        queryset = Lead.objects.annotate(search_rank=Value(1.0))
+        with self.assertRaises(ValidationError):
+            KeysetPagination().paginate_queryset(queryset, request)
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        Lead.objects.create(name='New', email='n@example.com', message='Hi')
+        Lead.objects.create(name='Old', email='o@example.com', message='Hi', status='lost')
+
+    def test_counts_and_snapshot(self):
+        with self.assertNumQueries(8):
+            stats = self.client.get('/api/dashboard/stats/').json()
+        self.assertEqual(stats['total_leads'], 2)
+        self.assertEqual(stats['new_leads'], 1)
+        self.assertEqual(len(stats), 16)
+        with self.assertNumQueries(0):
+            self.client.get('/api/dashboard/stats/')
+
+    def test_model_change_refreshes_snapshot(self):
+        self.client.get('/api/dashboard/stats/')
+        Lead.objects.create(name='Another', email='a@example.com', message='Hi')
+        self.assertEqual(self.client.get('/api/dashboard/stats/').json()['new_leads'], 2)
+
+    def test_fresh_recomputes(self):
+        self.client.get('/api/dashboard/stats/')
+        with self.assertNumQueries(8):
+            self.client.get('/api/dashboard/stats/?fresh=1')
+
+
+class SiteSettingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_steady_state_needs_no_queries(self):
+        self.client.get('/api/settings/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/settings/')
+        self.assertEqual(response.json()['company_name'], 'Saim Enterprises')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get('/api/settings/')['ETag']
+        response = self.client.get('/api/settings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    @override_settings(COMPRESS_MIN_SIZE=100)
+    def test_if_none_match_with_compressed_etag(self):
+        first = self.client.get('/api/settings/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertTrue(first['ETag'].startswith('W/"'))
+        response = self.client.get('/api/settings/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_local_copy_expires(self):
+        self.client.get('/api/settings/')
+        # Another worker's save only bumps the stamp in its own LocMemCache
+        SiteSettings.objects.filter(pk=1).update(company_name='Saim Digital')
+        self.assertEqual(self.client.get('/api/settings/').json()['company_name'], 'Saim Enterprises')
+        with override_settings(SITE_SETTINGS_MAX_AGE=0):
+            self.assertEqual(self.client.get('/api/settings/').json()['company_name'], 'Saim Digital')
+
+    def test_save_bumps_version(self):
+        etag = self.client.get('/api/settings/')['ETag']
+        settings = SiteSettings.objects.get(pk=1)
+        settings.company_name = 'Saim Digital'
+        settings.save()
+        response = self.client.get('/api/settings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['company_name'], 'Saim Digital')
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.lead = Lead.objects.create(name='Lead', email='lead@example.com', message='Hi')
+        self.service = Service.objects.create(
+            title='Web Development', description='<p>Sites</p>', short_description='Sites'
+        )
+
+    def test_list_revalidation_costs_one_query(self):
+        self.client.force_authenticate(self.admin)
+        etag = self.client.get('/api/leads/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/leads/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_with_rows_and_page(self):
+        self.client.force_authenticate(self.admin)
+        etag = self.client.get('/api/leads/')['ETag']
+        self.assertNotEqual(self.client.get('/api/leads/?status=new')['ETag'], etag)
+        self.lead.delete()
+        response = self.client.get('/api/leads/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_if_modified_since(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f'/api/leads/{self.lead.pk}/')
+        last_modified = response['Last-Modified']
+        response = self.client.get(f'/api/leads/{self.lead.pk}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_revalidation_needs_no_query(self):
+        etag = self.client.get('/api/services/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/services/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.service.title = 'Web Design'
+        self.service.save()
+        response = self.client.get('/api/services/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_related_changes_invalidate_admin_validators(self):
+        self.client.force_authenticate(self.admin)
+        self.lead.interested_service = self.service
+        self.lead.save()
+        job = Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=self.admin
+        )
+        application = JobApplication.objects.create(job=job, name='Ann', email='ann@example.com')
+        project = Project.objects.create(
+            title='Shop', description='<p>Shop</p>', short_description='Shop', client_name='Acme'
+        )
+        invoice = Invoice.objects.create(
+            invoice_number='INV-1', client=self.admin, project=project, amount=100,
+            description='<p>Work</p>', due_date=date(2026, 1, 1)
+        )
+        cases = [
+            (f'/api/leads/{self.lead.pk}/', self.service, 'title', 'Web Design'),
+            (f'/api/job-applications/{application.pk}/', job, 'title', 'Platform'),
+            (f'/api/invoices/{invoice.pk}/', project, 'title', 'Store'),
+            (f'/api/invoices/{invoice.pk}/', self.admin, 'email', 'billing@example.com'),
+        ]
+        for n, (url, related, field, value) in enumerate(cases, 1):
+            with self.subTest(url=url, related=type(related).__name__):
+                first = self.client.get(url)
+                setattr(related, field, value)
+                # Past the one-second resolution of If-Modified-Since
+                with mock.patch('api.cache.time.time_ns', return_value=time.time_ns() + n * 5 * 10 ** 9):
+                    related.save()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+                self.assertEqual(response.status_code, 200)
+
+
+class BenchApiCommandTests(TestCase):
+    def test_iterations_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            call_command('bench_api', iterations=0, stdout=StringIO())
+
+    def test_every_route_is_benchmarked(self):
+        command = BenchApiCommand()
+        admin = command.seed(3, 3)
+        routes, skipped = command.get_routes(admin)
+        benched = {f'{method} {url}' for method, url, _, _ in routes}
+        for route in [
+            'POST /api/auth/login/', 'POST /api/auth/refresh/', 'POST /api/contact/', 'POST /api/apply/',
+            'GET /api/home/', 'GET /api/metrics/', 'GET /api/db/pool/', 'GET /api/leads/export/csv/',
+            'GET /api/invoices/export/jsonl/', 'POST /api/leads/import/', 'POST /api/invoices/bulk-status/',
+            'GET /api/projects/project-0/',
+        ]:
+            self.assertIn(route, benched)
+        self.assertIn(f'DELETE /api/leads/{Lead.objects.order_by("pk").first().pk}/', skipped)
+
+        options = {'scale': 3, 'iterations': 1, 'warmup': 0, 'cold': False}
+        report = command.run(admin, options)
+        self.assertEqual(set(report['routes']), benched)
+        failed = {route: result['status'] for route, result in report['routes'].items() if max(result['status']) >= 400}
+        self.assertEqual(failed, {})
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def explain(self):
+        """Viewset prefix -> (status, plan lines)"""
+        out = StringIO()
+        call_command('explain_queries', verbosity=2, stdout=out)
+        reports = {}
+        for line in out.getvalue().splitlines():
+            prefix, sep, status = line.partition(': ')
+            if sep and ' ' not in prefix:
+                plan = []
+                reports[prefix] = (status, plan)
+            elif line.strip():
+                plan.append(line)
+        return reports
+
+    def test_reports_every_viewset(self):
+        from .urls import router
+        reports = self.explain()
+        self.assertEqual(list(reports), [prefix for prefix, _, _ in router.registry])
+        self.assertEqual(reports['industries'], ('skipped (no filter or ordering)', []))
+        self.assertNotIn('sequential scan', ' '.join(status for status, _ in reports.values()))
+
+    @skipUnless(connection.vendor == 'sqlite', 'Plan text is SQLite specific')
+    def test_list_queries_use_their_indexes(self):
+        reports = self.explain()
+        expected = {
+            'services': 'SCAN core_service USING INDEX service_active_order_idx',
+            'projects': 'SCAN core_project USING INDEX project_public_created_idx',
+            'testimonials': 'SCAN core_testimonial USING INDEX testimonial_public_idx',
+            'blog-posts': 'SCAN core_blogpost USING INDEX blogpost_public_keyset_idx',
+            'packages': 'SCAN core_package USING INDEX package_active_order_idx',
+            'leads': 'SCAN core_lead USING INDEX lead_keyset_idx',
+            'team-members': 'SCAN core_teammember USING INDEX teammember_active_order_idx',
+            'jobs': 'SEARCH core_job USING INDEX job_status_created_idx (status=?)',
+            'job-applications': 'SCAN core_jobapplication USING INDEX jobapp_keyset_idx',
+            'faqs': 'SCAN core_faq USING INDEX faq_active_order_idx',
+            'invoices': 'SCAN core_invoice USING INDEX invoice_keyset_idx',
+        }
+        for prefix, access in expected.items():
+            with self.subTest(prefix):
+                status, plan = reports[prefix]
+                self.assertEqual(status, 'ok')
+                # The first plan line reads the listed table; joins follow by primary key
+                self.assertTrue(plan[0].endswith(access), plan)
+                for line in plan[1:]:
+                    self.assertIn('USING INTEGER PRIMARY KEY', line)
+
+
+class ImageUrlTests(TestCase):
+    def setUp(self):
+        self.resource = CloudinaryResource(
+            public_id='blog/featured/launch', format='jpg', version='1712', type='upload', resource_type='image'
+        )
+
+    def test_thumbnail_matches_build_url(self):
+        expected = self.resource.build_url(width=400, height=250, crop='fill', gravity='auto')
+        self.assertEqual(variant_url(self.resource, 'thumbnail'), expected)
+        self.assertEqual(variant_url('image/upload/v1712/blog/featured/launch.jpg', 'thumbnail'), expected)
+
+    def test_variants_are_memoized(self):
+        first = image_variants(self.resource)
+        hits = images._variants.cache_info().hits
+        second = image_variants(CloudinaryResource(
+            public_id='blog/featured/launch', format='jpg', version='1712', type='upload', resource_type='image'
+        ))
+        self.assertIs(first, second)
+        self.assertEqual(images._variants.cache_info().hits, hits + 1)
+
+    def test_variants_shape(self):
+        variants = image_variants(self.resource)
+        self.assertEqual(set(variants), {'thumbnail', 'card', 'hero', 'srcset'})
+        self.assertIn('f_avif', variants['srcset']['avif'])
+        self.assertEqual(variants['srcset']['webp'].count('w,') + 1, len(images.SRCSET_WIDTHS))
+        self.assertIsNone(image_variants(None))
+
+
+class FastListTests(TestCase):
+    """The .values() list path must render exactly what the serializers do"""
+
+    def setUp(self):
+        self.client = APIClient()
+        author = User.objects.create_user(
+            username='writer', email='writer@example.com', password='x', first_name='Ada', last_name='Lovelace'
+        )
+        category = BlogCategory.objects.create(name='News', description='<p>News</p>')
+        for n in range(3):
+            BlogPost.objects.create(
+                title=f'Post {n}', content='<p>Body</p>', author=author, is_published=True,
+                category=category if n else None, featured_image=f'blog/featured/post-{n}' if n else None
+            )
+        Service.objects.create(
+            title='Design', description='<p>D</p>', short_description='D', image='services/images/design'
+        )
+        Service.objects.create(title='Build', description='<p>B</p>', short_description='B')
+        Package.objects.create(
+            name='Growth', package_type='growth', description='<p>G</p>', price='199.50', features=['SEO', 'Ads']
+        )
+        FAQ.objects.create(question='Why?', answer='Because')
+        Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=author, salary_range='$$'
+        )
+
+    def compare(self, url, viewset):
+        cache.clear()
+        fast = self.client.get(url).json()
+        cache.clear()
+        with mock.patch.object(viewset, 'fast_list', False):
+            regular = self.client.get(url).json()
+        self.assertEqual(fast, regular)
+        return fast
+
+    def test_output_matches_serializers(self):
+        from .views import BlogPostViewSet, JobViewSet
+        posts = self.compare('/api/blog-posts/', BlogPostViewSet)
+        # A post without a category omits category_name, as DRF does
+        self.assertNotIn('category_name', posts['results'][-1])
+        self.assertEqual(posts['results'][0]['author_name'], 'Ada Lovelace')
+        self.compare('/api/blog-posts/?pagination=cursor', BlogPostViewSet)
+        self.compare('/api/jobs/?search=backend', JobViewSet)
+
+    def test_single_query_per_page(self):
+        cache.clear()
+        # Validators, count and the page itself
+        with self.assertNumQueries(3):
+            self.client.get('/api/blog-posts/')
+
+    def test_blog_list_never_selects_content(self):
+        from .views import BlogPostViewSet
+        for fast_list in (True, False):
+            cache.clear()
+            with mock.patch.object(BlogPostViewSet, 'fast_list', fast_list), CaptureQueriesContext(connection) as ctx:
+                post = self.client.get('/api/blog-posts/').json()['results'][0]
+            self.assertEqual((post['word_count'], post['reading_time'], post['excerpt']), (1, 1, 'Body'))
+            for query in ctx.captured_queries:
+                self.assertNotIn('"content"', query['sql'])
+                self.assertNotIn('"plain_text"', query['sql'])
+
+
+@override_settings(NOTIFICATION_EMAILS=['sales@example.com'])
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.payload = {'name': 'Grace', 'email': 'grace@example.com', 'message': 'We need a site'}
+
+    def test_contact_form_queues_instead_of_sending(self):
+        response = self.client.post('/api/contact/', self.payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mail.outbox, [])
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipients, ['sales@example.com'])
+        self.assertEqual(message.reply_to, 'grace@example.com')
+        self.assertIn('We need a site', message.body)
+
+        call_command('run_outbox', '--once', stdout=StringIO())
+        self.assertEqual(mail.outbox[0].subject, 'New inquiry from Grace')
+
+    def test_lead_and_message_commit_together(self):
+        with mock.patch('api.views.queue_lead_notification', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post('/api/contact/', self.payload, format='json')
+        self.assertFalse(Lead.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    @override_settings(NOTIFICATION_EMAILS=[])
+    def test_falls_back_to_company_email(self):
+        SiteSettings.objects.create(company_email='hello@example.com')
+        self.client.post('/api/contact/', self.payload, format='json')
+        self.assertEqual(OutboxMessage.objects.get().recipients, ['hello@example.com'])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        Lead.objects.bulk_create([
+            Lead(name=f'Lead {n}', email=f'lead{n}@example.com', message='Hi', status='new' if n % 2 else 'lost',
+                 company='=HYPERLINK("x")' if n == 1 else 'Acme')
+            for n in range(6)
+        ])
+
+    def export(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_honours_filters_and_search(self):
+        rows = list(csv.DictReader(self.export('/api/leads/export/csv/?status=new').splitlines()))
+        self.assertEqual(sorted(row['name'] for row in rows), ['Lead 1', 'Lead 3', 'Lead 5'])
+        # Formula-looking cells are neutralised
+        lead = next(row for row in rows if row['name'] == 'Lead 1')
+        self.assertEqual(lead['company'], "'=HYPERLINK(\"x\")")
+
+        rows = list(csv.DictReader(self.export('/api/leads/export/csv/?search=lead4').splitlines()))
+        self.assertEqual([row['email'] for row in rows], ['lead4@example.com'])
+
+    def test_jsonl(self):
+        rows = [json.loads(line) for line in self.export('/api/leads/export/jsonl/').splitlines()]
+        self.assertEqual(len(rows), 6)
+        lead = next(row for row in rows if row['name'] == 'Lead 0')
+        self.assertEqual((lead['email'], lead['status']), ('lead0@example.com', 'lost'))
+        self.assertIsNone(lead['assigned_to__email'])
+
+    def test_formats_agree_on_dates(self):
+        follow_up = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        Lead.objects.filter(name='Lead 0').update(follow_up_date=follow_up)
+        # What the lead serializers return for the same value
+        expected = DateTimeField().to_representation(follow_up)
+        self.assertEqual(expected, '2026-03-01T09:30:15.123456Z')
+        csv_row = next(row for row in csv.DictReader(self.export('/api/leads/export/csv/').splitlines())
+                       if row['name'] == 'Lead 0')
+        json_row = next(row for row in map(json.loads, self.export('/api/leads/export/jsonl/').splitlines())
+                        if row['name'] == 'Lead 0')
+        self.assertEqual((csv_row['follow_up_date'], json_row['follow_up_date']), (expected, expected))
+
+    def test_invoice_and_application_exports(self):
+        job = Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=self.admin
+        )
+        JobApplication.objects.create(job=job, name='Ann', email='ann@example.com', resume='resumes/cv.pdf')
+        Invoice.objects.create(
+            invoice_number='INV-1', client=self.admin, amount=100, tax_amount=5,
+            description='<p>Work</p>', due_date=date(2026, 1, 1)
+        )
+        self.assertIn('Backend,Ann', self.export('/api/job-applications/export/csv/'))
+        invoice = json.loads(self.export('/api/invoices/export/jsonl/'))
+        self.assertEqual((invoice['total_amount'], invoice['due_date']), ('105.00', '2026-01-01'))
+
+    def test_admin_only(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/leads/export/csv/').status_code, 401)
+
+
+class LeadImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        self.service = Service.objects.create(
+            title='SEO', slug='seo', description='<p>S</p>', short_description='S'
+        )
+
+    def rows(self, count):
+        return [
+            {'name': f'Lead {n}', 'email': f'lead{n}@example.com', 'message': 'From the expo',
+             'interested_service': 'seo', 'assigned_to': 'admin@example.com', 'source': 'referral'}
+            for n in range(count)
+        ]
+
+    def test_json_rows_with_per_row_errors(self):
+        rows = self.rows(3)
+        rows[1]['email'] = 'not-an-email'
+        rows[2]['interested_service'] = 'unknown'
+        rows.append('oops')
+        body = self.client.post('/api/leads/import/', rows, format='json').json()
+        self.assertEqual((body['rows'], body['created'], body['failed']), (4, 1, 3))
+        self.assertEqual([error['row'] for error in body['errors']], [2, 4, 3])
+        self.assertIn('email', body['errors'][0]['errors'])
+        self.assertIn('interested_service', body['errors'][2]['errors'])
+        lead = Lead.objects.get()
+        self.assertEqual((lead.interested_service, lead.assigned_to, lead.source), (self.service, self.admin, 'referral'))
+
+    def test_non_ascii_digits_are_row_errors(self):
+        rows = self.rows(2)
+        rows[0]['interested_service'] = '²'
+        rows[1]['assigned_to'] = '٣'
+        response = self.client.post('/api/leads/import/', rows, format='json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (0, 2))
+        self.assertIn('interested_service', body['errors'][0]['errors'])
+        self.assertIn('assigned_to', body['errors'][1]['errors'])
+
+    def test_lookups_are_resolved_once_per_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post('/api/leads/import/', self.rows(5), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post('/api/leads/import/', self.rows(200), format='json')
+        # SQLite splits the INSERT by its parameter limit, so compare lookups only
+        def selects(queries):
+            return [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects(small)), len(selects(large)))
+        self.assertEqual(Lead.objects.count(), 205)
+
+    def test_csv_upload_and_dry_run(self):
+        content = 'name,email,message,interested_service,budget_range\n' \
+                  'Ann,ann@example.com,Hi,SEO,\n' \
+                  f'Bob,bob@example.com,Hello,{self.service.pk},5k\n'
+        upload = SimpleUploadedFile('expo.csv', content.encode(), content_type='text/csv')
+        body = self.client.post('/api/leads/import/?dry_run=1', {'file': upload}, format='multipart').json()
+        self.assertEqual((body['created'], body['failed']), (2, 0))
+        self.assertFalse(Lead.objects.exists())
+
+        upload = SimpleUploadedFile('expo.csv', content.encode(), content_type='text/csv')
+        self.client.post('/api/leads/import/', {'file': upload}, format='multipart')
+        self.assertEqual(Lead.objects.filter(interested_service=self.service).count(), 2)
+
+    def test_dry_run_keeps_cached_versions(self):
+        before = get_model_versions([Lead])
+        body = self.client.post('/api/leads/import/?dry_run=1', self.rows(2), format='json').json()
+        self.assertEqual(body['created'], 2)
+        self.assertEqual(get_model_versions([Lead]), before)
+        self.client.post('/api/leads/import/', self.rows(2), format='json')
+        self.assertNotEqual(get_model_versions([Lead]), before)
+
+    def test_unreadable_file(self):
+        latin1 = 'name,email,message\nJos\u00e9,jose@example.com,Ol\u00e1\n'.encode('latin-1')
+        upload = SimpleUploadedFile('expo.csv', latin1, content_type='text/csv')
+        response = self.client.post('/api/leads/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.json()['detail'])
+
+        oversized = f'name,email,message\nAnn,ann@example.com,{"x" * (csv.field_size_limit() + 1)}\n'
+        upload = SimpleUploadedFile('expo.csv', oversized.encode(), content_type='text/csv')
+        response = self.client.post('/api/leads/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not valid CSV', response.json()['detail'])
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as fh:
+            fh.write(latin1)
+        self.addCleanup(os.unlink, fh.name)
+        with self.assertRaisesMessage(CommandError, 'UTF-8'):
+            call_command('import_leads', fh.name, stdout=StringIO(), stderr=StringIO())
+        self.assertFalse(Lead.objects.exists())
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as fh:
+            for row in self.rows(3):
+                fh.write(json.dumps(row) + '\n')
+            fh.write('{broken\n')
+        self.addCleanup(os.unlink, fh.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_leads', fh.name, '--batch-size', '2', stdout=out, stderr=err)
+        self.assertIn('Imported 3 of 4 row(s), 1 failed', out.getvalue())
+        self.assertIn('row 4', err.getvalue())
+        self.assertEqual(Lead.objects.count(), 3)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post('/api/leads/import/', [], format='json').status_code, 401)
+
+
+class InvoiceBulkStatusTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', role='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        self.invoices = [
+            Invoice.objects.create(
+                invoice_number=f'INV-{n}', client=self.admin, amount=100, description='<p>Work</p>',
+                due_date=date(2026, 1, 1), status='sent'
+            ) for n in range(3)
+        ]
+
+    def test_marks_selected_invoices_paid(self):
+        ids = [invoice.pk for invoice in self.invoices[:2]]
+        with self.assertNumQueries(1):
+            response = self.client.post('/api/invoices/bulk-status/', {'ids': ids, 'status': 'paid'}, format='json')
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(Invoice.objects.filter(status='paid', paid_date__isnull=False).count(), 2)
+        self.assertEqual(Invoice.objects.get(pk=self.invoices[2].pk).status, 'sent')
+
+    def test_rejects_unknown_status(self):
+        response = self.client.post(
+            '/api/invoices/bulk-status/', {'ids': [self.invoices[0].pk], 'status': 'refunded'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+
+class ResumeUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        self.addCleanup(shutil.rmtree, self.spool)
+        overrides = override_settings(
+            RESUME_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=self.media,
+            RESUME_SPOOL_DIR=self.spool, RESUME_UPLOAD_WORKERS=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        poster = User.objects.create_user(username='hr', email='hr@example.com', password='x')
+        self.job = Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=poster
+        )
+        self.client = APIClient()
+
+    def apply(self):
+        upload = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf')
+        return self.client.post('/api/apply/', {
+            'job': self.job.pk, 'name': 'Ann', 'email': 'ann@example.com', 'resume': upload
+        }, format='multipart')
+
+    def test_row_is_committed_before_the_upload(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.apply()
+        self.assertEqual(response.status_code, 201)
+        application = JobApplication.objects.get()
+        self.assertEqual((application.resume_status, application.resume.name), ('pending', ''))
+        self.assertTrue(os.path.exists(os.path.join(self.spool, application.resume_spool)))
+
+        for callback in callbacks:
+            callback()
+        application.refresh_from_db()
+        self.assertEqual(application.resume_status, 'uploaded')
+        self.assertEqual(application.resume.name, 'resumes/cv.pdf')
+        with open(os.path.join(self.media, 'resumes', 'cv.pdf'), 'rb') as fh:
+            self.assertEqual(fh.read(), b'%PDF-1.4 resume')
+        self.assertEqual(application.resume_spool, '')
+        self.assertEqual(os.listdir(self.spool), [])
+
+    def test_resume_is_required(self):
+        response = self.client.post('/api/apply/', {
+            'job': self.job.pk, 'name': 'Ann', 'email': 'ann@example.com'
+        }, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resume', response.json())
+
+    def test_pending_application_readable(self):
+        with self.captureOnCommitCallbacks():
+            self.apply()
+        application = JobApplication.objects.get()
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role='admin')
+        self.client.force_authenticate(admin)
+        for url in ('/api/job-applications/', f'/api/job-applications/{application.pk}/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            data = data['results'][0] if 'results' in data else data
+            self.assertIsNone(data['resume'])
+            self.assertEqual(data['resume_status'], 'pending')
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        author = User.objects.create_user(
+            username='writer', email='writer@example.com', password='x', first_name='Ada', last_name='Lovelace'
+        )
+        self.project = Project.objects.create(
+            title='Shop', description='<p>Shop</p>', short_description='Shop', client_name='Acme',
+            industry=Industry.objects.create(name='Retail'), is_published=True, featured_image='projects/shop'
+        )
+        self.project.tags.add(ProjectTag.objects.create(name='Ecommerce'))
+        ProjectImage.objects.create(project=self.project, image='projects/gallery/shop-1')
+        Service.objects.create(
+            title='Design', description='<p>D</p>', short_description='D', image='services/images/design'
+        )
+        self.post = BlogPost.objects.create(
+            title='Post', content='<p>Body</p>', author=author, is_published=True, featured_image='blog/featured/post'
+        )
+
+    def get(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.json(), [query['sql'] for query in ctx.captured_queries]
+
+    def test_fields_and_omit(self):
+        full, _ = self.get('/api/projects/')
+        full = full['results'][0]
+        sparse, queries = self.get('/api/projects/?fields=title,slug,industry_name,featured_image_variants')
+        self.assertEqual(sparse['results'], [{
+            name: full[name] for name in ('industry_name', 'featured_image_variants', 'title', 'slug')
+        }])
+        # Validators, count and the page: no tag or image prefetches
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('"description"', queries[-1])
+        self.assertIn('"core_industry"."name"', queries[-1])
+
+        omitted, _ = self.get('/api/projects/?omit=description,meta_title')
+        self.assertEqual(omitted['results'], [
+            {name: value for name, value in full.items() if name not in ('description', 'meta_title')}
+        ])
+
+    def test_expansions_are_opt_in(self):
+        data, queries = self.get('/api/projects/?fields=title&expand=tags')
+        self.assertEqual(list(data['results'][0]), ['tags', 'title'])
+        self.assertEqual([tag['name'] for tag in data['results'][0]['tags']], ['Ecommerce'])
+        self.assertEqual(len(queries), 4)
+        data, _ = self.get('/api/projects/?expand=')
+        self.assertNotIn('tags', data['results'][0])
+        self.assertNotIn('images', data['results'][0])
+        self.assertIn('description', data['results'][0])
+        # Without any of the parameters the representation is unchanged
+        data, _ = self.get('/api/projects/')
+        self.assertIn('images', data['results'][0])
+
+    def test_blank_expand_is_cached_apart(self):
+        for url in ('/api/projects/', f'/api/projects/{self.project.slug}/'):
+            with self.subTest(url):
+                cache.clear()
+                lean = self.client.get(url + '?expand=')
+                full = self.client.get(url)
+                self.assertEqual(full['X-Cache'], 'MISS')
+                body = full.json()
+                self.assertIn('tags', body['results'][0] if 'results' in body else body)
+                response = self.client.get(url + '?expand=', HTTP_IF_NONE_MATCH=full['ETag'])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], full['ETag'])
+                self.assertEqual(response.content, lean.content)
+
+    def test_fast_list_and_detail(self):
+        from .views import BlogPostViewSet
+        data, queries = self.get('/api/services/?fields=title,image_variants')
+        self.assertEqual(list(data['results'][0]), ['image_variants', 'title'])
+        self.assertNotIn('"description"', queries[-1])
+
+        url = '/api/blog-posts/?fields=title,author_name,featured_image_thumbnail'
+        posts, queries = self.get(url)
+        self.assertEqual(posts['results'][0]['author_name'], 'Ada Lovelace')
+        self.assertNotIn('"excerpt"', queries[-1])
+        with mock.patch.object(BlogPostViewSet, 'fast_list', False):
+            self.assertEqual(self.get(url)[0], posts)
+
+        url = f'/api/blog-posts/{self.post.slug}/'
+        with override_settings(BLOG_VIEWS_FLUSH_INTERVAL=0):
+            detail, queries = self.get(f'{url}?fields=title,views_count')
+        self.assertEqual(list(detail), ['title', 'views_count'])
+        self.assertGreaterEqual(detail['views_count'], 1)
+        self.assertNotIn('"content"', ''.join(queries))
+        # Different bodies, different validators
+        self.assertNotEqual(self.client.get(f'{url}?fields=title')['ETag'], self.client.get(url)['ETag'])
+
+    def test_writes_use_every_field(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role='admin')
+        self.client.force_authenticate(admin)
+        response = self.client.patch(
+            f'/api/projects/{self.project.slug}/?fields=title', {'title': 'Store'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Store')
+        self.assertIn('tags', response.json())
+
+
+class HomeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        SiteSettings.objects.create(company_email='hello@example.com')
+        Service.objects.create(title='Hidden', description='<p>H</p>', short_description='H')
+        self.add_rows('First')
+        cache.clear()
+
+    def add_rows(self, name):
+        Service.objects.create(title=name, description='<p>S</p>', short_description='S', is_featured=True)
+        project = Project.objects.create(
+            title=name, description='<p>P</p>', short_description='P', client_name='Acme',
+            industry=Industry.objects.create(name=f'{name} industry'), is_published=True, is_featured=True
+        )
+        project.tags.add(ProjectTag.objects.create(name=f'{name} tag'))
+        ProjectImage.objects.create(project=project, image=f'projects/gallery/{name.lower()}')
+        Testimonial.objects.create(
+            name=name, company='Acme', testimonial_text='Great', project=project, is_featured=True
+        )
+        Package.objects.create(name=name, package_type='growth', description='<p>G</p>', price='99.00')
+        TeamMember.objects.create(name=name, role='Dev', bio='Bio')
+        FAQ.objects.create(question=f'{name}?', answer='Yes')
+
+    def test_sections_match_endpoints(self):
+        home = self.client.get('/api/home/').json()
+        self.assertEqual(home['settings'], self.client.get('/api/settings/').json())
+        for section, url in [
+            ('services', '/api/services/?is_featured=true'), ('projects', '/api/projects/?is_featured=true'),
+            ('testimonials', '/api/testimonials/?is_featured=true'), ('packages', '/api/packages/'),
+            ('team_members', '/api/team-members/'), ('faqs', '/api/faqs/'),
+        ]:
+            self.assertEqual(home[section], self.client.get(url).json()['results'], section)
+
+    def test_fixed_query_count_and_one_cached_blob(self):
+        # Eight section queries plus the site settings row
+        with self.assertNumQueries(9):
+            self.client.get('/api/home/')
+        for n in range(3):
+            self.add_rows(f'More {n}')
+        # The settings are still cached in process
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/home/')
+        self.assertEqual(len(response.json()['projects']), 4)
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/home/')
+        self.assertEqual(cached.json(), response.json())
+        not_modified = self.client.get('/api/home/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_invalidated_by_contributing_models(self):
+        etag = self.client.get('/api/home/')['ETag']
+        FAQ.objects.update(answer='Changed')
+        # update() skips signals; a save on any contributing model invalidates
+        TeamMember.objects.get().save()
+        response = self.client.get('/api/home/')
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['faqs'][0]['answer'], 'Changed')
+
+        settings = SiteSettings.objects.get()
+        settings.company_email = 'sales@example.com'
+        settings.save()
+        self.assertEqual(self.client.get('/api/home/').json()['settings']['company_email'], 'sales@example.com')
+
+
+class AsyncReadUrls:
+    """api/urls.py as routed with ASYNC_READS=True"""
+    from .views import HomeView, SiteSettingsView
+
+    urlpatterns = [
+        path('api/settings/', SiteSettingsView.as_async_view()),
+        path('api/home/', HomeView.as_async_view()),
+        path('api/', include(async_read_urls())),
+        path('api/', include('api.urls')),
+    ]
+
+
+class AsyncReadTests(TestCase):
+    """The async views must answer exactly like the sync viewsets they mirror"""
+
+    def setUp(self):
+        self.client = APIClient()
+        author = User.objects.create_user(
+            username='writer', email='writer@example.com', password='x', first_name='Ada', last_name='Lovelace'
+        )
+        self.category = BlogCategory.objects.create(name='News', description='<p>News</p>')
+        tag = BlogTag.objects.create(name='Django')
+        for n in range(3):
+            post = BlogPost.objects.create(
+                title=f'Post {n}', content='<p>Body</p>', author=author, is_published=True,
+                category=self.category if n else None
+            )
+            post.tags.add(tag)
+        self.post = post
+        project = Project.objects.create(
+            title='Shop', description='<p>Shop</p>', short_description='Shop', client_name='Acme',
+            industry=Industry.objects.create(name='Retail'), is_published=True
+        )
+        project.tags.add(ProjectTag.objects.create(name='Ecommerce'))
+        ProjectImage.objects.create(project=project, image='projects/gallery/shop-1')
+        self.project = project
+        Testimonial.objects.create(name='Client', company='Acme', testimonial_text='Great', project=project)
+        self.service = Service.objects.create(
+            title='Design', description='<p>D</p>', short_description='D', image='services/images/design'
+        )
+        Package.objects.create(
+            name='Growth', package_type='growth', description='<p>G</p>', price='199.50', features=['SEO']
+        )
+
+    def async_get(self, url, **headers):
+        with self.settings(ROOT_URLCONF=AsyncReadUrls):
+            return async_to_sync(self.async_client.get)(url, headers=headers)
+
+    def test_reads_match_sync_views(self):
+        urls = [
+            '/api/services/', f'/api/services/{self.service.slug}/', '/api/services/?page=2',
+            '/api/services/missing/', '/api/projects/', f'/api/projects/{self.project.slug}/',
+            '/api/blog-posts/', '/api/blog-posts/?pagination=cursor',
+            f'/api/blog-posts/?category={self.category.pk}', '/api/testimonials/', '/api/packages/',
+            '/api/settings/', '/api/home/',
+        ]
+        for url in urls:
+            cache.clear()
+            expected = self.client.get(url)
+            cache.clear()
+            # Anonymous JSON reads never reach the sync dispatch
+            with mock.patch.object(APIView, 'dispatch', side_effect=AssertionError('sync view used')):
+                response = self.async_get(url)
+            self.assertEqual(response.status_code, expected.status_code, url)
+            self.assertEqual(response.json(), expected.json(), url)
+            self.assertEqual(response.has_header('ETag'), expected.has_header('ETag'), url)
+
+    def test_server_timing(self):
+        cache.clear()
+        timing = self.async_get('/api/projects/')['Server-Timing']
+        # Queries run in sync_to_async threads are still attributed to the request
+        self.assertIn('desc="project-list"', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    @override_settings(BLOG_VIEWS_FLUSH_INTERVAL=0)
+    def test_blog_post_detail_records_view(self):
+        url = f'/api/blog-posts/{self.post.slug}/'
+        first = self.async_get(url).json()
+        second = self.async_get(url).json()
+        self.assertEqual([tag['name'] for tag in first['tags_list']], ['Django'])
+        self.assertEqual(second['views_count'], first['views_count'] + 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, second['views_count'])
+
+    def test_shares_cache_and_validators_with_sync_views(self):
+        cache.clear()
+        expected = self.client.get('/api/services/')
+        response = self.async_get('/api/services/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, expected.content)
+        response = self.async_get('/api/services/', **{'If-None-Match': expected['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_requests_use_sync_views(self):
+        with self.settings(ROOT_URLCONF=AsyncReadUrls):
+            response = async_to_sync(self.async_client.post)('/api/services/', {'title': 'X'})
+        self.assertEqual(response.status_code, 401)
+        # Credentials are checked by the viewset's authenticators
+        self.assertEqual(self.async_get('/api/services/', Authorization='Bearer nonsense').status_code, 401)
+        response = self.async_get('/api/services/', Accept='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+    def test_async_routes_cover_public_reads(self):
+        routed = {pattern.callback.cls.__name__ for pattern in async_read_urls()}
+        self.assertEqual(routed, {
+            'ServiceViewSet', 'ProjectViewSet', 'TestimonialViewSet', 'BlogPostViewSet', 'PackageViewSet'
+        })
+
+
+class DatabasePoolStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role='admin')
+
+    def test_connections_are_reused_and_health_checked(self):
+        from django.conf import settings
+        database = settings.DATABASES['default']
+        self.assertEqual(database['CONN_MAX_AGE'], settings.DB_CONN_MAX_AGE)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_admin_only(self):
+        self.assertEqual(self.client.get('/api/db/pool/').status_code, 401)
+        self.client.force_authenticate(self.admin)
+        stats = self.client.get('/api/db/pool/').json()
+        self.assertEqual(stats['mode'], 'persistent')
+        # The connection serving this request is busy
+        self.assertGreaterEqual(stats['in_use'], 1)
+        self.assertEqual(stats['waits'], 0)
+
+    def test_tracker_counts_each_connection_once(self):
+        class Wrapper:
+            alias = 'default'
+
+            def __init__(self, raw):
+                self.connection = raw
+                self._thread_ident = threading.get_ident()
+
+        tracker = ConnectionTracker()
+        raw = Wrapper(None)
+        # A pool hands the same connection to the wrapper twice
+        wrapper = Wrapper(raw)
+        tracker.connection_created(sender=None, connection=wrapper)
+        tracker.connection_created(sender=None, connection=wrapper)
+        self.assertEqual(tracker.opened, 1)
+        self.assertEqual(tracker.get_thread_stats('default'), (0, 1))
+        tracker.request_started()
+        self.assertEqual(tracker.get_thread_stats('default'), (1, 0))
+        tracker.request_finished()
+        self.assertEqual(len(tracker.get_ages()), 1)
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        Service.objects.create(title='Design', description='<p>D</p>', short_description='D')
+
+    def parse_server_timing(self, response):
+        entries = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            entries[name] = dict(param.split('=', 1) for param in params)
+        return entries
+
+    @override_settings(SERVER_TIMING=True)
+    def test_header_breaks_down_the_request(self):
+        response = self.client.get('/api/services/')
+        timing = self.parse_server_timing(response)
+        self.assertEqual(timing['total']['desc'], '"service-list"')
+        self.assertRegex(timing['db']['desc'], r'^"[1-9]\d* queries"$')
+        self.assertGreater(float(timing['serialize']['dur']), 0)
+        self.assertGreater(float(timing['render']['dur']), 0)
+        self.assertEqual(timing['size']['desc'], f'"{len(response.content)} bytes"')
+        # The phases never add up to more than the whole request
+        parts = sum(float(timing[name]['dur']) for name in ('db', 'serialize', 'render', 'app'))
+        self.assertLessEqual(parts, float(timing['total']['dur']) + 0.05)
+
+        # Served from the response cache: no queries, nothing serialized
+        timing = self.parse_server_timing(self.client.get('/api/services/'))
+        self.assertEqual(timing['db']['desc'], '"0 queries"')
+        self.assertEqual(float(timing['serialize']['dur']), 0)
+
+    @override_settings(SERVER_TIMING=False)
+    def test_header_can_be_turned_off(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/services/'))
+
+    def test_serializers_outside_views_are_not_timed(self):
+        from .serializers import ServiceSerializer
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            ServiceSerializer(Service.objects.all(), many=True).data
+        finally:
+            current_timing.reset(token)
+        self.assertEqual(timing.serialize, 0)
+
+    def test_metrics_admin_only(self):
+        self.client.get('/api/services/')
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 401)
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role='admin')
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        text = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('http_request_duration_seconds_bucket{view="service-list",method="GET",le="+Inf"}', text)
+        self.assertIn('http_requests_total{view="service-list",method="GET",status="200"}', text)
+        self.assertIn('http_request_serialize_seconds_count{view="service-list",method="GET"}', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('latency_seconds', 'Latency.', ('view',), (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, 'home')
+        self.assertEqual(histogram.expose()[2:], [
+            'latency_seconds_bucket{view="home",le="0.1"} 2',
+            'latency_seconds_bucket{view="home",le="1.0"} 3',
+            'latency_seconds_bucket{view="home",le="+Inf"} 4',
+            'latency_seconds_sum{view="home"} 3.65',
+            'latency_seconds_count{view="home"} 4',
+        ])
+
+
+class FastJSONRendererTests(TestCase):
+    data = {
+        'price': Decimal('12.50'),
+        'at': datetime(2025, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        'day': date(2025, 3, 1),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Design'),
+        'text': 'Caf\u00e9 \u2028 \u2029 \U0001f600',
+        'counts': {1: 2},
+        'items': [{'a': None, 'b': True, 'c': 1.5}],
+    }
+
+    def test_matches_drf_output(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    def test_floats_are_equal_but_not_byte_identical(self):
+        data = {'big': 1e16, 'small': 1e-7}
+        fast, stock = FastJSONRenderer().render(data), JSONRenderer().render(data)
+        self.assertEqual(json.loads(fast), json.loads(stock))
+        self.assertEqual((fast, stock), (b'{"big":1e16,"small":1e-7}', b'{"big":1e+16,"small":1e-07}'))
+
+    def test_falls_back_to_drf(self):
+        expected = JSONRenderer().render(self.data)
+        with mock.patch('api.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        # orjson can't encode integers this wide
+        self.assertEqual(FastJSONRenderer().render({'n': 2 ** 70}), b'{"n":1180591620717411303424}')
+        # Indented output is left to the stock renderer
+        indented = FastJSONRenderer().render(self.data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(self.data, 'application/json; indent=2'))
+
+    def test_registered_for_api_responses(self):
+        response = APIClient().get('/api/services/', HTTP_ACCEPT='application/json')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        Service.objects.bulk_create([
+            Service(title=f'Service {n}', slug=f'service-{n}', description='<p>Description</p>' * 20,
+                    short_description='Short') for n in range(10)
+        ])
+
+    def test_choose_encoding(self):
+        with mock.patch('api.compression.brotli', object()):
+            self.assertEqual(compression.choose_encoding('gzip, deflate, br'), 'br')
+            self.assertEqual(compression.choose_encoding('gzip;q=1.0, br;q=0.5'), 'gzip')
+            self.assertEqual(compression.choose_encoding('br;q=0, *'), 'gzip')
+            self.assertIsNone(compression.choose_encoding('identity'))
+            self.assertIsNone(compression.choose_encoding(''))
+        with mock.patch('api.compression.brotli', None):
+            self.assertEqual(compression.choose_encoding('br, gzip'), 'gzip')
+            self.assertIsNone(compression.choose_encoding('br'))
+
+    def test_large_responses_are_gzipped(self):
+        plain = self.client.get('/api/services/')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get('/api/services/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    @skipUnless(compression.brotli, 'Brotli is not installed')
+    def test_brotli_preferred(self):
+        plain = self.client.get('/api/services/')
+        response = self.client.get('/api/services/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain.content)
+
+    def test_small_responses_left_alone(self):
+        with override_settings(COMPRESS_MIN_SIZE=10 ** 6):
+            response = self.client.get('/api/services/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+        with override_settings(COMPRESS_MIN_SIZE=0):
+            response = self.client.get('/api/services/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_etag_weakened_and_still_revalidates(self):
+        service = Service.objects.first()
+        url = f'/api/services/{service.slug}/'
+        with override_settings(COMPRESS_MIN_SIZE=100):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertTrue(response['ETag'].startswith('W/"'))
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -1,4 +1,5 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -9,8 +10,10 @@ from .views import (
     TestimonialViewSet, BlogCategoryViewSet, BlogTagViewSet, BlogPostViewSet,
     PackageViewSet, LeadViewSet, ContactFormView, TeamMemberViewSet,
     JobViewSet, JobApplicationViewSet, JobApplicationCreateView,
-    FAQViewSet, InvoiceViewSet, SiteSettingsView, DashboardStatsView
+    FAQViewSet, InvoiceViewSet, SiteSettingsView, HomeView, DashboardStatsView, CacheStatsView,
+    DatabasePoolStatsView, MetricsView
 )
+from .async_views import AsyncReadMixin
 
 router = DefaultRouter()
 router.register(r'services', ServiceViewSet)
@@ -29,6 +32,29 @@ router.register(r'job-applications', JobApplicationViewSet)
 router.register(r'faqs', FAQViewSet)
 router.register(r'invoices', InvoiceViewSet)
 
+
+def async_read_urls():
+    """List and detail routes of every async-capable viewset, served by their async views"""
+    urls = []
+    for prefix, viewset, basename in router.registry:
+        if not issubclass(viewset, AsyncReadMixin):
+            continue
+        lookup = viewset.lookup_url_kwarg or viewset.lookup_field
+        lookup_value = getattr(viewset, 'lookup_value_regex', '[^/.]+')
+        urls += [
+            re_path(
+                rf'^{prefix}/$', viewset.as_async_view('list', basename=basename, detail=False),
+                name=f'{basename}-list',
+            ),
+            re_path(
+                rf'^{prefix}/(?P<{lookup}>{lookup_value})/$',
+                viewset.as_async_view('retrieve', basename=basename, detail=True),
+                name=f'{basename}-detail',
+            ),
+        ]
+    return urls
+
+
 urlpatterns = [
     # Authentication
     path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -37,12 +63,23 @@ urlpatterns = [
     # Public endpoints
     path('contact/', ContactFormView.as_view(), name='contact_form'),
     path('apply/', JobApplicationCreateView.as_view(), name='job_application_create'),
-    path('settings/', SiteSettingsView.as_view(), name='site_settings'),
+    path(
+        'settings/',
+        SiteSettingsView.as_async_view() if settings.ASYNC_READS else SiteSettingsView.as_view(),
+        name='site_settings',
+    ),
+    path('home/', HomeView.as_async_view() if settings.ASYNC_READS else HomeView.as_view(), name='home'),
     
     # Admin endpoints
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard_stats'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
+    path('db/pool/', DatabasePoolStatsView.as_view(), name='db_pool_stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     
     # Router URLs
     path('', include(router.urls)),
 ]
 
+if settings.ASYNC_READS:
+    # Matched before the router, which keeps serving every other route
+    urlpatterns = async_read_urls() + urlpatterns
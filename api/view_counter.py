@@ -0,0 +1,192 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.db.models import F
+from .cache import CACHE_PREFIX, run_cached
+
+logger = logging.getLogger(__name__)
+
+# Posts whose highest served count each process remembers
+SERVED_LIMIT = 1000
+
+
+def view_key(post_id):
+    return f'{CACHE_PREFIX}:views:{post_id}'
+
+
+DIRTY_KEY = f'{CACHE_PREFIX}:views:dirty'
+
+
+class LocalViewStore:
+    """Pending views of this process, for cache backends that aren't shared"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(int)
+
+    def add(self, post_id, count):
+        with self.lock:
+            self.pending[post_id] += count
+            return self.pending[post_id]
+
+    def take(self):
+        with self.lock:
+            pending, self.pending = dict(self.pending), defaultdict(int)
+        return pending
+
+
+class RedisViewStore:
+    """
+    Pending views in Redis, shared by every worker.
+
+    Each post's counter lives under its own key with no expiry, and the ids
+    of posts with pending views are kept in a set, so a flush reads only
+    those. take() reads and deletes both in MULTI transactions, so two
+    overlapping flushes can never write the same views.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def client(self):
+        return self.backend._cache.get_client(write=True)
+
+    def key(self, key):
+        return self.backend.make_and_validate_key(key)
+
+    def add(self, post_id, count):
+        pipe = self.client().pipeline()
+        pipe.incrby(self.key(view_key(post_id)), count)
+        pipe.sadd(self.key(DIRTY_KEY), post_id)
+        return pipe.execute()[0]
+
+    def take(self):
+        client = self.client()
+        pipe = client.pipeline()
+        pipe.smembers(self.key(DIRTY_KEY))
+        pipe.delete(self.key(DIRTY_KEY))
+        post_ids = [int(post_id) for post_id in pipe.execute()[0]]
+        if not post_ids:
+            return {}
+        # A view recorded after the set was read re-adds its post to the set;
+        # if its count is taken here, the next flush just finds nothing
+        pipe = client.pipeline()
+        for post_id in post_ids:
+            pipe.get(self.key(view_key(post_id)))
+            pipe.delete(self.key(view_key(post_id)))
+        counts = pipe.execute()[::2]
+        return {post_id: int(count) for post_id, count in zip(post_ids, counts) if count is not None}
+
+
+_local_store = LocalViewStore()
+
+
+def get_view_store():
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        return RedisViewStore(backend)
+    return _local_store
+
+
+class ViewCounter:
+    """
+    Buffer BlogPost view increments and write them in batches.
+
+    Detail hits only increment a per-post counter. With Redis as the default
+    cache the counters live there, so all workers share them and they
+    outlive a crashed worker; with a per-process cache they are kept in
+    process memory, away from the culled response cache. A daemon thread
+    flushes them every ``interval`` seconds with one UPDATE per distinct
+    increment, and an atexit hook flushes on graceful shutdown. Neither is
+    started when every hit is flushed (an interval of 0) or under tests.
+    """
+
+    def __init__(self, interval=None, autostart=True):
+        self.interval = interval
+        self.autostart = autostart
+        self.lock = threading.Lock()
+        # Highest count served per post, so the number never goes backwards
+        # when a flush lands between reading the row and recording the view.
+        # Least recently viewed posts are forgotten past SERVED_LIMIT.
+        self.served = {}
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def get_interval(self):
+        if self.interval is not None:
+            return self.interval
+        return settings.BLOG_VIEWS_FLUSH_INTERVAL
+
+    def record(self, post_id, stored_count):
+        """Buffer one view and return the approximate count to serve"""
+        self.ensure_started()
+        pending = get_view_store().add(post_id, 1)
+        with self.lock:
+            count = max(stored_count + pending, self.served.pop(post_id, 0) + 1)
+            self.served[post_id] = count
+            if len(self.served) > SERVED_LIMIT:
+                del self.served[next(iter(self.served))]
+        if self.get_interval() <= 0:
+            self.flush()
+        return count
+
+    async def arecord(self, post_id, stored_count):
+        if self.get_interval() <= 0:
+            # Every hit is flushed, which writes to the database
+            return await sync_to_async(self.record)(post_id, stored_count)
+        return await run_cached(self.record, post_id, stored_count)
+
+    def flush(self):
+        """Write buffered increments to BlogPost.views_count"""
+        from core.models import BlogPost
+
+        store = get_view_store()
+        # Taken atomically: views recorded from here on wait for the next flush
+        pending = {post_id: count for post_id, count in store.take().items() if count}
+        if not pending:
+            return 0
+
+        by_increment = defaultdict(list)
+        for post_id, increment in pending.items():
+            by_increment[increment].append(post_id)
+        try:
+            with transaction.atomic():
+                for increment, post_ids in by_increment.items():
+                    BlogPost.objects.filter(pk__in=post_ids).update(views_count=F('views_count') + increment)
+        except Exception:
+            # Put the increments back so the next flush retries them
+            for post_id, count in pending.items():
+                store.add(post_id, count)
+            logger.exception('Failed to flush blog post view counts')
+            return 0
+        return sum(pending.values())
+
+    def ensure_started(self):
+        if not self.autostart or self.thread is not None or self.get_interval() <= 0 or settings.TESTING:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='blog-view-counter', daemon=True)
+                self.thread.start()
+                atexit.register(self.stop)
+
+    def run(self):
+        from django.db import connection
+
+        while not self.stopped.wait(self.get_interval()):
+            self.flush()
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.flush()
+
+
+view_counter = ViewCounter()
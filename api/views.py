@@ -1,23 +1,46 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter, BaseFilterBackend
+from django.conf import settings as django_settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q, F
+from django.http import HttpResponse
+from django.db import transaction
 from core.models import (
-    Service, Industry, Project, ProjectTag, Testimonial, BlogCategory, 
+    Service, Industry, Project, ProjectImage, ProjectTag, Testimonial, BlogCategory, 
     BlogTag, BlogPost, Package, Lead, TeamMember, Job, JobApplication, 
-    FAQ, Invoice, SiteSettings
+    FAQ, Invoice
 )
+from core.resume_uploads import resume_uploader
+from .async_views import AsyncReadMixin
+from .cache import CachedResponseMixin, get_cache_stats, run_cached
+from .conditional import ConditionalGetMixin, not_modified_response, is_not_modified, set_validators
+from .db_pool import get_pool_stats
+from .exports import ExportMixin
+from .fast_serializers import FastListMixin
+from .imports import ImportFileError, LeadImporter, import_leads_file
+from .metrics import SerializeTimingMixin, request_metrics, serialize
+from .fieldsets import SparseQuerysetMixin
+from .filters import FullTextSearchFilter, RankedOrderingFilter
+from .home import build_home_payload, get_cached_home_payload, get_home_payload
+from .notifications import queue_lead_notification, queue_application_notification
+from .pagination import KeysetOrPageNumberPagination
+from .site_settings import get_site_settings_payload, aget_site_settings_payload
+from .stats import get_dashboard_stats
+from .view_counter import view_counter
 from .serializers import (
     UserSerializer, ServiceSerializer, IndustrySerializer, ProjectSerializer,
     ProjectTagSerializer, TestimonialSerializer, BlogCategorySerializer,
     BlogTagSerializer, BlogPostSerializer, BlogPostListSerializer, PackageSerializer,
     LeadSerializer, LeadCreateSerializer, TeamMemberSerializer, JobSerializer,
     JobListSerializer, JobApplicationSerializer, JobApplicationCreateSerializer,
-    FAQSerializer, InvoiceSerializer, SiteSettingsSerializer
+    FAQSerializer, InvoiceSerializer, InvoiceBulkStatusSerializer
 )
 
 User = get_user_model()
@@ -28,13 +51,14 @@ class AdminOnlyPermission(permissions.BasePermission):
         return request.user and request.user.is_authenticated and request.user.role == 'admin'
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(CachedResponseMixin, ConditionalGetMixin, AsyncReadMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
+    cache_models = [Service]
     # Use IsAuthenticatedOrReadOnly for public read and restricted write.
     # If only admins should edit, use [AdminOnlyPermission].
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['is_featured']
     search_fields = ['title', 'description']
     ordering_fields = ['order', 'title', 'created_at']
@@ -42,87 +66,147 @@ class ServiceViewSet(viewsets.ModelViewSet):
     lookup_field = 'slug'
 
 
-class IndustryViewSet(viewsets.ReadOnlyModelViewSet):
+class IndustryViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Industry.objects.all()
     serializer_class = IndustrySerializer
+    cache_models = [Industry]
     permission_classes = [permissions.AllowAny]
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.filter(is_published=True)
+class ProjectViewSet(CachedResponseMixin, ConditionalGetMixin, AsyncReadMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.filter(is_published=True).select_related('industry', 'client').prefetch_related('tags', 'images')
     serializer_class = ProjectSerializer
+    cache_models = [Project, ProjectTag, ProjectImage, Industry, User]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['industry', 'is_featured']
     search_fields = ['title', 'description', 'client_name']
     ordering_fields = ['created_at', 'title']
     ordering = ['-created_at']
     lookup_field = 'slug'
 
-class ProjectTagViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectTagViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ProjectTag.objects.all()
     serializer_class = ProjectTagSerializer
+    cache_models = [ProjectTag]
     permission_classes = [permissions.AllowAny]
 
-class TestimonialViewSet(viewsets.ModelViewSet):
-    queryset = Testimonial.objects.filter(is_published=True)
+class TestimonialViewSet(CachedResponseMixin, ConditionalGetMixin, AsyncReadMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = Testimonial.objects.filter(is_published=True).select_related('project')
     serializer_class = TestimonialSerializer
+    cache_models = [Testimonial, Project]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['is_featured', 'rating']
     ordering_fields = ['created_at', 'rating']
     ordering = ['-created_at']
 
-class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class BlogCategoryViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = BlogCategory.objects.all()
     serializer_class = BlogCategorySerializer
+    cache_models = [BlogCategory]
     permission_classes = [permissions.AllowAny]
 
-class BlogTagViewSet(viewsets.ReadOnlyModelViewSet):
+class BlogTagViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = BlogTag.objects.all()
     serializer_class = BlogTagSerializer
+    cache_models = [BlogTag]
     permission_classes = [permissions.AllowAny]
 
-class BlogPostViewSet(viewsets.ModelViewSet):
-    queryset = BlogPost.objects.filter(is_published=True)
+class BlogPostViewSet(CachedResponseMixin, ConditionalGetMixin, FastListMixin, AsyncReadMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = BlogPost.objects.filter(is_published=True).select_related('author', 'category')
     serializer_class = BlogPostSerializer
+    fast_list = True
+    cache_models = [BlogPost, BlogCategory, BlogTag, User]
+    # Detail hits bump views_count, so only the list is cached
+    cache_actions = ('list',)
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['category', 'tags', 'is_featured']
     search_fields = ['title', 'content', 'excerpt']
     ordering_fields = ['published_at', 'views_count']
     ordering = ['-published_at']
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = '-published_at'
+    # retrieve() adds pending views to the stored count
+    required_columns = ['views_count']
     lookup_field = 'slug'
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # The list serializer reads the derived text fields, never the HTML
+            return queryset.defer('content', 'plain_text')
+        # Only the detail serializer renders tags
+        return queryset.prefetch_related('tags')
+
     def get_serializer_class(self):
         if self.action == 'list':
             return BlogPostListSerializer
         return BlogPostSerializer
     
     def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_detail_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
         instance = self.get_object()
-        # Increment view count atomically to prevent race conditions
-        instance.views_count = F('views_count') + 1
-        instance.save(update_fields=['views_count'])
-        # Refresh the instance from the DB to get the updated value for serialization
-        instance.refresh_from_db()
+        # Views are buffered and flushed in batches, so the served count is
+        # the stored value plus this worker's pending increments.
+        instance.views_count = view_counter.record(instance.pk, instance.views_count)
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serialize(serializer)), etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_detail_validators(request)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        instance = await self.aget_object()
+        instance.views_count = await view_counter.arecord(instance.pk, instance.views_count)
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return set_validators(Response(serialize(serializer)), etag, last_modified)
 
-class PackageViewSet(viewsets.ReadOnlyModelViewSet):
+class PackageViewSet(CachedResponseMixin, ConditionalGetMixin, AsyncReadMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Package.objects.filter(is_active=True)
     serializer_class = PackageSerializer
+    cache_models = [Package]
     permission_classes = [permissions.AllowAny]
     ordering = ['order', 'price']
 
-class LeadViewSet(viewsets.ModelViewSet):
-    queryset = Lead.objects.all()
+class LeadViewSet(ExportMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = Lead.objects.select_related('interested_service', 'assigned_to')
     serializer_class = LeadSerializer
+    cache_models = [Lead, Service, User]
     permission_classes = [AdminOnlyPermission]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'source', 'interested_service']
     search_fields = ['name', 'email', 'company']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = '-created_at'
+    export_fields = [
+        'id', 'created_at', 'name', 'email', 'phone', 'company', 'message', 'status', 'source',
+        'interested_service__title', 'budget_range', 'assigned_to__email', 'notes', 'follow_up_date',
+    ]
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, JSONParser])
+    def import_leads(self, request):
+        """Bulk import from an uploaded CSV / JSON Lines file or a posted JSON list of rows"""
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        upload = request.FILES.get('file')
+        if upload is not None:
+            file_format = 'jsonl' if upload.name.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+            try:
+                report = import_leads_file(upload, file_format, dry_run=dry_run)
+            except ImportFileError as exc:
+                return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        elif isinstance(request.data, list):
+            report = LeadImporter(dry_run=dry_run).run(request.data)
+        else:
+            return Response(
+                {'detail': 'Upload a CSV or JSON Lines file as "file", or post a JSON list of rows.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(report.as_dict())
 
 class ContactFormView(APIView):
     """Public endpoint for contact form submissions"""
@@ -131,25 +215,30 @@ class ContactFormView(APIView):
     def post(self, request):
         serializer = LeadCreateSerializer(data=request.data)
         if serializer.is_valid():
-            lead = serializer.save()
-            # TODO: Send email notification
+            # The notification is committed with the lead or not at all
+            with transaction.atomic():
+                lead = serializer.save()
+                queue_lead_notification(lead)
             return Response({
                 'message': 'Thank you for your inquiry. We will get back to you soon!',
                 'lead_id': lead.id
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class TeamMemberViewSet(viewsets.ReadOnlyModelViewSet):
+class TeamMemberViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = TeamMember.objects.filter(is_active=True)
     serializer_class = TeamMemberSerializer
+    cache_models = [TeamMember]
     permission_classes = [permissions.AllowAny]
     ordering = ['order', 'name']
 
-class JobViewSet(viewsets.ModelViewSet):
-    queryset = Job.objects.filter(status='open')
+class JobViewSet(CachedResponseMixin, ConditionalGetMixin, FastListMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = Job.objects.filter(status='open').select_related('posted_by')
     serializer_class = JobSerializer
+    fast_list = True
+    cache_models = [Job, JobApplication, User]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['job_type', 'location', 'status']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'title']
@@ -161,15 +250,22 @@ class JobViewSet(viewsets.ModelViewSet):
             return JobListSerializer
         return JobSerializer
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
-    queryset = JobApplication.objects.all()
+class JobApplicationViewSet(ExportMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = JobApplication.objects.select_related('job')
     serializer_class = JobApplicationSerializer
+    cache_models = [JobApplication, Job]
     permission_classes = [AdminOnlyPermission]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'job']
     search_fields = ['name', 'email']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = '-created_at'
+    export_fields = [
+        'id', 'created_at', 'job__title', 'name', 'email', 'phone', 'portfolio_url', 'resume', 'resume_status',
+        'status', 'cover_letter', 'notes',
+    ]
 
 class JobApplicationCreateView(APIView):
     """Public endpoint for job applications"""
@@ -178,63 +274,120 @@ class JobApplicationCreateView(APIView):
     def post(self, request):
         serializer = JobApplicationCreateSerializer(data=request.data)
         if serializer.is_valid():
-            application = serializer.save()
-            # TODO: Send email notification
+            with transaction.atomic():
+                application = serializer.save()
+                queue_application_notification(application)
+                # The resume goes to storage in the background once the row exists
+                transaction.on_commit(partial(resume_uploader.submit, application.pk))
             return Response({
                 'message': 'Your application has been submitted successfully!',
                 'application_id': application.id
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(CachedResponseMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = FAQ.objects.filter(is_active=True)
     serializer_class = FAQSerializer
+    cache_models = [FAQ]
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['category']
     ordering = ['order', 'question']
 
-class InvoiceViewSet(viewsets.ModelViewSet):
-    queryset = Invoice.objects.all()
+class InvoiceViewSet(ExportMixin, ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, viewsets.ModelViewSet):
+    queryset = Invoice.objects.select_related('client', 'project')
     serializer_class = InvoiceSerializer
+    cache_models = [User, Project]
     permission_classes = [AdminOnlyPermission]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'client']
     search_fields = ['invoice_number', 'client__email']
     ordering_fields = ['created_at', 'due_date']
     ordering = ['-created_at']
+    pagination_class = KeysetOrPageNumberPagination
+    keyset_ordering = '-created_at'
+    export_fields = [
+        'id', 'invoice_number', 'created_at', 'client__email', 'project__title', 'amount', 'tax_amount',
+        'total_amount', 'status', 'due_date', 'paid_date',
+    ]
 
-class SiteSettingsView(APIView):
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Set one status on many invoices in a single UPDATE; paid stamps paid_date"""
+        serializer = InvoiceBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = Invoice.objects.filter(pk__in=serializer.validated_data['ids']).set_status(
+            serializer.validated_data['status']
+        )
+        return Response({'updated': updated})
+
+class SiteSettingsView(AsyncReadMixin, APIView):
     """Get site settings"""
+    # Public and user-independent, so skip authentication and its user lookup
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
     
     def get(self, request):
-        # Use get_or_create for a cleaner and more atomic operation for this singleton model
-        settings, created = SiteSettings.objects.get_or_create(pk=1)
-        serializer = SiteSettingsSerializer(settings)
-        return Response(serializer.data)
+        return self.settings_response(request, *get_site_settings_payload())
+
+    async def aget(self, request):
+        return self.settings_response(request, *await aget_site_settings_payload())
+
+    def settings_response(self, request, data, etag):
+        # Weak comparison: compressed responses carry the ETag as W/"..."
+        if is_not_modified(request, etag):
+            response = not_modified_response(etag)
+        else:
+            response = set_validators(Response(data), etag)
+        response['Cache-Control'] = f'public, max-age={django_settings.SITE_SETTINGS_MAX_AGE}'
+        return response
+
+class HomeView(AsyncReadMixin, APIView):
+    """Everything the landing page shows, in one response"""
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return self.home_response(request, *get_home_payload())
+
+    async def aget(self, request):
+        key, payload = await run_cached(get_cached_home_payload)
+        if payload is None:
+            payload = await sync_to_async(build_home_payload)(key)
+        return self.home_response(request, *payload)
+
+    def home_response(self, request, data, etag):
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        return set_validators(Response(data), etag)
 
 class DashboardStatsView(APIView):
     """Dashboard statistics for admin"""
     permission_classes = [AdminOnlyPermission]
     
     def get(self, request):
-        stats = {
-            'total_projects': Project.objects.count(),
-            'active_projects': Project.objects.filter(is_published=True).count(),
-            'total_leads': Lead.objects.count(),
-            'new_leads': Lead.objects.filter(status='new').count(),
-            'total_blog_posts': BlogPost.objects.count(),
-            'published_blog_posts': BlogPost.objects.filter(is_published=True).count(),
-            'total_testimonials': Testimonial.objects.count(),
-            'featured_testimonials': Testimonial.objects.filter(is_featured=True).count(),
-            'total_services': Service.objects.count(),
-            'active_services': Service.objects.filter(is_active=True).count(),
-            'total_team_members': TeamMember.objects.count(),
-            'active_team_members': TeamMember.objects.filter(is_active=True).count(),
-            'total_jobs': Job.objects.count(),
-            'open_jobs': Job.objects.filter(status='open').count(),
-            'total_applications': JobApplication.objects.count(),
-            'pending_applications': JobApplication.objects.filter(status='submitted').count(),
-        }
-        return Response(stats)
+        # ?fresh=1 bypasses the snapshot and recomputes the counts
+        fresh = request.query_params.get('fresh') in ('1', 'true')
+        return Response(get_dashboard_stats(fresh=fresh))
+
+class CacheStatsView(APIView):
+    """Response cache hit/miss counters for admin"""
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request):
+        return Response(get_cache_stats())
+
+class DatabasePoolStatsView(APIView):
+    """Database connection figures of the worker that serves the request, for admin"""
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request):
+        return Response(get_pool_stats())
+
+class MetricsView(APIView):
+    """Request timing histograms of the worker that serves the request, in Prometheus text format, for admin"""
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request):
+        return HttpResponse(request_metrics.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
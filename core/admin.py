@@ -1,8 +1,9 @@
 from django.contrib import admin
+from django.utils import timezone
 from .models import (
     Service, Industry, Project, ProjectImage, ProjectTag,
     Testimonial, BlogCategory, BlogTag, BlogPost, Package, Lead, TeamMember,
-    Job, JobApplication, FAQ, Invoice, SiteSettings
+    Job, JobApplication, FAQ, Invoice, SiteSettings, OutboxMessage
 )
 
 @admin.register(Service)
@@ -98,8 +99,8 @@ class JobAdmin(admin.ModelAdmin):
 
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
-    list_display = ('name', 'job', 'email', 'status', 'created_at')
-    list_filter = ('status', 'job', 'created_at')
+    list_display = ('name', 'job', 'email', 'status', 'resume_status', 'created_at')
+    list_filter = ('status', 'resume_status', 'job', 'created_at')
     search_fields = ('name', 'email', 'job__title')
     ordering = ('-created_at',)
 
@@ -116,6 +117,15 @@ class InvoiceAdmin(admin.ModelAdmin):
     list_filter = ('status', 'due_date', 'created_at')
     search_fields = ('invoice_number', 'client__email', 'description')
     ordering = ('-created_at',)
+    actions = ['mark_paid', 'mark_sent']
+
+    @admin.action(description='Mark selected invoices as paid')
+    def mark_paid(self, request, queryset):
+        queryset.set_status('paid')
+
+    @admin.action(description='Mark selected invoices as sent')
+    def mark_sent(self, request, queryset):
+        queryset.set_status('sent')
 
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(admin.ModelAdmin):
@@ -128,3 +138,16 @@ class SiteSettingsAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         # Don't allow deletion of SiteSettings
         return False
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'kind', 'created_at')
+    search_fields = ('subject', 'last_error')
+    readonly_fields = ('attempts', 'last_error', 'sent_at')
+    ordering = ('-created_at',)
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        queryset.exclude(status='sent').update(status='pending', attempts=0, next_attempt_at=timezone.now())
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from core.models import Job, JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Reconcile Job.applications_count with the actual number of applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        counts = JobApplication.objects.filter(
+            job=OuterRef('pk')
+        ).order_by().values('job').annotate(total=Count('pk')).values('total')
+        with transaction.atomic():
+            drifted = Job.objects.annotate(
+                actual=Coalesce(Subquery(counts), 0)
+            ).exclude(applications_count=F('actual'))
+            rows = list(drifted.values_list('pk', 'slug', 'applications_count', 'actual'))
+            for pk, slug, stored, actual in rows:
+                self.stdout.write(f'{slug}: stored {stored}, actual {actual}')
+            if rows and not options['dry_run']:
+                Job.objects.filter(pk__in=[row[0] for row in rows]).update(
+                    applications_count=Coalesce(Subquery(counts), 0)
+                )
+
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(rows)} job(s) with drifted application counts'))
@@ -0,0 +1,24 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.outbox import drain
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails over one connection per pass, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+                            help='Messages claimed per batch')
+        parser.add_argument('--once', action='store_true', help='Drain what is due and exit')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep between passes')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, dead = drain(options['batch_size'])
+            if sent or retried or dead or options['once']:
+                self.stdout.write(f'Sent {sent}, will retry {retried}, dead-lettered {dead}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
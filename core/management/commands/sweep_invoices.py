@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import Invoice
+
+
+class Command(BaseCommand):
+    help = 'Mark sent invoices past their due date as overdue, in a single UPDATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Count matching invoices without changing them')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['dry_run']:
+            count = Invoice.objects.filter(status='sent', due_date__lt=today).count()
+            self.stdout.write(self.style.SUCCESS(f'Found {count} overdue invoice(s)'))
+            return
+        count = Invoice.objects.mark_overdue(today)
+        self.stdout.write(self.style.SUCCESS(f'Marked {count} invoice(s) overdue'))
@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from core.models import JobApplication
+from core.resume_uploads import resume_uploader
+from core.storage import get_spool_storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Retry failed resume uploads and finish ones interrupted by a restart. Only rows whose '
+        'spool file is on this host are touched, so run it where RESUME_SPOOL_DIR lives.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-minutes', type=int, default=15,
+                            help='Treat pending or uploading rows older than this as interrupted')
+        parser.add_argument('--interval', type=float,
+                            help='Keep running, sleeping this many seconds between passes')
+
+    def handle(self, *args, **options):
+        while True:
+            uploaded, total = self.upload_pending(options['stale_minutes'])
+            if total or options['interval'] is None:
+                self.stdout.write(self.style.SUCCESS(f'Uploaded {uploaded} of {total} resume(s)'))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
+
+    def upload_pending(self, stale_minutes):
+        stale_before = timezone.now() - timedelta(minutes=stale_minutes)
+        rows = JobApplication.objects.filter(
+            Q(resume_status='failed') | Q(resume_status__in=['pending', 'uploading'], updated_at__lt=stale_before)
+        ).exclude(resume_spool='').values_list('pk', 'resume_spool')
+        spool = get_spool_storage()
+        # Rows spooled on another host are that host's to finish
+        ids = [pk for pk, spool_name in rows if spool.exists(spool_name)]
+        uploaded = sum(
+            resume_uploader.upload(pk, statuses=('pending', 'uploading', 'failed')) for pk in ids
+        )
+        return uploaded, len(ids)
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:51
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Weighted source columns per table. CKEditor fields hold HTML, so tags are
+# stripped before the text is tokenized.
+SEARCH_COLUMNS = {
+    'core_blogpost': [('title', 'A', False), ('excerpt', 'B', False), ('content', 'C', True)],
+    'core_project': [('title', 'A', False), ('client_name', 'B', False), ('short_description', 'B', False), ('description', 'C', True)],
+    'core_service': [('title', 'A', False), ('short_description', 'B', False), ('description', 'C', True)],
+    'core_job': [('title', 'A', False), ('location', 'B', False), ('description', 'C', True), ('requirements', 'C', False)],
+}
+
+
+def vector_sql(columns):
+    parts = []
+    for column, weight, is_html in columns:
+        value = f"coalesce(NEW.{column}, '')"
+        if is_html:
+            value = f"regexp_replace({value}, '<[^>]+>', ' ', 'g')"
+        parts.append(f"setweight(to_tsvector('english', {value}), '{weight}')")
+    return ' || '.join(parts)
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        column_list = ', '.join(column for column, _, _ in columns)
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql(columns)};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {column_list} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+        """)
+        schema_editor.execute(f'CREATE INDEX {table}_search_vector_gin ON {table} USING gin (search_vector);')
+        # Touch every row once so the trigger backfills existing content
+        schema_editor.execute(f'UPDATE {table} SET title = title;')
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_vector_gin;')
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};')
+        schema_editor.execute(f'DROP FUNCTION IF EXISTS {table}_search_vector_update();')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_remove_testimonial_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:59
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    Job = apps.get_model('core', 'Job')
+    JobApplication = apps.get_model('core', 'JobApplication')
+    counts = JobApplication.objects.filter(job=OuterRef('pk')).order_by().values('job').annotate(total=Count('pk')).values('total')
+    Job.objects.update(applications_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_api_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
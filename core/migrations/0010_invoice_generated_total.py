@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    A column cannot be altered into a generated one, so total_amount is
+    dropped and re-added; the database fills it for every existing row.
+    """
+
+    dependencies = [
+        ('core', '0009_outbox_message'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='invoice',
+            name='total_amount',
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='total_amount',
+            field=models.GeneratedField(db_persist=True, expression=models.F('amount') + models.F('tax_amount'), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:14
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_invoice_generated_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_error',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_spool',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_status',
+            field=models.CharField(choices=[('pending', 'Pending upload'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded'), ('failed', 'Upload failed')], default='uploaded', editable=False, max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(blank=True, storage=core.storage.get_resume_storage, upload_to='resumes/'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:38
+
+from django.db import migrations, models
+from core.text import html_to_text, make_excerpt, reading_time
+
+
+def backfill_text_fields(apps, schema_editor):
+    BlogPost = apps.get_model('core', 'BlogPost')
+    posts = []
+    for post in BlogPost.objects.only('pk', 'content', 'excerpt').iterator(chunk_size=500):
+        post.plain_text = html_to_text(post.content)
+        post.word_count = len(post.plain_text.split())
+        post.reading_time = reading_time(post.word_count)
+        if not post.excerpt:
+            post.excerpt = make_excerpt(post.plain_text)
+        posts.append(post)
+        if len(posts) == 500:
+            BlogPost.objects.bulk_update(posts, ['plain_text', 'word_count', 'reading_time', 'excerpt'])
+            posts = []
+    BlogPost.objects.bulk_update(posts, ['plain_text', 'word_count', 'reading_time', 'excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_resume_upload_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='plain_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_text_fields, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,15 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Now
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django_ckeditor_5.fields import CKEditor5Field
-from cloudinary_storage.storage import RawMediaCloudinaryStorage
 from cloudinary.models import CloudinaryField
+from .storage import get_resume_storage
+from .text import html_to_text, make_excerpt, reading_time
 
 
 User = get_user_model()
@@ -35,6 +40,9 @@ class Service(TimeStampedModel):
     meta_title = models.CharField(max_length=60, blank=True)
     meta_description = models.CharField(max_length=160, blank=True)
     
+    # Full-text search, maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -45,6 +53,9 @@ class Service(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'title']
+        indexes = [
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True), name='service_active_order_idx'),
+        ]
 
 class Industry(TimeStampedModel):
     """Industry model for project categorization"""
@@ -98,6 +109,9 @@ class Project(TimeStampedModel):
     meta_title = models.CharField(max_length=60, blank=True)
     meta_description = models.CharField(max_length=160, blank=True)
     
+    # Full-text search, maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     def save(self, *args, **kwargs):
         if self.client and not self.client_name:
             self.client_name = self.client.get_full_name()
@@ -110,6 +124,10 @@ class Project(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_published', '-created_at'], name='project_published_created_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_published=True), name='project_public_created_idx'),
+        ]
 
 class ProjectImage(TimeStampedModel):
     """Additional images for projects"""
@@ -151,6 +169,9 @@ class Testimonial(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_published=True), name='testimonial_public_idx'),
+        ]
 
 class BlogCategory(TimeStampedModel):
     """Blog post categories"""
@@ -205,16 +226,55 @@ class BlogPost(TimeStampedModel):
     # Analytics
     views_count = models.PositiveIntegerField(default=0)
     
+    # Derived from content on save, so lists never need the HTML
+    plain_text = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes')
+    
+    # Full-text search, maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    TEXT_FIELDS = ['plain_text', 'word_count', 'reading_time', 'excerpt']
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        if self.is_published and not self.published_at:
+            self.published_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # Content that was never loaded can't have changed
+            if 'content' not in self.get_deferred_fields():
+                self.set_text_fields()
+        elif 'content' in update_fields:
+            self.set_text_fields()
+            kwargs['update_fields'] = {*update_fields, *self.TEXT_FIELDS}
         super().save(*args, **kwargs)
     
+    def set_text_fields(self):
+        """
+        Recompute the fields derived from content. bulk_create() skips save(),
+        so call this on each post first.
+
+        A blank excerpt is filled from the text, and one that was filled that
+        way follows later edits; an excerpt written by hand is left alone.
+        """
+        auto_excerpt = make_excerpt(self.plain_text)
+        self.plain_text = html_to_text(self.content)
+        self.word_count = len(self.plain_text.split())
+        self.reading_time = reading_time(self.word_count)
+        if not self.excerpt or self.excerpt == auto_excerpt:
+            self.excerpt = make_excerpt(self.plain_text)
+    
     def __str__(self):
         return self.title
     
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['is_published', '-published_at'], name='blogpost_published_idx'),
+            models.Index(fields=['-published_at', '-id'], condition=models.Q(is_published=True), name='blogpost_public_keyset_idx'),
+        ]
 
 class Package(TimeStampedModel):
     """Pricing packages"""
@@ -239,6 +299,9 @@ class Package(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'price']
+        indexes = [
+            models.Index(fields=['order', 'price'], condition=models.Q(is_active=True), name='package_active_order_idx'),
+        ]
 
 class Lead(TimeStampedModel):
     """Contact form leads"""
@@ -278,6 +341,10 @@ class Lead(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='lead_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='lead_keyset_idx'),
+        ]
 
 class TeamMember(TimeStampedModel):
     """Team member profiles"""
@@ -297,6 +364,9 @@ class TeamMember(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], condition=models.Q(is_active=True), name='teammember_active_order_idx'),
+        ]
 
 class Job(TimeStampedModel):
     """Job postings"""
@@ -323,6 +393,13 @@ class Job(TimeStampedModel):
     status = models.CharField(max_length=20, choices=JOB_STATUS, default='open')
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE)
     
+    # Maintained by JobApplication.save and a post_delete handler in core.signals;
+    # `manage.py repair_application_counts` reconciles any drift.
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Full-text search, maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -333,6 +410,9 @@ class Job(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+        ]
 
 class JobApplication(TimeStampedModel):
     """Job applications"""
@@ -345,21 +425,47 @@ class JobApplication(TimeStampedModel):
         ('rejected', 'Rejected'),
     ]
     
+    RESUME_STATUS = [
+        ('pending', 'Pending upload'),
+        ('uploading', 'Uploading'),
+        ('uploaded', 'Uploaded'),
+        ('failed', 'Upload failed'),
+    ]
+
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=20, blank=True)
-    resume = models.FileField(upload_to='resumes/', storage=RawMediaCloudinaryStorage())
+    # Empty until the spooled file has been pushed to storage
+    resume = models.FileField(upload_to='resumes/', storage=get_resume_storage, blank=True)
+    resume_status = models.CharField(max_length=10, choices=RESUME_STATUS, default='uploaded', editable=False)
+    resume_spool = models.CharField(max_length=255, blank=True, editable=False)
+    resume_error = models.TextField(blank=True, editable=False)
     cover_letter = models.TextField(blank=True)
     portfolio_url = models.URLField(blank=True)
     status = models.CharField(max_length=20, choices=APPLICATION_STATUS, default='submitted')
     notes = models.TextField(blank=True)
     
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous_job_id = None
+            if not self._state.adding:
+                previous_job_id = JobApplication.objects.filter(pk=self.pk).values_list('job_id', flat=True).first()
+            super().save(*args, **kwargs)
+            if previous_job_id != self.job_id:
+                if previous_job_id is not None:
+                    Job.objects.filter(pk=previous_job_id).update(applications_count=F('applications_count') - 1)
+                Job.objects.filter(pk=self.job_id).update(applications_count=F('applications_count') + 1)
+    
     def __str__(self):
         return f"{self.name} - {self.job.title}"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['job', 'status'], name='jobapp_job_status_idx'),
+            models.Index(fields=['-created_at', '-id'], name='jobapp_keyset_idx'),
+        ]
 
 class FAQ(TimeStampedModel):
     """Frequently Asked Questions"""
@@ -374,6 +480,25 @@ class FAQ(TimeStampedModel):
     
     class Meta:
         ordering = ['order', 'question']
+        indexes = [
+            models.Index(fields=['order', 'question'], condition=models.Q(is_active=True), name='faq_active_order_idx'),
+        ]
+
+class InvoiceQuerySet(models.QuerySet):
+    """Set-based status changes: one UPDATE however many invoices match"""
+
+    def set_status(self, status):
+        # update() skips auto_now, so bump updated_at for cache validators
+        changes = {'status': status, 'updated_at': Now()}
+        if status == 'paid':
+            changes['paid_date'] = Coalesce('paid_date', Now())
+        return self.update(**changes)
+
+    def mark_overdue(self, today=None):
+        """Sent invoices past their due date become overdue"""
+        today = today or timezone.localdate()
+        return self.filter(status='sent', due_date__lt=today).set_status('overdue')
+
 
 class Invoice(TimeStampedModel):
     """Client invoices"""
@@ -390,21 +515,35 @@ class Invoice(TimeStampedModel):
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, blank=True)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     tax_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2, blank=True)
+    # Computed and stored by the database, so bulk updates keep it right too
+    total_amount = models.GeneratedField(
+        expression=models.F('amount') + models.F('tax_amount'),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+    )
     description = CKEditor5Field('Text', config_name='default')
     due_date = models.DateField()
     status = models.CharField(max_length=20, choices=INVOICE_STATUS, default='draft')
     paid_date = models.DateTimeField(blank=True, null=True)
-    
+
+    objects = InvoiceQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
-        self.total_amount = self.amount + self.tax_amount
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        if not adding:
+            # Inserts return total_amount, updates leave the old value behind
+            self.refresh_from_db(fields=['total_amount'])
 
     def __str__(self):
         return f"Invoice {self.invoice_number} - {self.client.email}"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='invoice_status_due_idx'),
+            models.Index(fields=['-created_at', '-id'], name='invoice_keyset_idx'),
+        ]
 
 class SiteSettings(TimeStampedModel):
     """Site-wide settings"""
@@ -443,3 +582,33 @@ class SiteSettings(TimeStampedModel):
     
     def __str__(self):
         return "Site Settings"
+
+class OutboxMessage(TimeStampedModel):
+    """Email queued in the same transaction as the row it is about, sent by run_outbox"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    recipients = models.JSONField(default=list)
+    reply_to = models.EmailField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.kind}: {self.subject}"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # What the worker polls for
+            models.Index(fields=['next_attempt_at', 'id'], condition=models.Q(status='pending'),
+                         name='outbox_due_idx'),
+        ]
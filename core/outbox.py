@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxMessage
+
+# How long a claimed batch is hidden from other workers while it is sent
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def enqueue(kind, subject, body, recipients, reply_to=''):
+    """
+    Queue an email. Call it inside the transaction that writes the row the
+    email is about, so the message exists exactly when that row does.
+    """
+    return OutboxMessage.objects.create(
+        kind=kind, subject=subject, body=body, recipients=list(recipients), reply_to=reply_to
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: OUTBOX_RETRY_DELAY, doubled per failed attempt, capped"""
+    return timedelta(seconds=min(
+        settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), settings.OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to batch_size due messages. Leased rows are pushed CLAIM_LEASE
+    into the future, so concurrent workers skip them and a worker that dies
+    mid-batch only delays them.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(next_attempt_at=now + CLAIM_LEASE)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('id'))
+
+
+def deliver(messages, connection):
+    """
+    Send messages over an open email connection and record the outcome of
+    each. Returns (sent, retried, dead) counts.
+    """
+    sent = retried = dead = 0
+    for message in messages:
+        email = EmailMessage(
+            subject=message.subject, body=message.body, to=message.recipients,
+            reply_to=[message.reply_to] if message.reply_to else None, connection=connection,
+        )
+        try:
+            email.send()
+        except Exception as exc:
+            if fail(message, exc):
+                dead += 1
+            else:
+                retried += 1
+            # The failure may have left the connection unusable
+            reconnect(connection)
+            continue
+        message.status = 'sent'
+        message.attempts += 1
+        message.sent_at = timezone.now()
+        message.last_error = ''
+        message.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'updated_at'])
+        sent += 1
+    return sent, retried, dead
+
+
+def reconnect(connection):
+    try:
+        connection.close()
+        connection.open()
+    except Exception:
+        # send() opens a fresh connection itself if this one stays closed
+        pass
+
+
+def fail(message, exc):
+    """Record a failed attempt; returns True when the message is dead-lettered"""
+    message.attempts += 1
+    message.last_error = f'{type(exc).__name__}: {exc}'
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = 'dead'
+    else:
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+    message.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'updated_at'])
+    return message.status == 'dead'
+
+
+def drain(batch_size=None, connection=None):
+    """
+    Deliver every due message, batch by batch, over a single email
+    connection. Returns (sent, retried, dead) counts.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # Server unreachable: count one failed attempt for the next batch so
+        # its backoff advances, and leave the rest for a later run
+        messages = claim_batch(batch_size)
+        dead = sum(fail(message, exc) for message in messages)
+        return 0, len(messages) - dead, dead
+
+    totals = [0, 0, 0]
+    try:
+        while True:
+            messages = claim_batch(batch_size)
+            if not messages:
+                return tuple(totals)
+            for index, count in enumerate(deliver(messages, connection)):
+                totals[index] += count
+    finally:
+        connection.close()
@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.functions import Now
+from .models import JobApplication
+from .storage import get_resume_storage, get_spool_storage
+
+logger = logging.getLogger(__name__)
+
+
+def spool_resume(upload):
+    """Write an uploaded file to the local spool and return its spool name"""
+    # Django moves large uploads from their temp file instead of copying them
+    return get_spool_storage().save(f'{uuid.uuid4().hex}/{os.path.basename(upload.name)}', upload)
+
+
+class ResumeUploader:
+    """
+    Pushes spooled resumes to resume storage outside the request.
+
+    The application row is committed with resume_status 'pending' and the
+    file on local disk; submit() then hands the row to a small thread pool
+    that claims it ('uploading'), copies the file to RESUME_STORAGE, stores
+    the resulting name and removes the spool copy ('uploaded'). Errors leave
+    the row 'failed' with the message in resume_error; the upload_resumes
+    command retries those and rows whose upload was interrupted.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, application_id):
+        workers = settings.RESUME_UPLOAD_WORKERS if self.workers is None else self.workers
+        if workers <= 0:
+            return self.upload(application_id)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resume-upload')
+        return self._executor.submit(self.upload_in_thread, application_id)
+
+    def upload_in_thread(self, application_id):
+        try:
+            return self.upload(application_id)
+        finally:
+            # Threads get their own connections; don't leave them open
+            connections.close_all()
+
+    def upload(self, application_id, statuses=('pending',)):
+        """Push one application's spooled resume; returns True once it is in storage"""
+        claimed = JobApplication.objects.filter(
+            pk=application_id, resume_status__in=statuses
+        ).exclude(resume_spool='').update(resume_status='uploading', updated_at=Now())
+        if not claimed:
+            # Already handled by another thread or worker
+            return False
+
+        spool_name = JobApplication.objects.values_list('resume_spool', flat=True).get(pk=application_id)
+        spool = get_spool_storage()
+        try:
+            with spool.open(spool_name, 'rb') as fh:
+                name = get_resume_storage().save(f'resumes/{os.path.basename(spool_name)}', fh)
+        except Exception as exc:
+            logger.exception('Resume upload failed for application %s', application_id)
+            JobApplication.objects.filter(pk=application_id).update(
+                resume_status='failed', resume_error=f'{type(exc).__name__}: {exc}', updated_at=Now()
+            )
+            return False
+
+        JobApplication.objects.filter(pk=application_id).update(
+            resume=name, resume_status='uploaded', resume_spool='', resume_error='', updated_at=Now()
+        )
+        spool.delete(spool_name)
+        # Drop the now empty per-upload directory
+        try:
+            os.rmdir(os.path.dirname(spool.path(spool_name)))
+        except OSError:
+            pass
+        return True
+
+
+resume_uploader = ResumeUploader()
@@ -0,0 +1,14 @@
+from django.db.models import F
+from django.db.models.signals import post_delete
+from .models import Job, JobApplication
+
+
+def decrement_applications_count(sender, instance, **kwargs):
+    # Also runs for queryset and cascade deletes, which bypass Model.delete
+    Job.objects.filter(pk=instance.job_id, applications_count__gt=0).update(applications_count=F('applications_count') - 1)
+
+
+def connect_signals():
+    post_delete.connect(
+        decrement_applications_count, sender=JobApplication, dispatch_uid='core_job_applications_count_delete'
+    )
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+
+
+def get_resume_storage():
+    """
+    Where resumes end up: Cloudinary raw storage unless RESUME_STORAGE names
+    another Storage class, e.g. FileSystemStorage for local development.
+    """
+    return import_string(settings.RESUME_STORAGE)()
+
+
+def get_spool_storage():
+    """Local disk holding uploaded resumes until they are pushed to resume storage"""
+    return FileSystemStorage(location=settings.RESUME_SPOOL_DIR)
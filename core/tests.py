@@ -1,3 +1,292 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from . import outbox
+from .resume_uploads import resume_uploader, spool_resume
+from .models import BlogPost, Job, JobApplication, OutboxMessage, Invoice
+from .text import html_to_text, make_excerpt
+
+User = get_user_model()
+
+
+class ApplicationsCountTests(TestCase):
+    def setUp(self):
+        poster = User.objects.create_user(username='hr', email='hr@example.com', password='x')
+        self.backend = Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=poster
+        )
+        self.frontend = Job.objects.create(
+            title='Frontend', description='<p>F</p>', requirements='React', job_type='full_time',
+            location='Remote', posted_by=poster
+        )
+
+    def apply(self, job):
+        return JobApplication.objects.create(job=job, name='Applicant', email='a@example.com', resume='resumes/cv.pdf')
+
+    def assertCounts(self, backend, frontend):
+        self.backend.refresh_from_db()
+        self.frontend.refresh_from_db()
+        self.assertEqual((self.backend.applications_count, self.frontend.applications_count), (backend, frontend))
+
+    def test_create_and_delete(self):
+        application = self.apply(self.backend)
+        self.apply(self.backend)
+        self.assertCounts(2, 0)
+        application.delete()
+        self.assertCounts(1, 0)
+
+    def test_move_between_jobs(self):
+        application = self.apply(self.backend)
+        application.job = self.frontend
+        application.save()
+        self.assertCounts(0, 1)
+        application.status = 'reviewing'
+        application.save()
+        self.assertCounts(0, 1)
+
+    def test_queryset_delete(self):
+        self.apply(self.backend)
+        self.apply(self.frontend)
+        JobApplication.objects.all().delete()
+        self.assertCounts(0, 0)
+
+    def test_handler_connected_once(self):
+        from .signals import connect_signals
+        connect_signals()
+        self.apply(self.backend).delete()
+        self.assertCounts(0, 0)
+        self.apply(self.backend)
+        self.apply(self.backend).delete()
+        self.assertCounts(1, 0)
+
+    def test_repair_command(self):
+        self.apply(self.backend)
+        Job.objects.filter(pk=self.backend.pk).update(applications_count=7)
+        Job.objects.filter(pk=self.frontend.pk).update(applications_count=3)
+        out = StringIO()
+        call_command('repair_application_counts', '--dry-run', stdout=out)
+        self.assertIn('Found 2 job(s)', out.getvalue())
+        self.assertCounts(7, 3)
+        call_command('repair_application_counts', stdout=out)
+        self.assertCounts(1, 0)
+
+
+@override_settings(OUTBOX_MAX_ATTEMPTS=3, OUTBOX_RETRY_DELAY=60, OUTBOX_MAX_RETRY_DELAY=600)
+class OutboxTests(TestCase):
+    def queue(self, count=1):
+        for n in range(count):
+            outbox.enqueue('test', f'Subject {n}', 'Body', ['staff@example.com'], reply_to='lead@example.com')
+
+    def test_drain_sends_over_one_connection(self):
+        self.queue(5)
+        with mock.patch.object(EmailBackend, 'open', autospec=True) as opened:
+            self.assertEqual(outbox.drain(batch_size=2), (5, 0, 0))
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].reply_to, ['lead@example.com'])
+        self.assertFalse(OutboxMessage.objects.exclude(status='sent').exists())
+        # Nothing is sent twice
+        self.assertEqual(outbox.drain(), (0, 0, 0))
+
+    def test_failures_back_off_then_dead_letter(self):
+        self.queue()
+        message = OutboxMessage.objects.get()
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=SMTPException('421 busy')):
+            self.assertEqual(outbox.drain(), (0, 1, 0))
+            message.refresh_from_db()
+            self.assertEqual((message.status, message.attempts), ('pending', 1))
+            self.assertIn('421 busy', message.last_error)
+            self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=50))
+            # Not due yet
+            self.assertEqual(outbox.drain(), (0, 0, 0))
+
+            OutboxMessage.objects.update(next_attempt_at=timezone.now())
+            outbox.drain()
+            message.refresh_from_db()
+            self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=110))
+
+            OutboxMessage.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(outbox.drain(), (0, 0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('dead', 3))
+        self.assertEqual(mail.outbox, [])
+
+    def test_retry_delay_is_capped(self):
+        self.assertEqual(outbox.retry_delay(1), timedelta(seconds=60))
+        self.assertEqual(outbox.retry_delay(3), timedelta(seconds=240))
+        self.assertEqual(outbox.retry_delay(10), timedelta(seconds=600))
+
+    def test_run_outbox_command(self):
+        self.queue(2)
+        out = StringIO()
+        call_command('run_outbox', '--once', stdout=out)
+        self.assertIn('Sent 2, will retry 0, dead-lettered 0', out.getvalue())
+
+
+class InvoiceTests(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(username='client', email='client@example.com', password='x')
+
+    def invoice(self, number, status='sent', due_date=date(2026, 1, 1)):
+        return Invoice.objects.create(
+            invoice_number=number, client=self.client_user, amount=Decimal('100.00'), tax_amount=Decimal('8.00'),
+            description='<p>Work</p>', due_date=due_date, status=status
+        )
+
+    def test_total_is_computed_by_the_database(self):
+        invoice = self.invoice('INV-1')
+        self.assertEqual(invoice.total_amount, Decimal('108.00'))
+        invoice.amount = Decimal('200.00')
+        invoice.save()
+        self.assertEqual(invoice.total_amount, Decimal('208.00'))
+        Invoice.objects.update(tax_amount=Decimal('0.50'))
+        self.assertEqual(Invoice.objects.get().total_amount, Decimal('200.50'))
+
+    def test_sweep_is_one_update(self):
+        today = date(2026, 3, 1)
+        overdue = self.invoice('INV-1', due_date=date(2026, 2, 1))
+        self.invoice('INV-2', due_date=date(2026, 3, 1))
+        self.invoice('INV-3', status='draft', due_date=date(2026, 2, 1))
+        with self.assertNumQueries(1):
+            self.assertEqual(Invoice.objects.mark_overdue(today), 1)
+        self.assertEqual(
+            dict(Invoice.objects.values_list('invoice_number', 'status')),
+            {'INV-1': 'overdue', 'INV-2': 'sent', 'INV-3': 'draft'}
+        )
+        overdue.refresh_from_db()
+        self.assertGreater(overdue.updated_at, overdue.created_at)
+
+    def test_sweep_command(self):
+        self.invoice('INV-1', due_date=timezone.localdate() - timedelta(days=1))
+        out = StringIO()
+        call_command('sweep_invoices', '--dry-run', stdout=out)
+        self.assertIn('Found 1 overdue invoice(s)', out.getvalue())
+        call_command('sweep_invoices', stdout=out)
+        self.assertIn('Marked 1 invoice(s) overdue', out.getvalue())
+        self.assertEqual(Invoice.objects.get().status, 'overdue')
+
+    def test_paid_keeps_first_paid_date(self):
+        paid_at = timezone.now() - timedelta(days=3)
+        earlier = self.invoice('INV-1', status='paid')
+        Invoice.objects.filter(pk=earlier.pk).update(paid_date=paid_at)
+        later = self.invoice('INV-2')
+        Invoice.objects.all().set_status('paid')
+        earlier.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(earlier.paid_date, paid_at)
+        self.assertIsNotNone(later.paid_date)
+
+
+class ResumeUploaderTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        self.addCleanup(shutil.rmtree, self.spool)
+        overrides = override_settings(
+            RESUME_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=self.media,
+            RESUME_SPOOL_DIR=self.spool,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        poster = User.objects.create_user(username='hr', email='hr@example.com', password='x')
+        job = Job.objects.create(
+            title='Backend', description='<p>B</p>', requirements='Python', job_type='full_time',
+            location='Remote', posted_by=poster
+        )
+        spool_name = spool_resume(ContentFile(b'resume', name='cv.pdf'))
+        self.application = JobApplication.objects.create(
+            job=job, name='Ann', email='ann@example.com', resume_spool=spool_name, resume_status='pending'
+        )
+
+    def test_failure_is_recorded_and_retried_by_command(self):
+        with mock.patch.object(FileSystemStorage, 'save', side_effect=OSError('quota exceeded')), \
+                self.assertLogs('core.resume_uploads', 'ERROR'):
+            self.assertFalse(resume_uploader.upload(self.application.pk))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.resume_status, 'failed')
+        self.assertIn('quota exceeded', self.application.resume_error)
+
+        out = StringIO()
+        call_command('upload_resumes', stdout=out)
+        self.assertIn('Uploaded 1 of 1 resume(s)', out.getvalue())
+        self.application.refresh_from_db()
+        self.assertEqual((self.application.resume_status, self.application.resume_error), ('uploaded', ''))
+        self.assertTrue(os.path.exists(os.path.join(self.media, self.application.resume.name)))
+
+    def test_command_skips_rows_spooled_elsewhere(self):
+        JobApplication.objects.filter(pk=self.application.pk).update(resume_status='failed')
+        other = JobApplication.objects.create(
+            job=self.application.job, name='Bob', email='bob@example.com',
+            resume_spool='0123abcd/cv.pdf', resume_status='failed'
+        )
+        out = StringIO()
+        call_command('upload_resumes', stdout=out)
+        self.assertIn('Uploaded 1 of 1 resume(s)', out.getvalue())
+        other.refresh_from_db()
+        self.assertEqual((other.resume_status, other.resume_spool), ('failed', '0123abcd/cv.pdf'))
+
+    def test_claimed_once(self):
+        self.assertTrue(resume_uploader.upload(self.application.pk))
+        self.assertFalse(resume_uploader.upload(self.application.pk))
+
+
+class BlogPostTextTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='writer', email='writer@example.com', password='x')
+
+    def test_html_to_text(self):
+        html = '<h2>Intro</h2><p>Fish&nbsp;&amp; chips<br>daily</p><script>track()</script><ul><li>a</li><li>b</li></ul>'
+        self.assertEqual(html_to_text(html), 'Intro Fish & chips daily a b')
+        self.assertEqual(html_to_text(None), '')
+
+    def test_excerpt_cuts_at_a_word(self):
+        self.assertEqual(make_excerpt('short'), 'short')
+        excerpt = make_excerpt('word ' * 100, 30)
+        self.assertEqual(excerpt, 'word word word word word word…')
+        self.assertLessEqual(len(excerpt), 30)
+
+    def test_fields_are_derived_on_save(self):
+        post = BlogPost.objects.create(title='Post', content='<p>' + 'word ' * 450 + '</p>', author=self.author)
+        self.assertEqual(post.word_count, 450)
+        self.assertEqual(post.reading_time, 3)
+        self.assertTrue(post.excerpt.startswith('word word'))
+        self.assertLessEqual(len(post.excerpt), 300)
+
+        # An excerpt filled automatically follows the content
+        post.content = '<p>Rewritten</p>'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual((post.plain_text, post.word_count, post.reading_time), ('Rewritten', 1, 1))
+        self.assertEqual(post.excerpt, 'Rewritten')
+
+        # One written by hand does not
+        post.excerpt = 'Handwritten'
+        post.content = '<p>Again</p>'
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual((post.plain_text, post.excerpt), ('Again', 'Handwritten'))
+
+    def test_deferred_content_is_not_loaded(self):
+        post = BlogPost.objects.create(title='Post', content='<p>Body</p>', author=self.author)
+        post = BlogPost.objects.defer('content').get(pk=post.pk)
+        post.title = 'Renamed'
+        with mock.patch.object(BlogPost, 'set_text_fields') as set_text_fields:
+            post.save()
+        set_text_fields.assert_not_called()
 
-# Create your tests here.
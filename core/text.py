@@ -0,0 +1,61 @@
+import math
+from html.parser import HTMLParser
+
+WORDS_PER_MINUTE = 200
+# BlogPost.excerpt's max_length
+EXCERPT_LENGTH = 300
+
+# Tags that separate words even when the HTML has no whitespace around them
+BREAKING_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'section',
+    'table', 'td', 'th', 'tr', 'ul',
+}
+SKIPPED_TAGS = {'script', 'style', 'template'}
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BREAKING_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag in BREAKING_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """Rich text editor HTML as a single line of plain text"""
+    parser = TextExtractor()
+    parser.feed(html or '')
+    parser.close()
+    return ' '.join(''.join(parser.parts).split())
+
+
+def reading_time(word_count):
+    """Whole minutes, rounded up; 0 only for empty text"""
+    return math.ceil(word_count / WORDS_PER_MINUTE)
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """The start of the text, cut at a word boundary to fit in length characters"""
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if text[length - 1] != ' ' and ' ' in cut:
+        # Drop the word that was cut in half
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,;:.-') + '…'
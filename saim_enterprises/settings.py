@@ -1,9 +1,10 @@
 
 
 from pathlib import Path
-from decouple import config
+from decouple import Choices, config
 from datetime import timedelta
 import os
+import sys
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.ServerTimingMiddleware',
+    'api.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -57,7 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.WhiteNoiseMiddleware',
 
 ]
 
@@ -85,10 +88,98 @@ WSGI_APPLICATION = 'saim_enterprises.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DB_CONNECTIONS picks how connections are reused:
+#   'persistent' keeps each worker thread's connection open for up to
+#       DB_CONN_MAX_AGE seconds instead of reconnecting on every request.
+#       WSGI only: under ASGI every request runs its sync code in a new
+#       thread, so its connection would never be reused;
+#   'pool' uses Django's PostgreSQL connection pool (requires psycopg 3:
+#       pip install "psycopg[binary,pool]") with DB_POOL_MIN_SIZE to
+#       DB_POOL_MAX_SIZE connections per process, under WSGI or ASGI;
+#   'none' opens and closes a connection per request.
+# Reused connections are health-checked before use, so a connection broken
+# by a database restart or failover is replaced instead of failing a request.
+DB_CONNECTIONS = config('DB_CONNECTIONS', default='persistent', cast=Choices(['none', 'persistent', 'pool']))
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=10, cast=int)
+# Seconds a request waits for a free pooled connection before failing
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)
+
 DATABASES = {
-    'default': dj_database_url.config(default=config('DATABASE_URL'))
+    'default': dj_database_url.config(
+        default=config('DATABASE_URL'),
+        conn_max_age=DB_CONN_MAX_AGE if DB_CONNECTIONS == 'persistent' else 0,
+        conn_health_checks=DB_CONNECTIONS != 'none',
+    )
 }
 
+if DB_CONNECTIONS == 'pool' and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # CONN_HEALTH_CHECKS makes Django check each connection as the pool hands it out
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+        # Recycle connections so they follow failovers and config changes
+        'max_lifetime': DB_CONN_MAX_AGE,
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache is per process, so set REDIS_URL when running several workers
+# to share cached responses and invalidations between them.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'saim-enterprises',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Seconds a cached API response may live; model signals invalidate it earlier.
+# Without REDIS_URL an invalidation only reaches the worker that made the
+# change, so other workers can serve stale responses for up to this long;
+# the default is an hour with Redis and a minute without.
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60 * 60 if REDIS_URL else 60, cast=int)
+
+# Browser/CDN lifetime of /api/settings/ responses; clients revalidate with ETag
+SITE_SETTINGS_MAX_AGE = config('SITE_SETTINGS_MAX_AGE', default=300, cast=int)
+
+# Set under manage.py test, where background threads (the view counter's
+# flusher) stay off so nothing writes after the test database is gone
+TESTING = sys.argv[1:2] == ['test']
+
+# Seconds between batched writes of buffered blog post views (0 writes on every hit)
+BLOG_VIEWS_FLUSH_INTERVAL = config('BLOG_VIEWS_FLUSH_INTERVAL', default=10, cast=int)
+
+# Route the hot public reads (services, projects, blog posts, testimonials,
+# packages, settings) to native async views. Turn this on only when serving
+# saim_enterprises.asgi with an ASGI server such as uvicorn; under WSGI every
+# async view would need an event loop of its own per request.
+ASYNC_READS = config('ASYNC_READS', default=False, cast=bool)
+
+# Send per-request db/serialize/render timings as a Server-Timing header.
+# Off unless DEBUG: query counts and timings let anyone probe what a request
+# touched. Aggregates are kept either way and served to admins at /api/metrics/.
+SERVER_TIMING = config('SERVER_TIMING', default=DEBUG, cast=bool)
+
+# API responses of at least COMPRESS_MIN_SIZE bytes are brotli or gzip
+# compressed for clients that accept it (brotli needs the optional Brotli
+# package); 0 turns compression off. WhiteNoise handles static files.
+COMPRESS_MIN_SIZE = config('COMPRESS_MIN_SIZE', default=1024, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -138,6 +229,17 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resume uploads are spooled to RESUME_SPOOL_DIR, committed, and pushed to
+# RESUME_STORAGE by RESUME_UPLOAD_WORKERS background threads (0 uploads
+# synchronously after commit). The `resumes` process (Procfile) runs
+# upload_resumes to retry failures and finish uploads a restart interrupted;
+# it only picks up rows whose spool file is on its own disk, so it must share
+# RESUME_SPOOL_DIR with the web process. On an ephemeral disk spooled files
+# lost in a restart stay 'pending'.
+RESUME_STORAGE = config('RESUME_STORAGE', default='cloudinary_storage.storage.RawMediaCloudinaryStorage')
+RESUME_SPOOL_DIR = config('RESUME_SPOOL_DIR', default=os.path.join(BASE_DIR, 'spool', 'resumes'))
+RESUME_UPLOAD_WORKERS = config('RESUME_UPLOAD_WORKERS', default=2, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -156,7 +258,11 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -203,7 +309,7 @@ CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', default='').split(',')
 
 
 # Email settings (placeholder - will need actual credentials)
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
@@ -211,6 +317,18 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@saienterprises.com')
 
+# Staff addresses for lead and application notifications; falls back to the
+# company email in Site Settings when empty
+NOTIFICATION_EMAILS = [email.strip() for email in config('NOTIFICATION_EMAILS', default='').split(',') if email.strip()]
+
+# Outbox delivery (python manage.py run_outbox): retries back off
+# exponentially from OUTBOX_RETRY_DELAY up to OUTBOX_MAX_RETRY_DELAY seconds,
+# and a message is dead-lettered after OUTBOX_MAX_ATTEMPTS failed sends
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=50, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=6, cast=int)
+OUTBOX_RETRY_DELAY = config('OUTBOX_RETRY_DELAY', default=60, cast=int)
+OUTBOX_MAX_RETRY_DELAY = config('OUTBOX_MAX_RETRY_DELAY', default=3600, cast=int)
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 